@@ -1,6 +1,19 @@
 from alphavantage_api_client.client import AlphavantageClient
+from alphavantage_api_client.async_client import AsyncAlphavantageClient
 from alphavantage_api_client.models import GlobalQuote, Quote, AccountingReport, CompanyOverview, EconomicIndicator, \
     CsvNotSupported, TickerSearch, MarketStatus, MarketMovers, NewsAndSentiment, EarningsCalendar\
-    , EarningsCalendarItem,IpoCalendarItem, IpoCalendar, CurrencyQuote, Commodity
+    , EarningsCalendarItem,IpoCalendarItem, IpoCalendar, CurrencyQuote, Commodity, RealtimeBulkQuotes
 from alphavantage_api_client.ticker import Ticker
+from alphavantage_api_client.ticker_universe import TickerUniverse
+from alphavantage_api_client.fundamentals import FundamentalsTable
 from alphavantage_api_client.response_validation_rules import ValidationRuleChecks
+from alphavantage_api_client.api_request import ApiRequest
+from alphavantage_api_client.batch import BatchResult
+from alphavantage_api_client.columnar import TimeSeriesColumns
+from alphavantage_api_client.columnar_store import ColumnarStore
+from alphavantage_api_client.indicators import IndicatorEngine
+from alphavantage_api_client.streaming_indicators import StreamingIndicator, create_streaming_indicator
+from alphavantage_api_client.time_series_sync import TimeSeriesSync
+from alphavantage_api_client.rate_limiter import RateLimiter, RateLimitExceeded, InMemoryRateLimitBackend, \
+    SqliteRateLimitBackend
+from alphavantage_api_client.cache import LruCache, CacheTtlPolicy, SqliteCache
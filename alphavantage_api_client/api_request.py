@@ -0,0 +1,122 @@
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+from . import json_codec
+
+# parameters the client reads itself, they are never sent to the api
+CLIENT_PARAMS = ("apikey", "cache_ttl")
+# what the api assumes when these parameters are left out
+DEFAULT_PARAMS = {"datatype": "json", "outputsize": "compact"}
+
+
+class RequestKey:
+    """Canonical, hashable key of a request
+
+    Requests asking for the same data get equal keys. The api key is left out, the symbol is upper cased, the api's
+    defaults are filled in and every value is compared as a string, so {"symbol": "tsla"} and
+    {"symbol": "TSLA", "datatype": "json"} share a cache entry. The hash is computed once.
+    """
+    __slots__ = ("__items__", "__hash_value__")
+
+    def __init__(self, params: Mapping[str, Any]):
+        canonical = dict(DEFAULT_PARAMS)
+        for key, value in params.items():
+            if key in CLIENT_PARAMS or value is None:
+                continue
+            canonical[key] = str(value).strip().upper() if key == "symbol" else str(value)
+        items = tuple(sorted(canonical.items()))
+        object.__setattr__(self, "__items__", items)
+        object.__setattr__(self, "__hash_value__", hash(items))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RequestKey is immutable")
+
+    def get_items(self) -> tuple:
+        return self.__items__
+
+    def __hash__(self) -> int:
+        return self.__hash_value__
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RequestKey):
+            return NotImplemented
+        return self.__hash_value__ == other.__hash_value__ and self.__items__ == other.__items__
+
+    def __str__(self) -> str:
+        """json form of the key, used by stores that need text keys"""
+        return json_codec.dumps(dict(self.__items__))
+
+    def __repr__(self) -> str:
+        return f"RequestKey({self})"
+
+
+class ApiRequest:
+    """An immutable request to the alpha vantage api
+
+    The parameters are frozen when the request is created, together with its RequestKey. Neither the parameters
+    nor the key include the api key, so the request can be logged, used as a cache key and shared between threads
+    without copying it.
+
+        Typical usage example:
+
+            request = ApiRequest({"function": "GLOBAL_QUOTE", "symbol": "TSLA"}, api_key)
+            client.get_data_from_alpha_vantage(request)
+    """
+    __slots__ = ("__params__", "__api_key__", "__cache_ttl__", "__cache_key__", "__hash_value__")
+
+    def __init__(self, event: Mapping[str, Any], api_key: Optional[str] = None, cache_ttl: Optional[float] = None):
+        params = {key: value for key, value in event.items() if key not in CLIENT_PARAMS}
+        object.__setattr__(self, "__params__", MappingProxyType(params))
+        object.__setattr__(self, "__api_key__", api_key if api_key is not None else event.get("apikey"))
+        object.__setattr__(self, "__cache_ttl__", cache_ttl if cache_ttl is not None else event.get("cache_ttl"))
+        cache_key = RequestKey(params)
+        object.__setattr__(self, "__cache_key__", cache_key)
+        object.__setattr__(self, "__hash_value__", hash(cache_key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ApiRequest is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("ApiRequest is immutable")
+
+    def get_params(self) -> Mapping[str, Any]:
+        """The parameters sent to the api, without the api key. Read only"""
+        return self.__params__
+
+    def get_api_key(self) -> Optional[str]:
+        return self.__api_key__
+
+    def get_cache_ttl(self) -> Optional[float]:
+        return self.__cache_ttl__
+
+    def get_cache_key(self) -> RequestKey:
+        return self.__cache_key__
+
+    def to_dict(self) -> dict:
+        """A new dict of the parameters without the api key, e.g. for logging"""
+        return dict(self.__params__)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.__params__.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.__params__[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__params__
+
+    def __iter__(self):
+        return iter(self.__params__)
+
+    def __len__(self) -> int:
+        return len(self.__params__)
+
+    def __hash__(self) -> int:
+        return self.__hash_value__
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ApiRequest):
+            return NotImplemented
+        return self.__cache_key__ == other.__cache_key__
+
+    def __repr__(self) -> str:
+        return f"ApiRequest({json_codec.dumps(self.to_dict())})"
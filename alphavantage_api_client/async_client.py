@@ -0,0 +1,143 @@
+import asyncio
+import functools
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Union
+
+from alphavantage_api_client.batch import BatchResult
+from alphavantage_api_client.client import AlphavantageClient
+from alphavantage_api_client.log_message import LazyLogMessage
+
+# sync methods that start with get_ but are not alpha vantage end points
+NOT_END_POINTS = {"get_internal_metrics"}
+
+
+class AsyncAlphavantageClient:
+    """Awaitable version of every AlphavantageClient end point
+
+    Each end point runs the exact same request building, validation and model parsing as the sync client. The
+    blocking http call is handed to a bounded pool of workers sharing the sync client's pooled session, cache and
+    settings, so one event loop can keep up to max_concurrency requests in flight. A client it creates gets a
+    connection pool of max_concurrency connections. Give a client of your own a pool at least that big
+    (with_connection_pool(pool_maxsize=max_concurrency)), otherwise the connections beyond its pool are opened
+    and thrown away.
+
+        Typical usage example:
+
+            client = AlphavantageClient().use_simple_cache()
+            async with AsyncAlphavantageClient(client, max_concurrency=100) as async_client:
+                quotes = await asyncio.gather(*[async_client.get_global_quote(s) for s in symbols])
+    """
+
+    def __init__(self, client: Optional[AlphavantageClient] = None, max_concurrency: int = 32):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than zero")
+        self.__owns_client__ = client is None
+        if client is None:
+            client = AlphavantageClient().with_connection_pool(pool_maxsize=max_concurrency)
+        elif client.__pool_maxsize__ < max_concurrency:
+            logging.warning(LazyLogMessage({"method": "AsyncAlphavantageClient.__init__", "action": "pool_too_small",
+                                            "pool_maxsize": client.__pool_maxsize__,
+                                            "max_concurrency": max_concurrency}))
+        self.__client__ = client
+        self.__max_concurrency__ = max_concurrency
+        self.__executor__ = None
+
+    def get_client(self) -> AlphavantageClient:
+        """The sync client used to build, send and parse requests. Use it to configure api key, cache, etc."""
+        return self.__client__
+
+    def get_internal_metrics(self) -> dict:
+        return self.__client__.get_internal_metrics()
+
+    def __get_executor__(self) -> ThreadPoolExecutor:
+        if self.__executor__ is None:
+            self.__executor__ = ThreadPoolExecutor(max_workers=self.__max_concurrency__,
+                                                   thread_name_prefix="alphavantage")
+        return self.__executor__
+
+    async def __run__(self, method_name: str, *args, **kwargs):
+        method = getattr(self.__client__, method_name)
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self.__get_executor__(), functools.partial(method, *args, **kwargs))
+
+    async def get_global_quotes(self, symbols: Iterable[Union[str, dict]],
+                                max_concurrency: Optional[int] = None) -> AsyncIterator[BatchResult]:
+        """Awaitable AlphavantageClient.get_global_quotes(), yields a BatchResult per symbol as it completes"""
+        async for item in self.map(self.get_global_quote, symbols, max_concurrency):
+            yield item
+
+    async def map(self, fn: Callable[[Any], Awaitable], events: Iterable,
+                  max_concurrency: Optional[int] = None) -> AsyncIterator[BatchResult]:
+        """Await fn for every event, at most max_concurrency (defaults to this client's) at a time, yielding a
+        BatchResult as each one completes. An exception raised by one call is kept in its BatchResult
+
+            Typical usage example:
+
+                async for item in async_client.map(async_client.get_company_overview, symbols):
+                    ...
+        """
+        limit = max_concurrency if max_concurrency is not None else self.__max_concurrency__
+        if limit < 1:
+            raise ValueError("max_concurrency must be greater than zero")
+        iterator = iter(events)
+        pending = {asyncio.ensure_future(fn(event)): event for event in islice(iterator, limit)}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    event = pending.pop(task)
+                    for next_event in islice(iterator, 1):
+                        pending[asyncio.ensure_future(fn(next_event))] = next_event
+                    error = task.exception()
+                    yield BatchResult(event, error=error) if error is not None else BatchResult(event, task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def close(self):
+        """Wait for in flight requests, then release the workers (and the session if this client created it)"""
+        executor = self.__executor__
+        self.__executor__ = None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        if self.__owns_client__:
+            self.__client__.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+def _make_async_end_point(method_name: str):
+    sync_method = getattr(AlphavantageClient, method_name)
+
+    @functools.wraps(sync_method)
+    async def end_point(self, *args, **kwargs):
+        return await self.__run__(method_name, *args, **kwargs)
+
+    return end_point
+
+
+def get_end_point_names() -> list[str]:
+    """Names of the AlphavantageClient methods mirrored by AsyncAlphavantageClient"""
+    names = []
+    for name, member in inspect.getmembers(AlphavantageClient, inspect.isfunction):
+        if name in NOT_END_POINTS or inspect.isgeneratorfunction(member):
+            continue
+        if name.startswith("get_") or name == "search_ticker":
+            names.append(name)
+    return names
+
+
+def _register_end_points():
+    for name in get_end_point_names():
+        setattr(AsyncAlphavantageClient, name, _make_async_end_point(name))
+
+
+_register_end_points()
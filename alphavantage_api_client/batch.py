@@ -0,0 +1,73 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+from .log_message import LazyLogMessage
+
+
+class BatchResult:
+    """Outcome of one event of a batch: the event, what the call returned and the exception it raised, if any
+
+    A failed item never aborts the batch. Check success, then use result or error.
+    """
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self, event: Any, result: Any = None, error: Optional[BaseException] = None):
+        self.event = event
+        self.result = result
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        """True when the call returned and, for responses, alpha vantage answered successfully"""
+        return self.error is None and getattr(self.result, "success", True)
+
+    def get_symbol(self) -> Optional[str]:
+        if isinstance(self.event, str):
+            return self.event
+        return self.event.get("symbol") if isinstance(self.event, dict) else None
+
+    def __repr__(self) -> str:
+        outcome = f"error={self.error!r}" if self.error is not None else f"success={self.success}"
+        return f"BatchResult(event={self.event!r}, {outcome})"
+
+
+def get_loggable_event(event: Any) -> Any:
+    if isinstance(event, dict):
+        return {k: v for k, v in event.items() if k != "apikey"}
+    return event if isinstance(event, (str, int, float)) else repr(event)
+
+
+def map_concurrently(fn: Callable[[Any], Any], events: Iterable, max_workers: int) -> Iterator[BatchResult]:
+    """Call fn with every event on up to max_workers threads, yielding a BatchResult as each call completes
+
+    Events are pulled lazily, at most 2 * max_workers are submitted ahead of the results, so a generator of a
+    million symbols doesn't queue a million calls. Closing the generator early cancels the calls not yet started.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than zero")
+    iterator = iter(events)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alphavantage_batch")
+    pending = {}
+    try:
+        for event in islice(iterator, 2 * max_workers):
+            pending[executor.submit(fn, event)] = event
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                event = pending.pop(future)
+                for next_event in islice(iterator, 1):
+                    pending[executor.submit(fn, next_event)] = next_event
+                error = future.exception()
+                if error is not None and not isinstance(error, Exception):
+                    raise error  # KeyboardInterrupt, SystemExit, ... stop the batch
+                if error is not None:
+                    logging.warning(LazyLogMessage({"method": "map_concurrently", "action": "call_failed",
+                                                    "event": get_loggable_event(event), "error": repr(error)}))
+                    yield BatchResult(event, error=error)
+                else:
+                    yield BatchResult(event, future.result())
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,297 @@
+import datetime
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union
+from . import json_codec, sqlite_store
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+class LruCache:
+    """Bounded least recently used cache with an optional time to live per entry
+
+    get and put are O(1). When the cache is full only the least recently used entry is evicted, so the working set
+    survives instead of being wiped all at once. Expired entries are treated as misses and dropped when found.
+    Thread safe.
+    """
+
+    def __init__(self, max_size: int = 100, ttl: Optional[float] = None):
+        if max_size < 1:
+            raise ValueError("max_size must be greater than zero")
+        self.__max_size__ = max_size
+        self.__ttl__ = ttl
+        self.__entries__: OrderedDict[Hashable, tuple[Optional[float], Any]] = OrderedDict()
+        self.__lock__ = threading.Lock()
+        self.__hits__ = 0
+        self.__misses__ = 0
+        self.__evictions__ = 0
+        self.__expirations__ = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.__lock__:
+            entry = self.__entries__.get(key)
+            if entry is None:
+                self.__misses__ += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.__entries__[key]
+                self.__expirations__ += 1
+                self.__misses__ += 1
+                return None
+            self.__entries__.move_to_end(key)
+            self.__hits__ += 1
+
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value. ttl (seconds) overrides the cache wide ttl for this entry"""
+        ttl = self.__ttl__ if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self.__lock__:
+            if key in self.__entries__:
+                self.__entries__.move_to_end(key)
+            self.__entries__[key] = (expires_at, value)
+            while len(self.__entries__) > self.__max_size__:
+                self.__entries__.popitem(last=False)
+                self.__evictions__ += 1
+
+    def clear(self):
+        with self.__lock__:
+            self.__entries__.clear()
+
+    def get_metrics(self) -> dict:
+        with self.__lock__:
+            return {
+                "size": len(self.__entries__),
+                "max_size": self.__max_size__,
+                "hits": self.__hits__,
+                "misses": self.__misses__,
+                "evictions": self.__evictions__,
+                "expirations": self.__expirations__,
+            }
+
+    def __len__(self):
+        return len(self.__entries__)
+
+    def __contains__(self, key: Hashable):
+        return key in self.__entries__
+
+
+class SqliteCache:
+    """Persistent cache stored in a SQLite file, so responses survive restarts and deploys
+
+    It has the same interface as LruCache. Responses are stored as zlib compressed json together with their
+    expiry time. When the cache grows past max_size entries (or max_bytes of compressed data) the least recently
+    used responses are removed. Several threads and processes can safely read and write the same file.
+    """
+
+    def __init__(self, path: str, max_size: int = 10000, max_bytes: Optional[int] = None, timeout: float = 30):
+        if max_size < 1:
+            raise ValueError("max_size must be greater than zero")
+        self.__path__ = path
+        self.__max_size__ = max_size
+        self.__max_bytes__ = max_bytes
+        self.__timeout__ = timeout
+        self.__lock__ = threading.Lock()
+        self.__hits__ = 0
+        self.__misses__ = 0
+        self.__evictions__ = 0
+        self.__expirations__ = 0
+        sqlite_store.create_store(path, [
+            "CREATE TABLE IF NOT EXISTS response_cache (cache_key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, expires_at REAL, last_access REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS response_cache_last_access ON response_cache (last_access)",
+        ], timeout)
+
+    def get_path(self) -> str:
+        return self.__path__
+
+    def __count__(self, name: str, amount: int = 1):
+        with self.__lock__:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.time()
+        with sqlite_store.connect(self.__path__, self.__timeout__) as connection:
+            row = connection.execute("SELECT value, expires_at FROM response_cache WHERE cache_key = ?",
+                                     (str(key),)).fetchone()
+            if row is None:
+                self.__count__("__misses__")
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                connection.execute("DELETE FROM response_cache WHERE cache_key = ? AND expires_at <= ?",
+                                   (str(key), now))
+                self.__count__("__expirations__")
+                self.__count__("__misses__")
+                return None
+            connection.execute("UPDATE response_cache SET last_access = ? WHERE cache_key = ?", (now, str(key)))
+        self.__count__("__hits__")
+
+        return json_codec.loads(zlib.decompress(value))
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        blob = zlib.compress(json_codec.dumps_bytes(value))
+        expires_at = None if ttl is None else now + ttl
+        with sqlite_store.transaction(self.__path__, self.__timeout__) as connection:
+            connection.execute("INSERT OR REPLACE INTO response_cache (cache_key, value, size, expires_at, last_access)"
+                               " VALUES (?, ?, ?, ?, ?)", (str(key), blob, len(blob), expires_at, now))
+            evicted = self.__evict__(connection, now)
+        self.__count__("__evictions__", evicted)
+
+    def __evict__(self, connection, now: float) -> int:
+        connection.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+        count, total_bytes = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+        evicted = 0
+        # always keep the response that was just written
+        while count > 1 and (count > self.__max_size__
+                             or (self.__max_bytes__ is not None and total_bytes > self.__max_bytes__)):
+            cache_key, size = connection.execute("SELECT cache_key, size FROM response_cache "
+                                                 "ORDER BY last_access LIMIT 1").fetchone()
+            connection.execute("DELETE FROM response_cache WHERE cache_key = ?", (cache_key,))
+            count -= 1
+            total_bytes -= size
+            evicted += 1
+
+        return evicted
+
+    def clear(self):
+        with sqlite_store.connect(self.__path__, self.__timeout__) as connection:
+            connection.execute("DELETE FROM response_cache")
+
+    def get_metrics(self) -> dict:
+        with sqlite_store.connect(self.__path__, self.__timeout__) as connection:
+            size, total_bytes = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+        with self.__lock__:
+            return {
+                "size": size,
+                "bytes": total_bytes,
+                "max_size": self.__max_size__,
+                "max_bytes": self.__max_bytes__,
+                "hits": self.__hits__,
+                "misses": self.__misses__,
+                "evictions": self.__evictions__,
+                "expirations": self.__expirations__,
+            }
+
+    def __len__(self):
+        with sqlite_store.connect(self.__path__, self.__timeout__) as connection:
+            return connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def __contains__(self, key: Hashable):
+        with sqlite_store.connect(self.__path__, self.__timeout__) as connection:
+            row = connection.execute("SELECT 1 FROM response_cache WHERE cache_key = ?", (str(key),)).fetchone()
+        return row is not None
+
+
+def seconds_until_end_of_day(now: Optional[datetime.datetime] = None) -> float:
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    tomorrow = (now + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+
+def seconds_until_end_of_week(now: Optional[datetime.datetime] = None) -> float:
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    next_monday = (now + datetime.timedelta(days=7 - now.weekday())).replace(hour=0, minute=0, second=0,
+                                                                            microsecond=0)
+    return (next_monday - now).total_seconds()
+
+
+def seconds_until_end_of_month(now: Optional[datetime.datetime] = None) -> float:
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    if now.month == 12:
+        next_month = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        next_month = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (next_month - now).total_seconds()
+
+
+# how long a response stays fresh for each interval the api supports
+TTL_BY_INTERVAL: dict[str, Union[float, Callable]] = {
+    "1min": MINUTE,
+    "5min": 5 * MINUTE,
+    "15min": 15 * MINUTE,
+    "30min": 30 * MINUTE,
+    "60min": HOUR,
+    "daily": seconds_until_end_of_day,
+    "weekly": seconds_until_end_of_week,
+    "monthly": seconds_until_end_of_month,
+    "quarterly": DAY,
+    "semiannual": DAY,
+    "annual": DAY,
+}
+
+# how long a response stays fresh for each alpha vantage function. None means "use the interval of the request"
+TTL_BY_FUNCTION: dict[str, Optional[Union[float, Callable]]] = {
+    "GLOBAL_QUOTE": MINUTE,
+    "REALTIME_BULK_QUOTES": MINUTE,
+    "CURRENCY_EXCHANGE_RATE": MINUTE,
+    "MARKET_STATUS": 5 * MINUTE,
+    "TOP_GAINERS_LOSERS": 5 * MINUTE,
+    "NEWS_SENTIMENT": 5 * MINUTE,
+    "TIME_SERIES_INTRADAY": None,
+    "CRYPTO_INTRADAY": None,
+    "FX_INTRADAY": None,
+    "TIME_SERIES_DAILY": seconds_until_end_of_day,
+    "TIME_SERIES_DAILY_ADJUSTED": seconds_until_end_of_day,
+    "FX_DAILY": seconds_until_end_of_day,
+    "DIGITAL_CURRENCY_DAILY": seconds_until_end_of_day,
+    "TIME_SERIES_WEEKLY": seconds_until_end_of_week,
+    "TIME_SERIES_WEEKLY_ADJUSTED": seconds_until_end_of_week,
+    "FX_WEEKLY": seconds_until_end_of_week,
+    "DIGITAL_CURRENCY_WEEKLY": seconds_until_end_of_week,
+    "TIME_SERIES_MONTHLY": seconds_until_end_of_month,
+    "TIME_SERIES_MONTHLY_ADJUSTED": seconds_until_end_of_month,
+    "FX_MONTHLY": seconds_until_end_of_month,
+    "DIGITAL_CURRENCY_MONTHLY": seconds_until_end_of_month,
+    "OVERVIEW": DAY,
+    "INCOME_STATEMENT": 7 * DAY,
+    "BALANCE_SHEET": 7 * DAY,
+    "CASH_FLOW": 7 * DAY,
+    "EARNINGS": 7 * DAY,
+    "SYMBOL_SEARCH": DAY,
+    "EARNINGS_CALENDAR": DAY,
+    "IPO_CALENDAR": DAY,
+}
+
+
+class CacheTtlPolicy:
+    """Decides how long each response stays in the cache based on its alpha vantage function and interval
+
+    A GLOBAL_QUOTE goes stale in a minute, a TIME_SERIES_MONTHLY is good until the end of the month and accounting
+    reports are kept for a week. Functions that aren't listed (technical indicators, economic indicators,
+    commodities, ...) use the interval of the request, then default_ttl. A ttl may be a number of seconds or a
+    callable returning seconds.
+
+        Typical usage example:
+
+            policy = CacheTtlPolicy({"GLOBAL_QUOTE": 15}, default_ttl=3600)
+            client = AlphavantageClient().use_simple_cache(ttl_policy=policy)
+    """
+
+    def __init__(self, ttl_by_function: Optional[dict] = None, ttl_by_interval: Optional[dict] = None,
+                 default_ttl: Optional[float] = None, use_defaults: bool = True):
+        self.__ttl_by_function__ = dict(TTL_BY_FUNCTION) if use_defaults else {}
+        self.__ttl_by_function__.update(ttl_by_function or {})
+        self.__ttl_by_interval__ = dict(TTL_BY_INTERVAL) if use_defaults else {}
+        self.__ttl_by_interval__.update(ttl_by_interval or {})
+        self.__default_ttl__ = default_ttl
+
+    def get_ttl(self, event: dict) -> Optional[float]:
+        """Seconds the response to this request stays fresh. None means it never expires"""
+        ttl = self.__ttl_by_function__.get(str(event.get("function", "")).upper())
+        if ttl is None:
+            ttl = self.__ttl_by_interval__.get(event.get("interval"))
+        if ttl is None:
+            ttl = self.__default_ttl__
+        if callable(ttl):
+            ttl = ttl()
+
+        return ttl
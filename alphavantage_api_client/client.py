@@ -1,10 +1,17 @@
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import configparser
 from .response_validation_rules import ValidationRuleChecks
-import json
+from .rate_limiter import RateLimiter, SqliteRateLimitBackend
+from .cache import LruCache, CacheTtlPolicy, SqliteCache
+from .single_flight import SingleFlight
+from . import json_codec
+from .api_request import ApiRequest
+from .log_message import LazyLogMessage, PayloadLogPolicy
+from .batch import BatchResult, map_concurrently
 from alphavantage_api_client.models import (
     GlobalQuote,
     Quote,
@@ -21,12 +28,17 @@ from alphavantage_api_client.models import (
     IpoCalendar,
     CurrencyQuote,
     Commodity,
+    RealtimeBulkQuotes,
 )
-import copy
 import logging
 import hashlib
-from typing import Optional, Union
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
 import csv
+import threading
+
+
+# most symbols alpha vantage accepts in one REALTIME_BULK_QUOTES call
+BULK_QUOTES_MAX_SYMBOLS = 100
 
 
 class ApiKeyNotFound(Exception):
@@ -46,6 +58,9 @@ class AlphavantageClient:
             client = AlphavantageClient()
             or
             client = AlphavantageClient().should_retry_once().use_simple_cache()
+            or
+            with AlphavantageClient().with_connection_pool(pool_maxsize=20) as client:
+                ...
     """
 
     def __init__(self):
@@ -54,7 +69,20 @@ class AlphavantageClient:
         self.__retry__ = False
         self.__first_successful_attempt__ = 0
         self.__use_cache__ = False
-        self.__cache__ = {}
+        self.__cache__ = LruCache()
+        self.__cache_ttl_policy__ = None
+        self.__session__ = None
+        self.__session_lock__ = threading.Lock()
+        self.__metrics_lock__ = threading.Lock()  # calls are counted from many threads by map() and batches
+        self.__pool_connections__ = 10
+        self.__pool_maxsize__ = 10
+        self.__pool_block__ = False
+        self.__keep_alive__ = True
+        self.__connect_timeout__ = None
+        self.__read_timeout__ = None
+        self.__rate_limiter__ = None
+        self.__single_flight__ = None
+        self.__log_policy__ = PayloadLogPolicy()
         # try to get api key from USER_PROFILE/.alphavantage
         alphavantage_config_file_path = (
             f'{os.path.expanduser("~")}{os.path.sep}.alphavantage'
@@ -64,7 +92,7 @@ class AlphavantageClient:
             "action": f"{alphavantage_config_file_path} config file found",
         }
         if os.path.exists(alphavantage_config_file_path):
-            logging.info(json.dumps(msg))
+            logging.info(json_codec.dumps(msg))
             config = configparser.ConfigParser()
             config.read(alphavantage_config_file_path)
             self.__api_key__ = config["access"]["api_key"]
@@ -73,25 +101,25 @@ class AlphavantageClient:
         elif os.environ.get("ALPHAVANTAGE_API_KEY") is not None:
             self.__api_key__ = os.environ.get("ALPHAVANTAGE_API_KEY")
             msg["action"] = f"api key found from environment"
-            logging.info(json.dumps(msg))
+            logging.info(json_codec.dumps(msg))
             return
         else:
             self.__api_key__ = ""
 
-    def __build_url_from_args__(self, event: dict):
+    def __build_url_from_args__(self, request: ApiRequest):
         """private method to construct a url from requested api configuration
 
         Args:
-            event: the params
+            request: the params and api key
 
         Returns:
             a string in url format
         """
         url = f"https://www.alphavantage.co/query?"
         # build url from event
-        for property in event:
-            url += f"{property}={event[property]}&"
-        url = url[:-1]
+        for property in request:
+            url += f"{property}={request[property]}&"
+        url += f"apikey={request.get_api_key()}"
         return url
 
     def __inject_values__(self, default_values: dict, dest_obj: dict):
@@ -140,28 +168,242 @@ class AlphavantageClient:
 
         return self
 
-    def use_simple_cache(self, use_cache: bool = True, max_cache_size: int = 100):
-        """First in / First Out Cache to reduce the amount of calls you need to make to the alpha vantage api
+    def with_rate_limit(self, calls_per_minute: Optional[float] = 5, calls_per_day: Optional[float] = None,
+                        burst: int = 1, max_wait: Optional[float] = None, shared_store: Optional[str] = None):
+        """Pace calls before they are sent so you never burn a call on a limit reached response
+
+        Unlike should_retry_once(), which waits after alpha vantage has already rejected a call, the rate limiter
+        holds each call until your plan allows it. Calls are spread evenly across the minute (and day) so your
+        throughput stays at your plan's ceiling.
+
+        Args:
+            calls_per_minute: The calls per minute allowed by your plan. None to only limit per day
+            calls_per_day: The calls per day allowed by your plan. None to only limit per minute
+            burst: How many calls may be sent back to back before pacing kicks in
+            max_wait: Raise RateLimitExceeded instead of waiting longer than this many seconds. None waits forever
+            shared_store: Path to a SQLite file used to share the budget of each api key with every process on this
+                machine that points to the same file. None keeps the budget in this process
+
+        Returns:
+            AlphavantageClient
+
+        """
+        backend = SqliteRateLimitBackend(shared_store) if shared_store is not None else None
+        self.__rate_limiter__ = RateLimiter(calls_per_minute, calls_per_day, burst, max_wait, backend)
+
+        return self
+
+    def use_rate_limiter(self, rate_limiter: Optional[RateLimiter]):
+        """Use an existing RateLimiter so several clients share one budget. None turns rate limiting off
+
+        Args:
+            rate_limiter: The RateLimiter shared by your clients
+
+        Returns:
+            AlphavantageClient
+
+        """
+        self.__rate_limiter__ = rate_limiter
+
+        return self
+
+    def use_request_coalescing(self, coalesce: bool = True):
+        """Let identical calls made at the same time share a single api call
+
+        When several threads (or coroutines of AsyncAlphavantageClient) ask for the same data at once, e.g. a
+        dashboard loading, the cache is still empty for all of them. With coalescing the first call goes to the api
+        and the others wait for its response instead of spending your quota on the same request.
+
+        Args:
+            coalesce: Flag to indicate whether identical in flight calls should be shared
+
+        Returns:
+            AlphavantageClient
+
+        """
+        self.__single_flight__ = SingleFlight() if coalesce else None
+
+        return self
+
+    def with_payload_logging(self, max_payload_length: Optional[int] = None, sample_rate: float = 1.0):
+        """Control how much of each response is written to the INFO logs
+
+        Log messages are only serialized when INFO logging is enabled. When it is, multi megabyte responses (full
+        histories, intraday data) can still swamp your log pipeline, so payloads can be cut off or only logged for a
+        sample of the calls.
+
+        Args:
+            max_payload_length: payloads longer than this many characters are cut off. None logs them whole
+            sample_rate: fraction of the calls, between 0 and 1, that log their payload. It is decided once per
+                call, the log lines of the other calls only say how big the payload was
+
+        Returns:
+            AlphavantageClient
+
+        """
+        self.__log_policy__ = PayloadLogPolicy(max_payload_length, sample_rate)
+
+        return self
+
+    def use_simple_cache(self, use_cache: bool = True, max_cache_size: int = 100, ttl: Optional[float] = None,
+                         ttl_policy: Optional[CacheTtlPolicy] = None):
+        """Least Recently Used Cache to reduce the amount of calls you need to make to the alpha vantage api
 
         An In-Memory Caching mechanism where your parameters (i.e. symbol, function, interval, format, etc) are used as
         a key into a dictionary. This is similar to how SQL uses the SQL statement to cache it's responses. If you
-        have already requested data with those attributes then it will simply return it from the cache. The cache will
-        continue to grow until you call the clear_cache()
+        have already requested data with those attributes then it will simply return it from the cache. Once the
+        cache holds max_cache_size responses the least recently used one is evicted. Hit, miss and eviction counts
+        are reported by get_internal_metrics()
 
+        By default how long a response stays fresh depends on what you asked for (see CacheTtlPolicy). A global
+        quote is fetched again after a minute while a monthly time series is kept until the end of the month. You can
+        override it for a single call by adding "cache_ttl" (seconds) to your event.
 
-        First in First Out Cache
         Args:
             use_cache: Flag to indicate whether you want to turn on caching
             max_cache_size: Max size of the cache.
+            ttl: Seconds every response stays fresh regardless of its function. Overrides the ttl_policy
+            ttl_policy: How long each function / interval stays fresh. Defaults to CacheTtlPolicy()
 
         Returns:
+            AlphavantageClient
 
         """
         self.__use_cache__ = use_cache
         self.__max_cache_size__ = max_cache_size
+        if ttl is not None:
+            ttl_policy = CacheTtlPolicy(default_ttl=ttl, use_defaults=False)
+        self.__cache_ttl_policy__ = ttl_policy if ttl_policy is not None else CacheTtlPolicy()
+        if use_cache:
+            self.__cache__ = LruCache(max_cache_size)
+
+        return self
+
+    def use_persistent_cache(self, path: str, max_cache_size: int = 10000, max_cache_bytes: Optional[int] = None,
+                             ttl: Optional[float] = None, ttl_policy: Optional[CacheTtlPolicy] = None):
+        """Cache responses in a SQLite file so they survive restarts and deploys
+
+        Works like use_simple_cache() but responses are written (compressed) to disk, so a nightly batch that
+        restarts doesn't download 20 years of history again. Several processes can share the same file.
+
+        Args:
+            path: Path of the SQLite file holding the cache. It is created when missing
+            max_cache_size: Max number of responses kept on disk. Least recently used are removed first
+            max_cache_bytes: Max compressed size of the cache on disk. None for no limit
+            ttl: Seconds every response stays fresh regardless of its function. Overrides the ttl_policy
+            ttl_policy: How long each function / interval stays fresh. Defaults to CacheTtlPolicy()
+
+        Returns:
+            AlphavantageClient
+
+        """
+        return self.use_cache_backend(SqliteCache(path, max_cache_size, max_cache_bytes), ttl, ttl_policy)
+
+    def use_cache_backend(self, cache, ttl: Optional[float] = None, ttl_policy: Optional[CacheTtlPolicy] = None):
+        """Cache responses in your own cache backend
+
+        Args:
+            cache: Any object with the same get(key), put(key, value, ttl), clear() and get_metrics() methods as
+                LruCache and SqliteCache
+            ttl: Seconds every response stays fresh regardless of its function. Overrides the ttl_policy
+            ttl_policy: How long each function / interval stays fresh. Defaults to CacheTtlPolicy()
+
+        Returns:
+            AlphavantageClient
+
+        """
+        self.use_simple_cache(True, ttl=ttl, ttl_policy=ttl_policy)
+        self.__cache__ = cache
+
+        return self
 
+    def with_connection_pool(self, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                             keep_alive: bool = True, connect_timeout: Optional[float] = None,
+                             read_timeout: Optional[float] = None):
+        """Configure the pooled http session used to talk to the alpha vantage api
+
+        The client keeps a single requests.Session for every call, so connections to www.alphavantage.co are
+        kept alive and reused instead of paying a new TCP + TLS handshake per request. Call close() (or use the
+        client as a context manager) when you are done to release the pooled connections.
+
+        Args:
+            pool_connections: Number of per host connection pools to cache
+            pool_maxsize: Max number of connections kept open per host
+            pool_block: Wait for a free connection when the pool is exhausted instead of opening a throw away one
+            keep_alive: Flag to indicate whether connections should be kept open between calls
+            connect_timeout: Seconds to wait while establishing a connection. None waits forever
+            read_timeout: Seconds to wait between bytes received from the server. None waits forever
+
+        Returns:
+            AlphavantageClient
+
+        """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError("pool_connections and pool_maxsize must be greater than zero")
+        self.__pool_connections__ = pool_connections
+        self.__pool_maxsize__ = pool_maxsize
+        self.__pool_block__ = pool_block
+        self.__keep_alive__ = keep_alive
+        self.__connect_timeout__ = connect_timeout
+        self.__read_timeout__ = read_timeout
+        # the next call will build a session with the new settings
+        self.close()
+
+        return self
+
+    def __get_session__(self) -> requests.Session:
+        """private method to lazily build the pooled session shared by every get_* method
+
+        Returns:
+            requests.Session
+        """
+        session = self.__session__
+        if session is not None:
+            return session
+
+        with self.__session_lock__:
+            if self.__session__ is None:
+                adapter = HTTPAdapter(
+                    pool_connections=self.__pool_connections__,
+                    pool_maxsize=self.__pool_maxsize__,
+                    pool_block=self.__pool_block__,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                if not self.__keep_alive__:
+                    session.headers["Connection"] = "close"
+                self.__session__ = session
+
+            return self.__session__
+
+    def __get_timeout__(self):
+        if self.__connect_timeout__ is None and self.__read_timeout__ is None:
+            return None
+
+        return self.__connect_timeout__, self.__read_timeout__
+
+    def close(self):
+        """Close the pooled http session and release its connections
+
+        The client can still be used afterwards, a new session will be created on the next call.
+
+        Returns:
+            Nothing
+
+        """
+        with self.__session_lock__:
+            session = self.__session__
+            self.__session__ = None
+        if session is not None:
+            session.close()
+
+    def __enter__(self):
         return self
 
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def get_internal_metrics(self) -> dict:
         """Obtain the total calls, retry setting and the first successful attempt
 
@@ -172,16 +414,26 @@ class AlphavantageClient:
             totals calls - how many total calls have been made by the client
             retry - your retry flag
             first_successful_attempt - the time as a float
+            rate_limiter - calls paced by the rate limiter and the time spent waiting (when configured)
+            cache - size, hits, misses, evictions and expirations of the cache (when configured)
+            coalescing - calls that shared an identical call already in flight (when configured)
 
         """
-        total_calls = self.__total_calls__
+        with self.__metrics_lock__:
+            total_calls = self.__total_calls__
+            first_successful_attempt = self.__first_successful_attempt__
         retry = self.__retry__
-        first_successful_attempt = self.__first_successful_attempt__
         metrics = {
             "total_calls": total_calls,
             "retry": retry,
             "first_successful_attempt": first_successful_attempt,
         }
+        if self.__rate_limiter__ is not None:
+            metrics["rate_limiter"] = self.__rate_limiter__.get_metrics()
+        if self.__use_cache__:
+            metrics["cache"] = self.__cache__.get_metrics()
+        if self.__single_flight__ is not None:
+            metrics["coalescing"] = self.__single_flight__.get_metrics()
         return metrics
 
     def with_api_key(self, api_key: str):
@@ -226,6 +478,98 @@ class AlphavantageClient:
 
         return GlobalQuote.model_validate(json_response)
 
+    def get_global_quotes(self, symbols: Iterable[Union[str, dict]],
+                          max_workers: Optional[int] = None) -> Iterator[BatchResult]:
+        """get_global_quote() for a whole watchlist, several symbols at a time
+
+        Args:
+            symbols: ticker symbols (or events) to quote
+            max_workers: How many calls may be in flight at once. Defaults to the connection pool size
+
+        Returns:
+            A BatchResult per symbol, yielded as soon as its call completes (not in the order of symbols). Symbols
+            that fail are reported in their BatchResult, the others are still quoted
+
+        """
+        yield from self.map(self.get_global_quote, symbols, max_workers)
+
+    def map(self, fn: Callable[[Any], Any], events: Iterable,
+            max_workers: Optional[int] = None) -> Iterator[BatchResult]:
+        """Call any end point for many events, several at a time
+
+        The calls share this client's pooled session, cache and rate limiter, so with_rate_limit() still paces them
+        and the pool size bounds how many are in flight.
+
+            Typical usage example:
+
+                for item in client.map(client.get_daily_adjusted_quote, ["TSLA", "F", "C"]):
+                    print(item.get_symbol(), item.result.get_most_recent_value() if item.success else item.error)
+
+        Args:
+            fn: The method to call with each event, i.e. client.get_company_overview
+            events: The events (or ticker symbols) to call it with
+            max_workers: How many calls may be in flight at once. Defaults to the connection pool size
+
+        Returns:
+            A BatchResult per event, yielded as soon as its call completes. An exception raised by one call is kept
+            in its BatchResult instead of aborting the batch
+
+        """
+        return map_concurrently(fn, events, max_workers if max_workers is not None else self.__pool_maxsize__)
+
+    def get_realtime_bulk_quotes(self, symbols: Union[str, Iterable[str]],
+                                 max_workers: Optional[int] = None) -> dict[str, GlobalQuote]:
+        """Realtime quotes for any number of symbols, 100 symbols per api call (premium)
+
+        The symbols are split into REALTIME_BULK_QUOTES calls of up to 100 symbols which run concurrently under the
+        client's rate limiter, so 3,000 symbols cost 30 calls instead of 3,000 get_global_quote() calls.
+
+        Args:
+            symbols: ticker symbols, or a comma separated str of them
+            max_workers: How many calls may be in flight at once. Defaults to the connection pool size
+
+        Returns:
+            A GlobalQuote per requested symbol (upper cased), in the order requested. Symbols whose call failed or
+            that alpha vantage didn't return have success False and the reason in error_message
+
+        """
+        if isinstance(symbols, str):
+            symbols = symbols.split(",")
+        unique_symbols = list(dict.fromkeys(str(symbol).strip().upper() for symbol in symbols if str(symbol).strip()))
+        chunks = [unique_symbols[start:start + BULK_QUOTES_MAX_SYMBOLS]
+                  for start in range(0, len(unique_symbols), BULK_QUOTES_MAX_SYMBOLS)]
+        quotes = {}
+        for item in self.map(self.__get_realtime_bulk_quotes_chunk__, chunks, max_workers):
+            chunk_quotes = item.result.get_global_quotes() if item.success else {}
+            for symbol in item.event:
+                quote = chunk_quotes.get(symbol)
+                quotes[symbol] = quote if quote is not None else self.__get_missing_bulk_quote__(symbol, item)
+
+        return {symbol: quotes[symbol] for symbol in unique_symbols}
+
+    def __get_realtime_bulk_quotes_chunk__(self, symbols: list[str]) -> RealtimeBulkQuotes:
+        json_request = {"function": "REALTIME_BULK_QUOTES", "symbol": ",".join(symbols)}
+        json_response = self.get_data_from_alpha_vantage(json_request, self.__retry__)
+
+        return RealtimeBulkQuotes.model_validate(json_response)
+
+    def __get_missing_bulk_quote__(self, symbol: str, item: BatchResult) -> GlobalQuote:
+        response = item.result
+        if item.error is not None:
+            error_message = repr(item.error)
+        elif not response.success:
+            error_message = response.error_message or response.message
+        else:
+            error_message = f"{symbol} is not in the REALTIME_BULK_QUOTES response"
+
+        return GlobalQuote.model_validate({
+            "success": False,
+            "limit_reached": response.limit_reached if response is not None else False,
+            "status_code": response.status_code if response is not None else 0,
+            "symbol": symbol,
+            "Error Message": error_message,
+        })
+
     def get_daily_quote(self, event: Union[str, dict]) -> Quote:
         """As traded daily time series price history
 
@@ -532,7 +876,6 @@ class AlphavantageClient:
         }
         json_request = self.__create_api_request_from__(defaults, event)
         json_response = self.get_data_from_alpha_vantage(json_request, self.__retry__)
-        # print(json.dumps(json_response))
         return CurrencyQuote.model_validate(json_response)
 
     def get_crypto_daily(self, event: dict) -> CurrencyQuote:
@@ -861,89 +1204,108 @@ class AlphavantageClient:
         return Quote.model_validate(json_response)
 
     def get_data_from_alpha_vantage(
-        self, event: dict, should_retry: bool = False
+        self, event: Union[dict, ApiRequest], should_retry: bool = False
     ) -> dict:
         """Underlying function that talks to alphavantage api.
 
         Feel free to pass in any parameters supported by the api.  You will receive a dictionary with the response
         from the web api. In addition, you will obtain the success, error_message and limit_reached fields.
         Args:
-            event: dict of the url parameters supported by the web api
+            event: dict of the url parameters supported by the web api, or an ApiRequest
 
         Returns:
             A dict of the response from alpha vantage api. success, error_message and limit_reached fields are injected
             into the dict for your reference.
 
         """
-        # validate api key and insert into the request if needed
         checks = ValidationRuleChecks().from_customer_request(event)
-        self.__validate_api_key__(checks, event)
-
-        # create a version of the event without api key
-        loggable_event = copy.deepcopy(event)
-        loggable_event.pop("apikey")
+        # freeze the request once, the api key is kept apart from the parameters that are logged and cached
+        request = event if isinstance(event, ApiRequest) else ApiRequest(event, self.__validate_api_key__(checks, event))
+        # one sampling decision per call, so the log lines of a call all have their payload or none has
+        sampled = self.__log_policy__.is_sampled()
 
         # check cache if allowed
         if self.__use_cache__:
-            results = self.__get_item_from_cache__(loggable_event)
-            logging.info(f"Found item in cache: {results}")
+            results = self.__get_item_from_cache__(request)
             if results is not None:
-                return results
+                logging.info(LazyLogMessage({"method": "get_data_from_alpha_vantage", "action": "found_in_cache",
+                                             "data": results, "event": request.to_dict}, self.__log_policy__,
+                                            sampled))
+                return self.__with_requested_symbol__(results, request)
+
+        # identical calls already in flight wait for that call instead of calling the api again
+        if self.__single_flight__ is not None:
+            results = self.__single_flight__.do(
+                request, lambda: self.__get_data_from_api__(checks, request, should_retry, sampled)
+            )
+            return self.__with_requested_symbol__(results, request)
+
+        return self.__get_data_from_api__(checks, request, should_retry, sampled)
+
+    def __get_data_from_api__(self, checks: ValidationRuleChecks, request: ApiRequest, should_retry: bool,
+                              sampled: bool = True) -> dict:
+        # wait for our turn so the call is not rejected by the api
+        if self.__rate_limiter__ is not None:
+            self.__rate_limiter__.acquire(request.get_api_key())
 
         # fetch data from API
-        self.__fetch_data__(checks, event, loggable_event)
+        self.__fetch_data__(checks, request, sampled)
         requested_data = {}
 
         # hydrate the response
-        self.__hydrate_request__(requested_data, checks, event, should_retry)
+        self.__hydrate_request__(requested_data, checks, request, should_retry)
 
         # retry once if allowed and needed
         if checks.expect_limit_not_reached().passed() and should_retry:
             self.__sleep__()
-            result = self.get_data_from_alpha_vantage(event, False)
-            self.__first_successful_attempt__ = time.perf_counter()
+            result = self.get_data_from_alpha_vantage(request, False)
+            with self.__metrics_lock__:
+                self.__first_successful_attempt__ = time.perf_counter()
             return result
 
         # not all calls will have a symbol in the call to alphavantage.... if so we can, capture it.
-        if "symbol" in event:
-            requested_data["symbol"] = event["symbol"]
+        if "symbol" in request:
+            requested_data["symbol"] = request["symbol"]
 
-        # put into cache if allowed
-        if self.__use_cache__:
-            self.__put_item_into_cache__(loggable_event, requested_data)
+        # put into cache if allowed, failures (i.e. limit reached) would otherwise be served for the whole ttl
+        if self.__use_cache__ and requested_data["success"] and not requested_data["limit_reached"]:
+            self.__put_item_into_cache__(request, requested_data, request.get_cache_ttl())
 
         logging.info(
-            json.dumps(
+            LazyLogMessage(
                 {
                     "method": "get_data_from_alpha_vantage",
                     "action": "return_value",
                     "data": requested_data,
-                    "event": loggable_event,
-                }
+                    "event": request.to_dict,
+                },
+                self.__log_policy__,
+                sampled,
             )
         )
 
         return requested_data
 
-    def __put_item_into_cache__(self, event, results):
-        if len(self.__cache__) >= self.__max_cache_size__:
-            self.__cache__.clear()
-
-        hash_str = json.dumps(event, sort_keys=True)
-        self.__cache__[hash_str] = results
+    def __with_requested_symbol__(self, results: dict, request: ApiRequest) -> dict:
+        # equivalent requests (i.e. tsla and TSLA) share a response, give each caller the symbol it asked for
+        symbol = request.get("symbol")
+        if symbol is None or results.get("symbol", symbol) == symbol:
+            return results
+        return {**results, "symbol": symbol}
 
-    def __get_item_from_cache__(self, event):
-        hash_str = json.dumps(event, sort_keys=True)
-        if hash_str in self.__cache__:
-            return self.__cache__[hash_str]
+    def __put_item_into_cache__(self, request: ApiRequest, results, ttl: Optional[float] = None):
+        if ttl is None and self.__cache_ttl_policy__ is not None:
+            ttl = self.__cache_ttl_policy__.get_ttl(request)
+        self.__cache__.put(request.get_cache_key(), results, ttl)
 
-        return None
+    def __get_item_from_cache__(self, request: ApiRequest):
+        return self.__cache__.get(request.get_cache_key())
 
     def __hydrate_request__(
         self,
         requested_data: dict,
         checks: ValidationRuleChecks,
-        event: dict,
+        request: ApiRequest,
         should_retry: bool,
     ):
         # verify request worked correctly and build response
@@ -958,53 +1320,53 @@ class AlphavantageClient:
 
         if (
             checks.expect_json_datatype().expect_successful_response().passed()
-        ):  # successful json response
-            json_response = checks.get_obj()
-            for field in json_response:
-                requested_data[field] = json_response[field]
+        ):  # successful json response, the body was decoded once by the checks
+            requested_data.update(checks.get_obj())
 
         if (
             checks.expect_csv_datatype().expect_successful_response().passed()
         ):  # successful csv response
             requested_data["csv"] = checks.get_obj()
 
-    def __fetch_data__(
-        self, checks: ValidationRuleChecks, event: dict, loggable_event: dict
-    ):
-        url = self.__build_url_from_args__(event)
-        r = requests.get(url)
-        if self.__first_successful_attempt__ == 0:
-            self.__first_successful_attempt__ = time.perf_counter()
-        self.__total_calls__ += 1
+    def __fetch_data__(self, checks: ValidationRuleChecks, request: ApiRequest, sampled: bool = True):
+        url = self.__build_url_from_args__(request)
+        r = self.__get_session__().get(url, timeout=self.__get_timeout__())
+        with self.__metrics_lock__:
+            if self.__first_successful_attempt__ == 0:
+                self.__first_successful_attempt__ = time.perf_counter()
+            self.__total_calls__ += 1
         checks.with_response(r)
         logging.info(
-            json.dumps(
+            LazyLogMessage(
                 {
                     "method": "get_data_from_alpha_vantage",
                     "action": "response_from_alphavantage",
                     "status_code": r.status_code,
-                    "data": r.text,
-                    "event": loggable_event,
-                }
+                    "data": checks.get_text,  # only decoded when the message is emitted and sampled
+                    "event": request.to_dict,
+                },
+                self.__log_policy__,
+                sampled,
             )
         )
 
-    def __validate_api_key__(self, checks: ValidationRuleChecks, event: dict):
-        # get api key if not provided
+    def __validate_api_key__(self, checks: ValidationRuleChecks, event: dict) -> str:
+        """the api key to send, from the event or else the one the client was configured with"""
         if checks.expect_api_key_in_event().failed():
-            event["apikey"] = self.__api_key__  # assume they passed to builder method.
+            return self.__api_key__  # assume they passed to builder method.
         elif (
             self.__api_key__ is None
             or len(self.__api_key__) == 0
-            or "apikey" not in event
-            or not event.get("apikey")
         ):  # consumer didn't tell me where to get api key
             raise ApiKeyNotFound(
                 "You must call client.with_api_key([api_key]), create config file in your profile (i.e. ~/.alphavantage) or event[api_key] = [your api key] before retrieving data from alphavantage"
             )
 
+        return event["apikey"]
+
     def __sleep__(self):
-        then = self.__first_successful_attempt__
+        with self.__metrics_lock__:
+            then = self.__first_successful_attempt__
         now = time.perf_counter()
         diff = 60 - (now - then)
         logging.info(f"sleeping for {diff} seconds")
@@ -1013,7 +1375,7 @@ class AlphavantageClient:
         time.sleep(diff)
 
     def clear_cache(self):
-        """Clear First in / First Out Cache
+        """Clear Least Recently Used Cache
 
         Returns:
             Nothing
@@ -0,0 +1,183 @@
+import re
+from typing import Any, Iterable, Optional
+
+# fields that are not values of the series, i.e. added by Quote.get_most_recent_value()
+IGNORED_FIELDS = {"query_date", "date"}
+
+
+def import_numpy():
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("numpy is required for columnar time series. "
+                          "pip install alphavantage_api_client[columnar]") from error
+    return numpy
+
+
+def import_pandas():
+    try:
+        import pandas
+    except ImportError as error:
+        raise ImportError("pandas is required for to_pandas(). pip install alphavantage_api_client[pandas]") from error
+    return pandas
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError("pyarrow is required for to_arrow(). pip install alphavantage_api_client[arrow]") from error
+    return pyarrow
+
+
+def get_column_name(field: str) -> str:
+    """Column name of a field, i.e. 1. open -> open, 5. adjusted close -> adjusted_close, 1a. open (USD) -> open_usd"""
+    name = re.sub(r"^\w+\.\s+", "", field).lower()
+    return re.sub(r"[^a-z0-9]+", "_", name).strip("_")
+
+
+def get_unique_column_names(fields: Iterable[str]) -> dict[str, str]:
+    """field -> column name of every field. Fields that would share a name keep their number, i.e. 1a. open (USD)
+    and 1b. open (USD) become 1a_open_usd and 1b_open_usd, so no column silently replaces another
+
+    Raises:
+        ValueError: when two fields still have the same name
+    """
+    fields = list(dict.fromkeys(fields))
+    names = {field: get_column_name(field) for field in fields}
+    counts = {}
+    for name in names.values():
+        counts[name] = counts.get(name, 0) + 1
+    for field, name in names.items():
+        if counts[name] > 1:
+            names[field] = re.sub(r"[^a-z0-9]+", "_", field.lower()).strip("_")
+    if len(set(names.values())) < len(names):
+        raise ValueError(f"fields {fields} can't be told apart as columns {list(names.values())}")
+    return names
+
+
+def parse_floats(values: list):
+    """float64 array of the values, values that aren't numbers become NaN. None when no value is a number"""
+    np = import_numpy()
+    try:
+        return np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        pass
+    parsed = np.full(len(values), np.nan)
+    found = False
+    for position, value in enumerate(values):
+        try:
+            parsed[position] = float(value)
+            found = True
+        except (ValueError, TypeError):
+            continue
+    return parsed if found else None
+
+
+class TimeSeriesColumns:
+    """Columnar view of a time series
+
+    The index is a datetime64[s] array sorted from oldest to newest. Every numeric field of the series becomes one
+    float64 array (int64 for whole number volumes) named after the field without its number, i.e. "open", "close",
+    "adjusted_close", "volume" or "sma", unless two fields would share that name. Fields that aren't numbers are
+    left out.
+
+        Typical usage example:
+
+            columns = client.get_daily_adjusted_quote("TSLA").get_columns()
+            returns = numpy.diff(numpy.log(columns["adjusted_close"]))
+    """
+
+    def __init__(self, index, columns: dict):
+        self.index = index
+        self.columns = columns
+
+    @classmethod
+    def from_time_series(cls, data: dict[str, dict]) -> "TimeSeriesColumns":
+        """Build from a Quote.data style dict, date -> {field: value}"""
+        if any(not isinstance(row, dict) for row in data.values()):
+            raise ValueError("data is not a time series, its values must be dicts of field -> value")
+        rows = list(data.values())
+        fields = [field for field in (rows[0] if rows else {}) if field not in IGNORED_FIELDS]
+        columns = ((field, [row.get(field) for row in rows]) for field in fields)
+
+        return cls.__from_columns__(list(data.keys()), columns)
+
+    @classmethod
+    def from_records(cls, records: list[dict], date_field: str = "date") -> "TimeSeriesColumns":
+        """Build from a list of {date_field: date, field: value}, i.e. Commodity.data"""
+        fields = [field for field in (records[0] if records else {}) if field != date_field]
+        columns = ((field, [record.get(field) for record in records]) for field in fields)
+
+        return cls.__from_columns__([record[date_field] for record in records], columns)
+
+    @classmethod
+    def __from_columns__(cls, dates: list[str], columns: Iterable[tuple[str, list]]) -> "TimeSeriesColumns":
+        np = import_numpy()
+        index = np.array(dates, dtype="datetime64[s]")
+        order = np.argsort(index, kind="stable")
+        is_sorted = bool(np.all(order[:-1] < order[1:])) if len(order) > 1 else True
+        if not is_sorted:
+            index = index[order]
+        columns = list(columns)
+        names = get_unique_column_names(field for field, _ in columns)
+        parsed_columns = {}
+        for field, values in columns:
+            parsed = parse_floats(values)
+            if parsed is None:
+                continue
+            if not is_sorted:
+                parsed = parsed[order]
+            name = names[field]
+            if "volume" in name and not np.isnan(parsed).any() and np.array_equal(parsed, np.floor(parsed)):
+                parsed = parsed.astype(np.int64)
+            parsed_columns[name] = parsed
+
+        return cls(index, parsed_columns)
+
+    def get(self, name: str, default: Optional[Any] = None):
+        return self.columns.get(name, default)
+
+    def get_column_names(self) -> list[str]:
+        return list(self.columns.keys())
+
+    def get_memory_usage(self) -> int:
+        """Bytes held by the index and the columns"""
+        return self.index.nbytes + sum(column.nbytes for column in self.columns.values())
+
+    def to_numpy(self):
+        """numpy structured array with a date field followed by one field per column"""
+        np = import_numpy()
+        dtype = [("date", self.index.dtype)] + [(name, column.dtype) for name, column in self.columns.items()]
+        records = np.empty(len(self.index), dtype=dtype)
+        records["date"] = self.index
+        for name, column in self.columns.items():
+            records[name] = column
+
+        return records
+
+    def to_pandas(self):
+        """pandas DataFrame with a DatetimeIndex named date. The columns share memory with this view"""
+        pd = import_pandas()
+        index = pd.DatetimeIndex(self.index, name="date")
+
+        return pd.DataFrame(self.columns, index=index, copy=False)
+
+    def to_arrow(self):
+        """pyarrow Table with a date column followed by the other columns. Numeric columns are not copied"""
+        pa = import_pyarrow()
+        arrays = [pa.array(self.index)] + [pa.array(column) for column in self.columns.values()]
+
+        return pa.Table.from_arrays(arrays, names=["date"] + list(self.columns.keys()))
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return f"TimeSeriesColumns(rows={len(self)}, columns={self.get_column_names()})"
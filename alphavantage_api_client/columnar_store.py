@@ -0,0 +1,449 @@
+import contextlib
+import os
+import re
+import tempfile
+import threading
+from collections.abc import Mapping
+from typing import Iterator, Optional, Union
+from . import json_codec
+from .columnar import IGNORED_FIELDS, TimeSeriesColumns, import_numpy, import_pyarrow, get_unique_column_names
+from .models import Quote, CurrencyQuote
+
+# schema metadata key holding what is needed to rebuild the Quote
+METADATA_KEY = b"alphavantage_api_client"
+FILE_NAMES = {"parquet": "data.parquet", "feather": "data.arrow"}
+
+
+def import_pyarrow_modules():
+    pa = import_pyarrow()
+    import pyarrow.compute
+    import pyarrow.dataset
+    import pyarrow.feather
+    import pyarrow.ipc
+    import pyarrow.parquet
+    return pa
+
+
+def get_partition(event: dict) -> tuple[str, str, str]:
+    """function, interval and symbol of a request, i.e. ("FX_DAILY", "daily", "EUR-USD")
+
+    The symbol of currency pairs is from_symbol-to_symbol and of crypto symbol-market. The interval of daily, weekly
+    and monthly functions is taken from their name.
+    """
+    function = str(event.get("function", "")).upper()
+    if not function:
+        raise ValueError("function is required to store a time series")
+    interval = event.get("interval")
+    if interval is None:
+        match = re.search(r"(DAILY|WEEKLY|MONTHLY)", function)
+        interval = match.group(1) if match else "none"
+    parts = [event.get("symbol") or event.get("from_symbol"), event.get("market") or event.get("to_symbol")]
+    symbol = "-".join(str(part).strip() for part in parts if part)
+    if not symbol:
+        raise ValueError("symbol (or from_symbol/to_symbol) is required to store a time series")
+
+    return function, str(interval).lower(), symbol.upper()
+
+
+def get_decimals(value) -> int:
+    text = str(value)
+    return len(text) - text.index(".") - 1 if "." in text else 0
+
+
+def get_field_decimals(data: dict) -> dict[str, int]:
+    """Most decimals the api used for each field across every bar, i.e. {"1. open": 4}"""
+    decimals = {}
+    for bar in data.values():
+        for field, value in bar.items():
+            decimals[field] = max(decimals.get(field, 0), get_decimals(value))
+    return decimals
+
+
+@contextlib.contextmanager
+def lock_file(path: str):
+    """Exclusive lock on path across processes while the block runs, the os releases it if the process dies"""
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after 10 seconds
+                    pass
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                import msvcrt
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class ColumnarStore:
+    """Fetched time series on disk as columnar files, one file per function, interval and symbol
+
+    The layout is hive partitioned so a whole function can be scanned as one dataset:
+
+        root/function=TIME_SERIES_DAILY_ADJUSTED/interval=daily/symbol=TSLA/data.parquet
+
+    Every file has a date column (timestamp[s]) sorted ascending plus one column per field, named like
+    TimeSeriesColumns names them. Date range reads are pushed down to the files, so parquet row groups outside the
+    range are skipped. The Meta Data and the original field names are kept in the schema metadata, which is how
+    read_quote() returns the same Quote or CurrencyQuote without calling the api. format is "parquet" (compressed,
+    smaller) or "feather" (uncompressed Arrow IPC, fastest to read). Requires pyarrow.
+
+        Typical usage example:
+
+            store = ColumnarStore("/data/alphavantage")
+            event = {"function": "TIME_SERIES_DAILY_ADJUSTED", "symbol": "TSLA", "outputsize": "full"}
+            store.append(event, client.get_daily_adjusted_quote(event))
+            quote = store.read_quote(event, start="2020-01-01")
+    """
+
+    def __init__(self, root: str, format: str = "parquet"):
+        if format not in FILE_NAMES:
+            raise ValueError(f"format must be one of {list(FILE_NAMES)}, not {format}")
+        self.__root__ = root
+        self.__format__ = format
+        self.__lock__ = threading.Lock()
+
+    def get_root(self) -> str:
+        return self.__root__
+
+    def get_path(self, event: dict) -> str:
+        function, interval, symbol = get_partition(event)
+        return os.path.join(self.__root__, f"function={function}", f"interval={interval}", f"symbol={symbol}",
+                            FILE_NAMES[self.__format__])
+
+    def contains(self, event: dict) -> bool:
+        return os.path.exists(self.get_path(event))
+
+    def get_symbols(self, function: str, interval: Optional[str] = None) -> list[str]:
+        """Symbols stored for a function, for example to scan() them"""
+        function, interval, _ = get_partition({"function": function, "interval": interval, "symbol": "-"})
+        directory = os.path.join(self.__root__, f"function={function}", f"interval={interval}")
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[len("symbol="):] for name in os.listdir(directory) if name.startswith("symbol="))
+
+    def append(self, event: dict, quote: Union[Quote, CurrencyQuote]) -> int:
+        """Merge the bars of a quote into the stored series. Bars on dates already stored are replaced
+
+        Args:
+            event: the request the quote was fetched with, it decides the function, interval and symbol
+            quote: a successful Quote or CurrencyQuote of a time series
+
+        Returns:
+            the number of bars stored for the series
+        """
+        if not quote.success:
+            raise ValueError(f"Only successful quotes can be stored: {quote.error_message}")
+        pa = import_pyarrow_modules()
+        table = self.__to_table__(quote)
+        path = self.get_path(event)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # the file lock keeps other processes from merging into the same series at the same time and losing bars
+        lock_path = os.path.join(os.path.dirname(path), ".lock")  # hidden, so scan() skips it like the temporary files
+        with self.__lock__, lock_file(lock_path):
+            if os.path.exists(path):
+                stored = self.__read_file__(path)
+                metadata = merge_metadata(get_metadata(stored.schema), get_metadata(table.schema))
+                replaced = pa.compute.is_in(stored["date"], value_set=table["date"])
+                stored = stored.filter(pa.compute.invert(replaced)).replace_schema_metadata(None)
+                merged = pa.concat_tables([stored, table.replace_schema_metadata(None)], promote_options="permissive")
+                table = merged.sort_by("date").replace_schema_metadata({METADATA_KEY: json_codec.dumps_bytes(metadata)})
+            self.__write_file__(table, path)
+
+        return table.num_rows
+
+    def read_table(self, event: dict, start: Optional[str] = None, end: Optional[str] = None,
+                   columns: Optional[list[str]] = None):
+        """pyarrow Table of a stored series between start and end (both inclusive), oldest first
+
+        Returns:
+            pyarrow.Table, None when the series isn't stored
+        """
+        path = self.get_path(event)
+        if not os.path.exists(path):
+            return None
+        pa = import_pyarrow_modules()
+        dataset = pa.dataset.dataset(path, format=self.__get_dataset_format__())
+        selected = None if columns is None else ["date"] + [column for column in columns if column != "date"]
+        table = dataset.to_table(columns=selected, filter=get_date_filter(pa, start, end))
+
+        return table.replace_schema_metadata(dataset.schema.metadata)
+
+    def read_quote(self, event: dict, start: Optional[str] = None,
+                   end: Optional[str] = None) -> Optional[Union[Quote, CurrencyQuote]]:
+        """The stored series as the Quote (or CurrencyQuote) the client returned, newest first, without calling the api
+
+        Values are written back with the number of decimals the api used, so a stored series reads back equal to
+        the fetched one.
+
+        Returns:
+            Quote, CurrencyQuote or None when the series isn't stored
+        """
+        table = self.read_table(event, start, end)
+        if table is None:
+            return None
+        return to_quote(table)
+
+    def open_columns(self, event: dict, start: Optional[str] = None,
+                     end: Optional[str] = None) -> Optional[TimeSeriesColumns]:
+        """Memory mapped, read only columns of a stored series between start and end (both inclusive)
+
+        Nothing is copied: the arrays point into the file, so opening takes milliseconds whatever the size and every
+        process opening the same series shares one copy in the page cache. Needs format="feather".
+
+        Returns:
+            TimeSeriesColumns, None when the series isn't stored
+        """
+        mapped = self.__open_mapped__(event, start, end)
+        return None if mapped is None else mapped[0]
+
+    def open_quote(self, event: dict, start: Optional[str] = None,
+                   end: Optional[str] = None) -> Optional[Union[Quote, CurrencyQuote]]:
+        """Like read_quote() but memory mapped. get_columns(), to_numpy() and the indicators read the file directly,
+        data formats a bar only when it is looked up. Needs format="feather".
+
+        Returns:
+            Quote, CurrencyQuote or None when the series isn't stored
+        """
+        mapped = self.__open_mapped__(event, start, end)
+        if mapped is None:
+            return None
+        columns, metadata = mapped
+        fields = {"success": True, "limit_reached": False, "status_code": 200,
+                  "data": MappedSeries(columns, metadata), "meta_data": metadata.get("meta_data", {})}
+        if metadata.get("model") == CurrencyQuote.__name__:
+            quote = CurrencyQuote.model_construct(**fields)
+        else:
+            quote = Quote.model_construct(**fields, symbol=metadata.get("symbol") or "")
+        quote._columns = columns
+
+        return quote
+
+    def scan(self, function: str, interval: Optional[str] = None, symbols: Optional[list[str]] = None,
+             start: Optional[str] = None, end: Optional[str] = None, columns: Optional[list[str]] = None):
+        """One pyarrow Table of many symbols of a function, with a symbol column. Only the files of the requested
+        symbols are opened
+
+        Returns:
+            pyarrow.Table, None when nothing is stored for the function
+        """
+        function, interval, _ = get_partition({"function": function, "interval": interval, "symbol": "-"})
+        directory = os.path.join(self.__root__, f"function={function}", f"interval={interval}")
+        if not os.path.isdir(directory):
+            return None
+        pa = import_pyarrow_modules()
+        partitioning = pa.dataset.partitioning(pa.schema([("symbol", pa.string())]), flavor="hive")
+        dataset = pa.dataset.dataset(directory, format=self.__get_dataset_format__(), partitioning=partitioning)
+        condition = get_date_filter(pa, start, end)
+        if symbols is not None:
+            symbol_filter = pa.dataset.field("symbol").isin([str(symbol).upper() for symbol in symbols])
+            condition = symbol_filter if condition is None else condition & symbol_filter
+        selected = None if columns is None else ["symbol", "date"] + [c for c in columns if c not in ("symbol", "date")]
+
+        return dataset.to_table(columns=selected, filter=condition).replace_schema_metadata(None)
+
+    def __open_mapped__(self, event: dict, start: Optional[str], end: Optional[str]):
+        if self.__format__ != "feather":
+            raise ValueError("Only uncompressed Arrow files can be memory mapped, use ColumnarStore(root, "
+                             "format=\"feather\")")
+        path = self.get_path(event)
+        if not os.path.exists(path):
+            return None
+        pa = import_pyarrow_modules()
+        np = import_numpy()
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        index = to_mapped_array(table["date"])
+        lower, upper = get_date_bounds(start, end)
+        first = 0 if lower is None else int(np.searchsorted(index, lower, side="left"))
+        last = len(index) if upper is None else int(np.searchsorted(index, upper, side="right"))
+        columns = {name: to_mapped_array(table[name])[first:last] for name in table.column_names if name != "date"}
+
+        return TimeSeriesColumns(index[first:last], columns), get_metadata(table.schema)
+
+    def __to_table__(self, quote: Union[Quote, CurrencyQuote]):
+        pa = import_pyarrow_modules()
+        columns = quote.get_columns()
+        decimals = {field: places for field, places in get_field_decimals(quote.data or {}).items()
+                    if field not in IGNORED_FIELDS}
+        fields = {name: [field, decimals[field]] for field, name in get_unique_column_names(decimals).items()}
+        first_date = next(iter(quote.data), "") if quote.data else ""
+        metadata = {
+            "model": type(quote).__name__,
+            "symbol": getattr(quote, "symbol", None),
+            "meta_data": quote.meta_data or {},
+            "date_format": "date" if len(first_date) <= 10 else "datetime",
+            "fields": {name: fields[name] for name in columns.get_column_names() if name in fields}
+        }
+        arrays = [pa.array(columns.index)] + [pa.array(column) for column in columns.columns.values()]
+        table = pa.Table.from_arrays(arrays, names=["date"] + columns.get_column_names())
+
+        return table.replace_schema_metadata({METADATA_KEY: json_codec.dumps_bytes(metadata)})
+
+    def __read_file__(self, path: str):
+        pa = import_pyarrow_modules()
+        if self.__format__ == "parquet":
+            return pa.parquet.read_table(path)
+        return pa.feather.read_table(path)
+
+    def __write_file__(self, table, path: str):
+        pa = import_pyarrow_modules()
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        handle, temporary_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        os.close(handle)
+        try:
+            if self.__format__ == "parquet":
+                pa.parquet.write_table(table, temporary_path, row_group_size=10000)
+            else:
+                # one record batch, so every column maps to one contiguous array
+                pa.feather.write_feather(table, temporary_path, compression="uncompressed",
+                                         chunksize=max(table.num_rows, 1))
+            os.replace(temporary_path, path)  # readers never see a half written file
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    def __get_dataset_format__(self) -> str:
+        return "parquet" if self.__format__ == "parquet" else "ipc"
+
+
+def get_date_bounds(start: Optional[str], end: Optional[str]) -> tuple:
+    """datetime64[s] bounds of a date range, an end without a time includes the whole day"""
+    np = import_numpy()
+    lower = None if start is None else np.datetime64(start, "s")
+    upper = None
+    if end is not None:
+        upper = np.datetime64(end, "s")
+        if len(str(end)) <= 10:
+            upper = upper + np.timedelta64(1, "D") - np.timedelta64(1, "s")
+    return lower, upper
+
+
+def get_date_filter(pa, start: Optional[str], end: Optional[str]):
+    date = pa.dataset.field("date")
+    lower, upper = get_date_bounds(start, end)
+    condition = None
+    if lower is not None:
+        condition = date >= pa.scalar(lower)
+    if upper is not None:
+        before_end = date <= pa.scalar(upper)
+        condition = before_end if condition is None else condition & before_end
+    return condition
+
+
+def to_mapped_array(column):
+    """numpy view of a column without copying when it is one chunk without nulls, a copy otherwise"""
+    pa = import_pyarrow()
+    if column.num_chunks == 1:
+        try:
+            return column.chunk(0).to_numpy(zero_copy_only=True)
+        except pa.ArrowInvalid:
+            pass
+    return column.to_numpy()
+
+
+def get_value_formats(metadata: dict, names: list[str]) -> list[tuple[str, str, Optional[str]]]:
+    """(column, original field, format) of the columns, format is None for whole numbers"""
+    fields = metadata.get("fields", {})
+    formats = []
+    for name in names:
+        field, decimals = fields.get(name, [name, None])
+        formats.append((name, field, "{:.%df}" % decimals if decimals is not None else "{}"))
+    return formats
+
+
+def format_values(values, pattern: str) -> list[Optional[str]]:
+    np = import_numpy()
+    if np.issubdtype(values.dtype, np.integer):
+        return [str(value) for value in values.tolist()]
+    return [None if value != value else pattern.format(value) for value in values.tolist()]
+
+
+def get_date_unit(metadata: dict) -> str:
+    return "D" if metadata.get("date_format") == "date" else "s"
+
+
+def to_quote(table) -> Union[Quote, CurrencyQuote]:
+    """The Quote or CurrencyQuote a table written by ColumnarStore was built from, newest first"""
+    np = import_numpy()
+    metadata = get_metadata(table.schema)
+    dates = np.datetime_as_string(table["date"].to_numpy(), unit=get_date_unit(metadata))
+    names = [name for name in table.column_names if name != "date"]
+    columns = [(field, format_values(table[name].to_numpy(zero_copy_only=False), pattern))
+               for name, field, pattern in get_value_formats(metadata, names)]
+    data = {}
+    for row in reversed(range(len(dates))):
+        data[dates[row].replace("T", " ")] = {field: texts[row] for field, texts in columns if texts[row] is not None}
+    response = {"success": True, "limit_reached": False, "status_code": 200, "Meta Data": metadata.get("meta_data", {}),
+                "data": data}
+    if metadata.get("model") == CurrencyQuote.__name__:
+        return CurrencyQuote.model_validate(response)
+
+    return Quote.model_validate({**response, "symbol": metadata.get("symbol") or ""})
+
+
+def get_metadata(schema) -> dict:
+    return json_codec.loads((schema.metadata or {}).get(METADATA_KEY, b"{}"))
+
+
+def merge_metadata(stored: dict, metadata: dict) -> dict:
+    """metadata of the newer quote, keeping the fields only stored bars have and the most decimals of each field"""
+    fields = dict(stored.get("fields", {}))
+    for name, (field, decimals) in metadata.get("fields", {}).items():
+        fields[name] = [field, max(decimals, fields.get(name, [field, 0])[1])]
+    return {**metadata, "fields": fields}
+
+
+class MappedSeries(Mapping):
+    """Read only date -> bar mapping over memory mapped columns, newest first like Quote.data
+
+    Bars are formatted when they are looked up, so opening a series costs nothing per bar and the prices stay in
+    the page cache shared by every process that maps the same file.
+    """
+
+    def __init__(self, columns: TimeSeriesColumns, metadata: dict):
+        self.__columns__ = columns
+        self.__metadata__ = metadata
+        np = import_numpy()
+        self.__formats__ = [(name, field, "{}" if np.issubdtype(columns[name].dtype, np.integer) else pattern)
+                            for name, field, pattern in get_value_formats(metadata, columns.get_column_names())]
+        self.__dates__ = None
+        self.__positions__ = None
+
+    def get_dates(self) -> list[str]:
+        """Dates newest first, formatted the way the api formats them"""
+        if self.__dates__ is None:
+            np = import_numpy()
+            dates = np.datetime_as_string(self.__columns__.index[::-1], unit=get_date_unit(self.__metadata__))
+            self.__dates__ = [date.replace("T", " ") for date in dates.tolist()]
+        return self.__dates__
+
+    def __getitem__(self, date: str) -> dict:
+        if self.__positions__ is None:
+            dates = self.get_dates()
+            self.__positions__ = {value: len(dates) - 1 - position for position, value in enumerate(dates)}
+        position = self.__positions__[date]
+        bar = {}
+        for name, field, pattern in self.__formats__:
+            value = self.__columns__[name][position].item()
+            if value == value:
+                bar[field] = pattern.format(value)
+        return bar
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.get_dates())
+
+    def __len__(self) -> int:
+        return len(self.__columns__)
@@ -0,0 +1,209 @@
+import os
+import tempfile
+from typing import Iterable, Optional
+from .columnar import import_numpy, import_pandas, import_pyarrow, parse_floats
+from .models import AccountingReport
+
+# prefix of the columns of each accounting report, the same prefixes Ticker.correlate_accounting_reports() uses
+REPORT_PREFIXES = {
+    "balance_sheet": "balance_",
+    "income_statement": "income_",
+    "earnings": "earnings_",
+    "cash_flow": "cash_",
+}
+PERIODS = (("annual", "annualReports"), ("quarterly", "quarterlyReports"))
+KEY_FIELDS = ("symbol", "period", "fiscal_date_ending")
+DATE_FIELD = "fiscalDateEnding"
+
+# how alpha vantage reports a missing value
+MISSING_VALUES = {"None", "", "-", None}
+
+
+def parse_numbers(values: list):
+    """float64 array of the values, missing and text values become NaN. None when no value is a number"""
+    np = import_numpy()
+    try:
+        parsed = np.array(["nan" if value in MISSING_VALUES else value for value in values], dtype=np.float64)
+    except (ValueError, TypeError):
+        parsed = parse_floats(values)  # text fields, i.e. reportedCurrency
+    if parsed is None or np.isnan(parsed).all():
+        return None
+    return parsed
+
+
+class FundamentalsTable:
+    """Accounting reports of one or many symbols as one wide, numeric table
+
+    There is one row per symbol, period ("annual" or "quarterly") and fiscal date ending, sorted in that order with
+    the oldest fiscal date first. Every numeric field of every report is one float64 column named after the report
+    and the field, i.e. "balance_totalAssets" or "earnings_reportedEPS". Missing values ("None" in the api) are
+    NaN, fields that are never numbers (i.e. reportedCurrency) are left out. Requires numpy.
+
+        Typical usage example:
+
+            table = FundamentalsTable.from_reports("TSLA", {"balance_sheet": client.get_balance_sheet("TSLA")})
+            quarterly = table.select(period="quarterly")
+            equity = quarterly["balance_totalShareholderEquity"]
+    """
+
+    def __init__(self, symbols, periods, fiscal_dates, columns: dict):
+        self.symbols = symbols
+        self.periods = periods
+        self.fiscal_dates = fiscal_dates
+        self.columns = columns
+
+    @classmethod
+    def empty(cls) -> "FundamentalsTable":
+        np = import_numpy()
+        return cls(np.array([], dtype=str), np.array([], dtype=str), np.array([], dtype="datetime64[D]"), {})
+
+    @classmethod
+    def from_reports(cls, symbol: str, reports: dict[str, AccountingReport]) -> "FundamentalsTable":
+        """Correlate the accounting reports of a symbol by period and fiscal date ending
+
+        The reports are only read, never copied or changed.
+
+        Args:
+            symbol: the symbol of the reports
+            reports: report name (a key of REPORT_PREFIXES) -> AccountingReport
+
+        Returns:
+            FundamentalsTable
+        """
+        np = import_numpy()
+        rows: dict[tuple[str, str], int] = {}
+        for report in reports.values():
+            for period, attribute in PERIODS:
+                for record in getattr(report, attribute):
+                    rows.setdefault((period, record[DATE_FIELD]), len(rows))
+        columns = {}
+        for name, report in reports.items():
+            prefix = REPORT_PREFIXES.get(name, f"{name}_")
+            for period, attribute in PERIODS:
+                records = getattr(report, attribute)
+                if len(records) == 0:
+                    continue
+                positions = np.array([rows[(period, record[DATE_FIELD])] for record in records])
+                # one array per field instead of one assignment per value
+                for field in dict.fromkeys(field for record in records for field in record):
+                    if field == DATE_FIELD:
+                        continue
+                    values = parse_numbers([record.get(field) for record in records])
+                    if values is None:
+                        continue
+                    column = columns.get(prefix + field)
+                    if column is None:
+                        column = columns[prefix + field] = np.full(len(rows), np.nan)
+                    column[positions] = values
+        keys = list(rows.keys())
+        table = cls(np.full(len(keys), str(symbol).upper()), np.array([period for period, _ in keys], dtype=str),
+                    np.array([date for _, date in keys], dtype="datetime64[D]"), columns)
+
+        return table.__sorted__()
+
+    @classmethod
+    def concat(cls, tables: Iterable["FundamentalsTable"]) -> "FundamentalsTable":
+        """One table with the rows of every table. Columns missing from a table are NaN for its rows"""
+        np = import_numpy()
+        tables = [table for table in tables if len(table) > 0]
+        if len(tables) == 0:
+            return cls.empty()
+        names = list(dict.fromkeys(name for table in tables for name in table.columns))
+        columns = {name: np.concatenate([table.columns[name] if name in table.columns else np.full(len(table), np.nan)
+                                         for table in tables]) for name in names}
+
+        return cls(np.concatenate([table.symbols for table in tables]),
+                   np.concatenate([table.periods for table in tables]),
+                   np.concatenate([table.fiscal_dates for table in tables]), columns).__sorted__()
+
+    def __sorted__(self) -> "FundamentalsTable":
+        np = import_numpy()
+        order = np.lexsort((self.fiscal_dates, self.periods, self.symbols))
+        if len(order) > 1 and np.all(order[:-1] < order[1:]):
+            return self
+        return self.__take__(order)
+
+    def __take__(self, positions) -> "FundamentalsTable":
+        return FundamentalsTable(self.symbols[positions], self.periods[positions], self.fiscal_dates[positions],
+                                 {name: column[positions] for name, column in self.columns.items()})
+
+    def select(self, symbol: Optional[str] = None, period: Optional[str] = None,
+               symbols: Optional[Iterable[str]] = None) -> "FundamentalsTable":
+        """The rows of a symbol (or any of symbols) and/or a period ("annual" or "quarterly")"""
+        np = import_numpy()
+        mask = np.ones(len(self), dtype=bool)
+        if symbol is not None:
+            mask &= self.symbols == str(symbol).upper()
+        if symbols is not None:
+            mask &= np.isin(self.symbols, [str(value).upper() for value in symbols])
+        if period is not None:
+            mask &= self.periods == period
+        return self.__take__(np.flatnonzero(mask))
+
+    def get_symbols(self) -> list[str]:
+        return list(dict.fromkeys(self.symbols.tolist()))
+
+    def get(self, name: str, default=None):
+        return self.columns.get(name, default)
+
+    def get_column_names(self) -> list[str]:
+        return list(self.columns.keys())
+
+    def get_memory_usage(self) -> int:
+        """Bytes held by the keys and the columns"""
+        return self.symbols.nbytes + self.periods.nbytes + self.fiscal_dates.nbytes + \
+            sum(column.nbytes for column in self.columns.values())
+
+    def to_pandas(self):
+        """pandas DataFrame with symbol, period and fiscal_date_ending columns followed by the numeric columns"""
+        pd = import_pandas()
+        keys = {"symbol": self.symbols, "period": self.periods, "fiscal_date_ending": self.fiscal_dates}
+        return pd.DataFrame({**keys, **self.columns}, copy=False)
+
+    def to_arrow(self):
+        """pyarrow Table with symbol, period and fiscal_date_ending columns followed by the numeric columns"""
+        pa = import_pyarrow()
+        arrays = [pa.array(self.symbols), pa.array(self.periods), pa.array(self.fiscal_dates)] + \
+            [pa.array(column) for column in self.columns.values()]
+        return pa.Table.from_arrays(arrays, names=list(KEY_FIELDS) + self.get_column_names())
+
+    def save(self, path: str, **extra_arrays):
+        """Write the table (and any extra named arrays) to a .npz file. The file is replaced atomically"""
+        np = import_numpy()
+        arrays = {"key:symbol": self.symbols, "key:period": self.periods, "key:fiscal_date_ending": self.fiscal_dates}
+        arrays.update({f"column:{name}": column for name, column in self.columns.items()})
+        arrays.update({f"extra:{name}": array for name, array in extra_arrays.items()})
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez(file, **arrays)
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> tuple["FundamentalsTable", dict]:
+        """The table and the extra arrays written by save()"""
+        np = import_numpy()
+        with np.load(path, allow_pickle=False) as arrays:
+            columns = {name[len("column:"):]: arrays[name] for name in arrays.files if name.startswith("column:")}
+            extra = {name[len("extra:"):]: arrays[name] for name in arrays.files if name.startswith("extra:")}
+            table = cls(arrays["key:symbol"], arrays["key:period"], arrays["key:fiscal_date_ending"], columns)
+        return table, extra
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return f"FundamentalsTable(rows={len(self)}, symbols={len(set(self.symbols.tolist()))}, " \
+               f"columns={len(self.columns)})"
@@ -0,0 +1,764 @@
+from typing import Callable, Optional
+from .columnar import import_numpy
+from .models import Quote
+
+# the client's defaults, so a local indicator matches the one you would get from the api
+DEFAULT_PARAMS = {"time_period": "60", "series_type": "close", "fastperiod": "12", "slowperiod": "26",
+                  "signalperiod": "9", "nbdevup": "2", "nbdevdn": "2", "fastkperiod": "5", "slowkperiod": "3",
+                  "slowdperiod": "3", "fastdperiod": "3", "matype": "0", "fastmatype": "0", "slowmatype": "0",
+                  "signalmatype": "0", "slowkmatype": "0", "slowdmatype": "0", "fastdmatype": "0",
+                  "timeperiod1": "7", "timeperiod2": "14", "timeperiod3": "28", "acceleration": "0.01",
+                  "maximum": "0.20"}
+
+# matype values of the api, 8 (MAMA) is not supported by the local engine
+MA_TYPES = {0: "SMA", 1: "EMA", 2: "WMA", 3: "DEMA", 4: "TEMA", 5: "TRIMA", 6: "T3", 7: "KAMA"}
+
+
+class Indicator:
+    """How to compute one technical indicator
+
+    Args:
+        function: the alpha vantage function name, i.e. SMA
+        description: the indicator name alpha vantage reports in Meta Data
+        outputs: the fields of each row in the response, in the api's order
+        compute: numpy implementation, takes the price columns and the params and returns one array per output
+            aligned with the price index. Rows still warming up are NaN
+        params: the params it reads, reported in Meta Data
+        inputs: the price columns it reads, "series" is the one chosen by series_type
+        defaults: params whose default differs from DEFAULT_PARAMS for this indicator
+    """
+
+    def __init__(self, function: str, description: str, outputs: list[str], compute: Callable,
+                 params: tuple = ("time_period", "series_type"), inputs: tuple = ("series",),
+                 defaults: Optional[dict] = None):
+        self.function = function
+        self.description = description
+        self.outputs = outputs
+        self.compute = compute
+        self.params = params
+        self.inputs = inputs
+        self.defaults = defaults or {}
+
+    def get_params(self, event: Optional[dict] = None) -> dict:
+        """The defaults overridden by the params of the event that are set"""
+        params = {**DEFAULT_PARAMS, **self.defaults}
+        params.update({key: value for key, value in (event or {}).items() if value is not None})
+        return params
+
+
+def rolling_windows(values, time_period: int):
+    np = import_numpy()
+    return np.lib.stride_tricks.sliding_window_view(values, time_period)
+
+
+def first_valid(values) -> int:
+    np = import_numpy()
+    valid = np.flatnonzero(~np.isnan(values))
+    return int(valid[0]) if len(valid) > 0 else len(values)
+
+
+def sma(values, time_period: int):
+    """Simple moving average. Leading NaN (an indicator warming up) are skipped"""
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    start = first_valid(values)
+    if len(values) - start >= time_period:
+        sums = np.concatenate(([0.0], np.cumsum(values[start:])))
+        result[start + time_period - 1:] = (sums[time_period:] - sums[:-time_period]) / time_period
+    return result
+
+
+def ema(values, time_period: int, smoothing: Optional[float] = None):
+    """Exponential moving average seeded with the simple average of the first time_period values
+
+    smoothing defaults to 2 / (time_period + 1). Wilder's smoothing (RSI, ATR) is 1 / time_period.
+    """
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    start = first_valid(values)
+    if len(values) - start < time_period:
+        return result
+    k = 2 / (time_period + 1) if smoothing is None else smoothing
+    seed_at = start + time_period - 1
+    average = float(np.mean(values[start:seed_at + 1]))
+    smoothed = [average]
+    for value in values[seed_at + 1:].tolist():
+        average += k * (value - average)
+        smoothed.append(average)
+    result[seed_at:] = smoothed
+    return result
+
+
+def wilder(values, time_period: int):
+    return ema(values, time_period, 1 / time_period)
+
+
+def wilder_sum(values, time_period: int):
+    """Wilder's running sum (directional movement): the sum of the first time_period - 1 values, then
+    sum - sum / time_period + value"""
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    start = first_valid(values)
+    seed_at = start + max(time_period - 1, 1) - 1
+    if seed_at >= len(values):
+        return result
+    total = float(np.sum(values[start:seed_at + 1])) if time_period > 1 else float(values[start])
+    sums = [total]
+    for value in values[seed_at + 1:].tolist():
+        total = total - total / time_period + value
+        sums.append(total)
+    result[seed_at:] = sums
+    return result
+
+
+def wma(values, time_period: int):
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    if len(values) >= time_period:
+        weights = np.arange(1, time_period + 1, dtype=np.float64)
+        result[time_period - 1:] = rolling_windows(values, time_period) @ weights / weights.sum()
+    return result
+
+
+def dema(values, time_period: int):
+    first = ema(values, time_period)
+    return 2 * first - ema(first, time_period)
+
+
+def tema(values, time_period: int):
+    first = ema(values, time_period)
+    second = ema(first, time_period)
+    return 3 * first - 3 * second + ema(second, time_period)
+
+
+def trima(values, time_period: int):
+    first_period = (time_period + 1) // 2
+    second_period = first_period if time_period % 2 == 1 else first_period + 1
+    return sma(sma(values, first_period), second_period)
+
+
+def t3(values, time_period: int, vfactor: float = 0.7):
+    """Tillson's T3, six EMAs in a row combined with the volume factor"""
+    averages = [ema(values, time_period)]
+    for _ in range(5):
+        averages.append(ema(averages[-1], time_period))
+    cube, square = vfactor ** 3, vfactor ** 2
+    return -cube * averages[5] + (3 * square + 3 * cube) * averages[4] + \
+        (-6 * square - 3 * vfactor - 3 * cube) * averages[3] + (1 + 3 * vfactor + cube + 3 * square) * averages[2]
+
+
+def kama(values, time_period: int):
+    """Kaufman adaptive moving average, smoothing between 2 and 30 periods by the efficiency ratio"""
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    start = first_valid(values)
+    if len(values) - start <= time_period:
+        return result
+    prices = values[start:].tolist()
+    fastest, slowest = 2 / 3, 2 / 31
+    volatility = sum(abs(prices[position] - prices[position - 1]) for position in range(1, time_period + 1))
+    average = prices[time_period - 1]
+    smoothed = []
+    for position in range(time_period, len(prices)):
+        if position > time_period:
+            volatility -= abs(prices[position - time_period] - prices[position - time_period - 1])
+            volatility += abs(prices[position] - prices[position - 1])
+        direction = prices[position] - prices[position - time_period]
+        efficiency = kaufman_efficiency(direction, volatility)
+        average += (efficiency * (fastest - slowest) + slowest) ** 2 * (prices[position] - average)
+        smoothed.append(average)
+    result[start + time_period:] = smoothed
+    return result
+
+
+def kaufman_efficiency(direction: float, volatility: float) -> float:
+    """How much of the movement (volatility) went one way (direction), 1 when the running sum is about 0"""
+    if volatility <= direction or -1e-8 < volatility < 1e-8:
+        return 1.0
+    return abs(direction / volatility)
+
+
+MOVING_AVERAGES = {0: sma, 1: ema, 2: wma, 3: dema, 4: tema, 5: trima, 6: t3, 7: kama}
+
+
+def moving_average(values, time_period: int, matype=0):
+    """The moving average of the api's matype (0 SMA, 1 EMA, 2 WMA, 3 DEMA, 4 TEMA, 5 TRIMA, 6 T3, 7 KAMA)"""
+    average = MOVING_AVERAGES.get(int(matype))
+    if average is None:
+        raise ValueError(f"matype {matype} is not supported by the local engine, use one of {MA_TYPES}")
+    return average(values, time_period)
+
+
+def get_lookback(time_period: int, matype=0) -> int:
+    """Bars a moving average needs before its first value"""
+    if int(matype) == 7:
+        return time_period
+    return {3: 2, 4: 3, 6: 6}.get(int(matype), 1) * (time_period - 1)
+
+
+def lagged(values, periods: int):
+    """values with the first periods valid values dropped, so an average starts that much later"""
+    np = import_numpy()
+    result = np.array(values, dtype=np.float64)
+    result[:first_valid(values) + periods] = np.nan
+    return result
+
+
+def aligned_averages(values, fast_period: int, slow_period: int, fast_type=0, slow_type=0):
+    """The fast and the slow moving average started on the same bar, like TA-Lib does for MACD"""
+    if slow_period < fast_period:
+        fast_period, slow_period, fast_type, slow_type = slow_period, fast_period, slow_type, fast_type
+    fast_lookback, slow_lookback = get_lookback(fast_period, fast_type), get_lookback(slow_period, slow_type)
+    lookback = max(fast_lookback, slow_lookback)
+    return moving_average(lagged(values, lookback - fast_lookback), fast_period, fast_type), \
+        moving_average(lagged(values, lookback - slow_lookback), slow_period, slow_type)
+
+
+def rolling_sum(values, time_period: int):
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    if len(values) >= time_period:
+        result[time_period - 1:] = rolling_windows(values, time_period).sum(axis=1)
+    return result
+
+
+def divide(numerator, denominator, scale: float = 1.0):
+    """scale * numerator / denominator, 0 where the denominator is 0 like TA-Lib"""
+    np = import_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator == 0, 0.0, scale * numerator / denominator)
+
+
+def rolling_max(values, time_period: int):
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    if len(values) >= time_period:
+        result[time_period - 1:] = rolling_windows(values, time_period).max(axis=1)
+    return result
+
+
+def rolling_min(values, time_period: int):
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    if len(values) >= time_period:
+        result[time_period - 1:] = rolling_windows(values, time_period).min(axis=1)
+    return result
+
+
+def shift(values, periods: int):
+    """values moved forward by periods, the first periods are NaN"""
+    np = import_numpy()
+    result = np.full(len(values), np.nan)
+    if periods < len(values):
+        result[periods:] = values[:len(values) - periods]
+    return result
+
+
+def true_range(high, low, close):
+    np = import_numpy()
+    previous_close = shift(close, 1)
+    ranges = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    ranges[0] = np.nan  # alpha vantage starts the true range at the second bar
+    return ranges
+
+
+def compute_average(average: Callable) -> Callable:
+    def compute(prices, params):
+        return [average(prices[params["series_type"]], int(params["time_period"]))]
+
+    return compute
+
+
+def compute_t3(prices, params):
+    return [t3(prices[params["series_type"]], int(params["time_period"]), float(params["vfactor"]))]
+
+
+def compute_macdext(prices, params):
+    np = import_numpy()
+    fast, slow = aligned_averages(prices[params["series_type"]], int(params["fastperiod"]),
+                                  int(params["slowperiod"]), params["fastmatype"], params["slowmatype"])
+    macd = fast - slow
+    signal = moving_average(macd, int(params["signalperiod"]), params["signalmatype"])
+    macd = np.where(np.isnan(signal), np.nan, macd)  # the three lines start on the same bar
+    return [macd, macd - signal, signal]
+
+
+def compute_macd(prices, params):
+    return compute_macdext(prices, {**params, "fastmatype": 1, "slowmatype": 1, "signalmatype": 1})
+
+
+def price_oscillator(prices, params):
+    """The fast and the slow average of the price oscillators, each started as soon as it can"""
+    values, matype = prices[params["series_type"]], params["matype"]
+    fast_period, slow_period = sorted((int(params["fastperiod"]), int(params["slowperiod"])))
+    return moving_average(values, fast_period, matype), moving_average(values, slow_period, matype)
+
+
+def compute_apo(prices, params):
+    fast, slow = price_oscillator(prices, params)
+    return [fast - slow]
+
+
+def compute_ppo(prices, params):
+    fast, slow = price_oscillator(prices, params)
+    return [divide(fast - slow, slow, 100)]
+
+
+def average_gain_and_loss(values, time_period: int):
+    """Wilder's averages of the gains and the losses from one value to the next"""
+    np = import_numpy()
+    change = np.diff(values, prepend=np.nan)
+    return wilder(np.where(np.isnan(change), np.nan, np.fmax(change, 0)), time_period), \
+        wilder(np.where(np.isnan(change), np.nan, np.fmax(-change, 0)), time_period)
+
+
+def compute_rsi(prices, params):
+    np = import_numpy()
+    gain, loss = average_gain_and_loss(prices[params["series_type"]], int(params["time_period"]))
+    return [np.where(np.isnan(gain), np.nan, divide(gain, gain + loss, 100))]
+
+
+def compute_bbands(prices, params):
+    np = import_numpy()
+    values, time_period = prices[params["series_type"]], int(params["time_period"])
+    middle = moving_average(values, time_period, params["matype"])
+    deviation = np.full(len(values), np.nan)
+    if len(values) >= time_period:
+        deviation[time_period - 1:] = rolling_windows(values, time_period).std(axis=1)
+    return [middle + float(params["nbdevup"]) * deviation, middle, middle - float(params["nbdevdn"]) * deviation]
+
+
+def compute_atr(prices, params):
+    return [wilder(true_range(prices["high"], prices["low"], prices["close"]), int(params["time_period"]))]
+
+
+def compute_natr(prices, params):
+    return [compute_atr(prices, params)[0] / prices["close"] * 100]
+
+
+def compute_mom(prices, params):
+    values, time_period = prices[params["series_type"]], int(params["time_period"])
+    return [values - shift(values, time_period)]
+
+
+def compute_roc(prices, params):
+    values, time_period = prices[params["series_type"]], int(params["time_period"])
+    return [(values / shift(values, time_period) - 1) * 100]
+
+
+def compute_rocr(prices, params):
+    values, time_period = prices[params["series_type"]], int(params["time_period"])
+    return [values / shift(values, time_period)]
+
+
+def compute_willr(prices, params):
+    time_period = int(params["time_period"])
+    highest, lowest = rolling_max(prices["high"], time_period), rolling_min(prices["low"], time_period)
+    return [divide(highest - prices["close"], highest - lowest, -100)]
+
+
+def compute_cci(prices, params):
+    np = import_numpy()
+    time_period = int(params["time_period"])
+    typical = (prices["high"] + prices["low"] + prices["close"]) / 3
+    result = np.full(len(typical), np.nan)
+    if len(typical) >= time_period:
+        windows = rolling_windows(typical, time_period)
+        mean = windows.mean(axis=1)
+        deviation = np.abs(windows - mean[:, None]).mean(axis=1)
+        result[time_period - 1:] = divide(typical[time_period - 1:] - mean, 0.015 * deviation)
+    return [result]
+
+
+def compute_cmo(prices, params):
+    np = import_numpy()
+    gain, loss = average_gain_and_loss(prices[params["series_type"]], int(params["time_period"]))
+    return [np.where(np.isnan(gain), np.nan, divide(gain - loss, gain + loss, 100))]
+
+
+def compute_midpoint(prices, params):
+    values, time_period = prices[params["series_type"]], int(params["time_period"])
+    return [(rolling_max(values, time_period) + rolling_min(values, time_period)) / 2]
+
+
+def compute_midprice(prices, params):
+    time_period = int(params["time_period"])
+    return [(rolling_max(prices["high"], time_period) + rolling_min(prices["low"], time_period)) / 2]
+
+
+def compute_obv(prices, params):
+    np = import_numpy()
+    close, volume = prices["close"], prices["volume"]
+    flow = np.sign(np.diff(close, prepend=close[:1])) * volume
+    flow[:1] = volume[:1]
+    return [np.cumsum(flow)]
+
+
+def compute_ad(prices, params):
+    np = import_numpy()
+    high, low, close = prices["high"], prices["low"], prices["close"]
+    spread = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        location = np.where(spread == 0, 0.0, ((close - low) - (high - close)) / spread)
+    return [np.cumsum(location * prices["volume"])]
+
+
+def fast_stochastic(high, low, close, time_period: int):
+    """%K, where the close is between the lowest low and the highest high of time_period bars"""
+    highest, lowest = rolling_max(high, time_period), rolling_min(low, time_period)
+    return divide(close - lowest, highest - lowest, 100)
+
+
+def compute_stoch(prices, params):
+    np = import_numpy()
+    fast_k = fast_stochastic(prices["high"], prices["low"], prices["close"], int(params["fastkperiod"]))
+    slow_k = moving_average(fast_k, int(params["slowkperiod"]), params["slowkmatype"])
+    slow_d = moving_average(slow_k, int(params["slowdperiod"]), params["slowdmatype"])
+    return [np.where(np.isnan(slow_d), np.nan, slow_k), slow_d]
+
+
+def compute_stochf(prices, params):
+    np = import_numpy()
+    fast_k = fast_stochastic(prices["high"], prices["low"], prices["close"], int(params["fastkperiod"]))
+    fast_d = moving_average(fast_k, int(params["fastdperiod"]), params["fastdmatype"])
+    return [np.where(np.isnan(fast_d), np.nan, fast_k), fast_d]
+
+
+def compute_stochrsi(prices, params):
+    rsi = compute_rsi(prices, params)[0]
+    return compute_stochf({"high": rsi, "low": rsi, "close": rsi}, params)
+
+
+def compute_aroon(prices, params):
+    np = import_numpy()
+    time_period = int(params["time_period"])
+    down, up = np.full(len(prices["high"]), np.nan), np.full(len(prices["high"]), np.nan)
+    if len(prices["high"]) > time_period:
+        # bars since the extreme inside the last time_period + 1 bars, the newest extreme wins a tie
+        since_high = rolling_windows(prices["high"], time_period + 1)[:, ::-1].argmax(axis=1)
+        since_low = rolling_windows(prices["low"], time_period + 1)[:, ::-1].argmin(axis=1)
+        up[time_period:] = 100 * (time_period - since_high) / time_period
+        down[time_period:] = 100 * (time_period - since_low) / time_period
+    return [down, up]
+
+
+def compute_aroonosc(prices, params):
+    down, up = compute_aroon(prices, params)
+    return [up - down]
+
+
+def compute_bop(prices, params):
+    return [divide(prices["close"] - prices["open"], prices["high"] - prices["low"])]
+
+
+def compute_mfi(prices, params):
+    np = import_numpy()
+    time_period = int(params["time_period"])
+    typical = (prices["high"] + prices["low"] + prices["close"]) / 3
+    flow = typical * prices["volume"]
+    change = np.diff(typical, prepend=np.nan)
+    positive = rolling_sum(np.where(np.isnan(change), np.nan, np.where(change > 0, flow, 0.0)), time_period)
+    negative = rolling_sum(np.where(np.isnan(change), np.nan, np.where(change < 0, flow, 0.0)), time_period)
+    total = positive + negative
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return [np.where(total < 1, 0.0, 100 * positive / total)]
+
+
+def compute_trix(prices, params):
+    values, time_period = prices[params["series_type"]], int(params["time_period"])
+    third = ema(ema(ema(values, time_period), time_period), time_period)
+    return [divide(third - shift(third, 1), shift(third, 1), 100)]
+
+
+def compute_ultosc(prices, params):
+    np = import_numpy()
+    previous_close = shift(prices["close"], 1)
+    true_low = np.fmin(prices["low"], previous_close)
+    buying_pressure = prices["close"] - true_low
+    ranges = np.fmax(prices["high"], previous_close) - true_low
+    buying_pressure[0] = ranges[0] = np.nan
+    periods = sorted(int(params[name]) for name in ("timeperiod1", "timeperiod2", "timeperiod3"))
+    averages = [divide(rolling_sum(buying_pressure, period), rolling_sum(ranges, period)) for period in periods]
+    result = 100 * (4 * averages[0] + 2 * averages[1] + averages[2]) / 7
+    result[:periods[-1]] = np.nan
+    return [result]
+
+
+def directional_movement(high, low):
+    """+DM and -DM of each bar, the first bar has none"""
+    np = import_numpy()
+    up, down = np.diff(high, prepend=np.nan), -np.diff(low, prepend=np.nan)
+    plus = np.where((up > down) & (up > 0), up, 0.0)
+    minus = np.where((down > up) & (down > 0), down, 0.0)
+    plus[:1], minus[:1] = np.nan, np.nan
+    return plus, minus
+
+
+def directional_indicators(prices, params):
+    """+DI and -DI, starting one bar after the smoothed directional movement"""
+    time_period = int(params["time_period"])
+    plus, minus = directional_movement(prices["high"], prices["low"])
+    ranges = wilder_sum(true_range(prices["high"], prices["low"], prices["close"]), time_period)
+    plus_di, minus_di = divide(wilder_sum(plus, time_period), ranges, 100), \
+        divide(wilder_sum(minus, time_period), ranges, 100)
+    plus_di[:first_valid(ranges) + 1], minus_di[:first_valid(ranges) + 1] = float("nan"), float("nan")
+    return plus_di, minus_di
+
+
+def compute_dx(prices, params):
+    np = import_numpy()
+    plus_di, minus_di = directional_indicators(prices, params)
+    return [divide(np.abs(plus_di - minus_di), plus_di + minus_di, 100)]
+
+
+def compute_adx(prices, params):
+    return [wilder(compute_dx(prices, params)[0], int(params["time_period"]))]
+
+
+def compute_adxr(prices, params):
+    adx = compute_adx(prices, params)[0]
+    return [(adx + shift(adx, int(params["time_period"]) - 1)) / 2]
+
+
+def compute_adosc(prices, params):
+    np = import_numpy()
+    ad = compute_ad(prices, params)[0]
+    fast_period, slow_period = int(params["fastperiod"]), int(params["slowperiod"])
+    # both averages start at the first bar, like TA-Lib does for this indicator
+    result = ema(ad, 1, 2 / (fast_period + 1)) - ema(ad, 1, 2 / (slow_period + 1))
+    result[:max(fast_period, slow_period) - 1] = np.nan
+    return [result]
+
+
+def start_parabolic_sar(previous_high: float, previous_low: float, high: float, low: float,
+                        acceleration: float) -> dict:
+    """State of the parabolic SAR at its first bar (the second bar), long unless the first bar moved down"""
+    up, down = high - previous_high, previous_low - low
+    is_long = not (down > 0 and down > up)
+    return {"is_long": is_long, "sar": previous_low if is_long else previous_high,
+            "extreme": high if is_long else low, "factor": acceleration, "high": high, "low": low}
+
+
+def parabolic_sar_step(state: dict, high: float, low: float, acceleration: float, maximum: float) -> float:
+    """Move the parabolic SAR to the next bar and return its value for the bar. state is changed in place"""
+    previous_high, previous_low = state["high"], state["low"]
+    sar, extreme, factor = state["sar"], state["extreme"], state["factor"]
+    if state["is_long"] and low <= sar:
+        # the low went through the SAR, switch to short from the extreme
+        state["is_long"] = False
+        value = max(extreme, previous_high, high)
+        factor, extreme = acceleration, low
+        sar = max(value + factor * (extreme - value), previous_high, high)
+    elif state["is_long"]:
+        value = sar
+        if high > extreme:
+            extreme, factor = high, min(factor + acceleration, maximum)
+        sar = min(sar + factor * (extreme - sar), previous_low, low)
+    elif high >= sar:
+        state["is_long"] = True
+        value = min(extreme, previous_low, low)
+        factor, extreme = acceleration, high
+        sar = min(value + factor * (extreme - value), previous_low, low)
+    else:
+        value = sar
+        if low < extreme:
+            extreme, factor = low, min(factor + acceleration, maximum)
+        sar = max(sar + factor * (extreme - sar), previous_high, high)
+    state.update({"sar": sar, "extreme": extreme, "factor": factor, "high": high, "low": low})
+    return value
+
+
+def compute_sar(prices, params):
+    np = import_numpy()
+    high, low = prices["high"].tolist(), prices["low"].tolist()
+    maximum = float(params["maximum"])
+    acceleration = min(float(params["acceleration"]), maximum)
+    result = np.full(len(high), np.nan)
+    if len(high) > 1:
+        state = start_parabolic_sar(high[0], low[0], high[1], low[1], acceleration)
+        result[1:] = [parabolic_sar_step(state, bar_high, bar_low, acceleration, maximum)
+                      for bar_high, bar_low in zip(high[1:], low[1:])]
+    return [result]
+
+
+HLC = ("high", "low", "close")
+
+HL = ("high", "low")
+SLOW_AND_FAST = ("fastperiod", "slowperiod", "matype", "series_type")
+
+INDICATORS = {indicator.function: indicator for indicator in [
+    Indicator("SMA", "Simple Moving Average (SMA)", ["SMA"], compute_average(sma)),
+    Indicator("EMA", "Exponential Moving Average (EMA)", ["EMA"], compute_average(ema)),
+    Indicator("WMA", "Weighted Moving Average (WMA)", ["WMA"], compute_average(wma)),
+    Indicator("DEMA", "Double Exponential Moving Average (DEMA)", ["DEMA"], compute_average(dema)),
+    Indicator("TEMA", "Triple Exponential Moving Average (TEMA)", ["TEMA"], compute_average(tema)),
+    Indicator("TRIMA", "Triangular Exponential Moving Average (TRIMA)", ["TRIMA"], compute_average(trima)),
+    Indicator("KAMA", "Kaufman Adaptive Moving Average (KAMA)", ["KAMA"], compute_average(kama)),
+    Indicator("T3", "Triple Exponential Moving Average (T3)", ["T3"], compute_t3,
+              defaults={"vfactor": "0.7"}),
+    Indicator("MACD", "Moving Average Convergence/Divergence (MACD)", ["MACD", "MACD_Hist", "MACD_Signal"],
+              compute_macd, ("fastperiod", "slowperiod", "signalperiod", "series_type")),
+    Indicator("MACDEXT", "MACD with controllable MA type (MACDEXT)", ["MACD", "MACD_Hist", "MACD_Signal"],
+              compute_macdext, ("fastperiod", "slowperiod", "signalperiod", "fastmatype", "slowmatype",
+                                "signalmatype", "series_type")),
+    Indicator("STOCH", "Stochastic (STOCH)", ["SlowK", "SlowD"], compute_stoch,
+              ("fastkperiod", "slowkperiod", "slowdperiod", "slowkmatype", "slowdmatype"), HLC),
+    Indicator("STOCHF", "Stochastic Fast (STOCHF)", ["FastK", "FastD"], compute_stochf,
+              ("fastkperiod", "fastdperiod", "fastdmatype"), HLC),
+    Indicator("RSI", "Relative Strength Index (RSI)", ["RSI"], compute_rsi),
+    Indicator("STOCHRSI", "Stochastic Relative Strength Index (STOCHRSI)", ["FastK", "FastD"], compute_stochrsi,
+              ("time_period", "series_type", "fastkperiod", "fastdperiod", "fastdmatype")),
+    Indicator("WILLR", "Williams' %R (WILLR)", ["WILLR"], compute_willr, ("time_period",), HLC),
+    Indicator("ADX", "Average Directional Movement Index (ADX)", ["ADX"], compute_adx, ("time_period",), HLC),
+    Indicator("ADXR", "Average Directional Movement Index Rating (ADXR)", ["ADXR"], compute_adxr,
+              ("time_period",), HLC),
+    Indicator("APO", "Absolute Price Oscillator (APO)", ["APO"], compute_apo, SLOW_AND_FAST),
+    Indicator("PPO", "Percentage Price Oscillator (PPO)", ["PPO"], compute_ppo, SLOW_AND_FAST),
+    Indicator("MOM", "Momentum (MOM)", ["MOM"], compute_mom),
+    Indicator("BOP", "Balance Of Power (BOP)", ["BOP"], compute_bop, (), ("open",) + HLC),
+    Indicator("CCI", "Commodity Channel Index (CCI)", ["CCI"], compute_cci, ("time_period",), HLC),
+    Indicator("CMO", "Chande Momentum Oscillator (CMO)", ["CMO"], compute_cmo),
+    Indicator("ROC", "Rate of change : ((price/prevPrice)-1)*100", ["ROC"], compute_roc),
+    Indicator("ROCR", "Rate of change ratio: (price/prevPrice)", ["ROCR"], compute_rocr),
+    Indicator("AROON", "Aroon (AROON)", ["Aroon Down", "Aroon Up"], compute_aroon, ("time_period",), HL),
+    Indicator("AROONOSC", "Aroon Oscillator (AROONOSC)", ["AROONOSC"], compute_aroonosc, ("time_period",), HL),
+    Indicator("MFI", "Money Flow Index (MFI)", ["MFI"], compute_mfi, ("time_period",), HLC + ("volume",)),
+    Indicator("TRIX", "1-day Rate-Of-Change (ROC) of a Triple Smooth EMA (TRIX)", ["TRIX"], compute_trix),
+    Indicator("ULTOSC", "Ultimate Oscillator (ULTOSC)", ["ULTOSC"], compute_ultosc,
+              ("timeperiod1", "timeperiod2", "timeperiod3"), HLC),
+    Indicator("DX", "Directional Movement Index (DX)", ["DX"], compute_dx, ("time_period",), HLC),
+    Indicator("MINUS_DI", "Minus Directional Indicator (MINUS_DI)", ["MINUS_DI"],
+              lambda prices, params: [directional_indicators(prices, params)[1]], ("time_period",), HLC),
+    Indicator("PLUS_DI", "Plus Directional Indicator (PLUS_DI)", ["PLUS_DI"],
+              lambda prices, params: [directional_indicators(prices, params)[0]], ("time_period",), HLC),
+    Indicator("MINUS_DM", "Minus Directional Movement (MINUS_DM)", ["MINUS_DM"],
+              lambda prices, params: [wilder_sum(directional_movement(prices["high"], prices["low"])[1],
+                                                 int(params["time_period"]))], ("time_period",), HL),
+    Indicator("PLUS_DM", "Plus Directional Movement (PLUS_DM)", ["PLUS_DM"],
+              lambda prices, params: [wilder_sum(directional_movement(prices["high"], prices["low"])[0],
+                                                 int(params["time_period"]))], ("time_period",), HL),
+    Indicator("BBANDS", "Bollinger Bands (BBANDS)", ["Real Upper Band", "Real Middle Band", "Real Lower Band"],
+              compute_bbands, ("time_period", "series_type", "nbdevup", "nbdevdn", "matype")),
+    Indicator("MIDPOINT", "MidPoint over period (MIDPOINT)", ["MIDPOINT"], compute_midpoint),
+    Indicator("MIDPRICE", "Midpoint Price over period (MIDPRICE)", ["MIDPRICE"], compute_midprice,
+              ("time_period",), HL),
+    Indicator("SAR", "Parabolic SAR (SAR)", ["SAR"], compute_sar, ("acceleration", "maximum"), HL),
+    Indicator("TRANGE", "True Range (TRANGE)", ["TRANGE"],
+              lambda prices, params: [true_range(prices["high"], prices["low"], prices["close"])], (), HLC),
+    Indicator("ATR", "Average True Range (ATR)", ["ATR"], compute_atr, ("time_period",), HLC),
+    Indicator("NATR", "Normalized Average True Range (NATR)", ["NATR"], compute_natr, ("time_period",), HLC),
+    Indicator("AD", "Chaikin A/D Line", ["Chaikin A/D"], compute_ad, (), HLC + ("volume",)),
+    Indicator("ADOSC", "Chaikin A/D Oscillator (ADOSC)", ["ADOSC"], compute_adosc, ("fastperiod", "slowperiod"),
+              HLC + ("volume",), {"fastperiod": "3", "slowperiod": "10"}),
+    Indicator("OBV", "On Balance Volume (OBV)", ["OBV"], compute_obv, (), ("close", "volume")),
+]}
+
+# the api's indicators the local engine doesn't compute
+UNSUPPORTED_INDICATORS = ("MAMA", "VWAP", "HT_TRENDLINE", "HT_SINE", "HT_TRENDMODE", "HT_DCPERIOD", "HT_DCPHASE",
+                          "HT_PHASOR")
+
+
+class IndicatorEngine:
+    """Computes technical indicators locally from a price Quote you already have
+
+    Every indicator the api would charge one call for (per symbol, interval and parameter set) is computed with
+    numpy from the open, high, low, close and volume of the quote, so sweeping parameters costs no api calls. The
+    result is the same Quote the api returns: data is keyed by date, newest first, with the api's field names and
+    values formatted as strings. The math follows TA-Lib, which the api uses. Requires numpy.
+
+    MAMA, VWAP (intraday only) and the Hilbert transform indicators (HT_*) are not supported, see
+    UNSUPPORTED_INDICATORS. Neither is matype 8 (MAMA) for the indicators that take a moving average type.
+
+        Typical usage example:
+
+            quote = client.get_daily_adjusted_quote({"symbol": "TSLA", "outputsize": "full"})
+            engine = IndicatorEngine(quote)
+            sweep = {period: engine.get_sma({"time_period": period}) for period in range(10, 200, 10)}
+            macd = engine.get_technical_indicator({"function": "MACD", "fastperiod": 12})
+    """
+
+    def __init__(self, quote: Quote):
+        if not quote.success:
+            raise ValueError(f"Can not compute indicators from an unsuccessful quote: {quote.error_message}")
+        self.__quote__ = quote
+        columns = quote.get_columns()
+        np = import_numpy()
+        self.__prices__ = {name: columns[name].astype(np.float64) for name in columns.get_column_names()}
+        self.__index__ = columns.index
+
+    def get_supported_functions(self) -> list[str]:
+        return list(INDICATORS.keys())
+
+    def get_technical_indicator(self, event: Optional[dict] = None) -> Quote:
+        """Compute the indicator named by event["function"] (SMA by default) with the api's parameters
+
+        Args:
+            event: the parameters you would send to the api, i.e. {"function": "RSI", "time_period": 14}
+
+        Returns:
+            Quote
+        """
+        function = str((event or {}).get("function") or "SMA").upper()
+        indicator = INDICATORS.get(function)
+        if indicator is None:
+            raise ValueError(f"{function} is not supported by the local engine, use one of "
+                             f"{self.get_supported_functions()}")
+        params = indicator.get_params(event)
+        required = {params["series_type"] if name == "series" else name for name in indicator.inputs}
+        missing = required - self.__prices__.keys()
+        if len(missing) > 0:
+            raise ValueError(f"{function} needs {sorted(missing)} which the quote doesn't have")
+
+        outputs = indicator.compute(self.__prices__, params)
+
+        return Quote.model_validate(self.__build_response__(indicator, params, outputs))
+
+    def __build_response__(self, indicator: Indicator, params: dict, outputs: list) -> dict:
+        np = import_numpy()
+        complete = np.all([~np.isnan(output) for output in outputs], axis=0) if len(self.__index__) > 0 \
+            else np.zeros(0, dtype=bool)
+        dates = self.__format_dates__(self.__index__)
+        columns = [output.tolist() for output in outputs]
+        data = {}
+        for position in np.flatnonzero(complete)[::-1].tolist():  # newest first like the api
+            data[dates[position]] = {name: f"{column[position]:.4f}" for name, column in zip(indicator.outputs,
+                                                                                            columns)}
+        meta_data = self.__quote__.meta_data or {}
+        interval = params.get("interval") or meta_data.get("4. Interval", "daily")
+        details = [("Symbol", self.__quote__.symbol), ("Indicator", indicator.description),
+                   ("Last Refreshed", dates[-1] if len(dates) > 0 else None), ("Interval", interval)]
+        details += [(name.replace("_", " ").title(), params[name]) for name in indicator.params]
+        details.append(("Time Zone", meta_data.get("5. Time Zone", meta_data.get("6. Time Zone", "US/Eastern"))))
+
+        return {
+            "success": True,
+            "limit_reached": False,
+            "status_code": 200,
+            "symbol": self.__quote__.symbol,
+            "indicator": indicator.function,
+            "Meta Data": {f"{number}: {name}": value for number, (name, value) in enumerate(details, start=1)},
+            f"Technical Analysis: {indicator.function}": data,
+        }
+
+    def __format_dates__(self, index) -> list[str]:
+        np = import_numpy()
+        if len(index) > 0 and np.all(index.astype("datetime64[D]") == index):
+            return np.datetime_as_string(index, unit="D").tolist()
+        return [date.replace("T", " ") for date in np.datetime_as_string(index, unit="s").tolist()]
+
+
+def _make_indicator_method(function: str):
+    def get_indicator(self, event: Optional[dict] = None) -> Quote:
+        return self.get_technical_indicator({**(event or {}), "function": function})
+
+    get_indicator.__name__ = f"get_{function.lower()}"
+    get_indicator.__doc__ = f"{INDICATORS[function].description} computed locally, see get_technical_indicator"
+    return get_indicator
+
+
+def _register_indicator_methods():
+    for function in INDICATORS:
+        setattr(IndicatorEngine, f"get_{function.lower()}", _make_indicator_method(function))
+
+
+_register_indicator_methods()
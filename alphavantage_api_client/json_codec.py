@@ -0,0 +1,38 @@
+"""json encoding and decoding used by the client
+
+orjson decodes straight from the response bytes and is about twice as fast as the standard library on large
+time series. It is optional (pip install alphavantage_api_client[fast]). When it isn't installed the standard
+library json is used. Both produce the same compact output so cache keys don't change with the backend.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def get_backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode json from bytes or str. Raises ValueError when the data isn't json"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Encode to a compact json str"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode("utf-8")
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    """Encode to compact utf-8 json bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return dumps(obj, sort_keys).encode("utf-8")
@@ -0,0 +1,78 @@
+import random
+from typing import Any, Optional
+from . import json_codec
+
+
+class PayloadLogPolicy:
+    """How much of the response payloads end up in the INFO logs
+
+    Args:
+        max_payload_length: payloads longer than this many characters are cut off. None logs them whole
+        sample_rate: fraction of the calls, between 0 and 1, whose log lines include their payload. The others
+            only say how big the payload was, without serializing it
+        payload_fields: the fields of a log message holding payloads
+    """
+
+    def __init__(self, max_payload_length: Optional[int] = None, sample_rate: float = 1.0,
+                 payload_fields: tuple = ("data",)):
+        if max_payload_length is not None and max_payload_length < 0:
+            raise ValueError("max_payload_length can not be negative")
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.max_payload_length = max_payload_length
+        self.sample_rate = sample_rate
+        self.payload_fields = payload_fields
+
+    def is_sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def render_payload(self, value: Any, sampled: bool) -> Any:
+        if not sampled:
+            return self.describe_payload(value)
+        if callable(value):
+            value = value()
+        if self.max_payload_length is None:
+            return value
+        text = value if isinstance(value, str) else json_codec.dumps(value)
+        if len(text) <= self.max_payload_length:
+            return value
+        return f"{text[:self.max_payload_length]}... ({len(text) - self.max_payload_length} more characters)"
+
+    def describe_payload(self, value: Any) -> str:
+        """What is left of a payload that is not sampled. Cheap, the payload is neither serialized nor computed"""
+        if isinstance(value, str):
+            return f"<{len(value)} characters, not sampled>"
+        if isinstance(value, (dict, list, tuple)):
+            return f"<{len(value)} items, not sampled>"
+        return "<not sampled>"
+
+
+class LazyLogMessage:
+    """A json log message that is only serialized when a log handler emits it
+
+    Pass it to logging directly, i.e. ``logging.info(LazyLogMessage({...}))``. When INFO is disabled logging drops
+    the message before calling str() on it, so large payloads cost nothing. Values may be callables, they are
+    called at the same time, which defers work such as decoding the response text as well. Payloads that are not
+    sampled are never called.
+
+    sampled is the policy's sampling decision. Pass the same one to every message of a call so they all log their
+    payload or none does. By default each message decides once, when it is created, so every handler agrees.
+    """
+    __slots__ = ("message", "policy", "sampled")
+
+    def __init__(self, message: dict, policy: Optional[PayloadLogPolicy] = None, sampled: Optional[bool] = None):
+        self.message = message
+        self.policy = policy
+        self.sampled = sampled if sampled is not None else policy is None or policy.is_sampled()
+
+    def __str__(self) -> str:
+        policy = self.policy
+        message = {}
+        for key, value in self.message.items():
+            if policy is not None and key in policy.payload_fields:
+                value = policy.render_payload(value, self.sampled)
+            elif callable(value):
+                value = value()
+            message[key] = value
+
+        return json_codec.dumps(message)
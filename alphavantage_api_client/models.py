@@ -1,7 +1,8 @@
 import pydantic
-from pydantic import BaseModel, Field, ValidationError, model_validator, model_serializer
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, model_validator, model_serializer, field_serializer
 from typing import Optional, Any
-import copy
+from collections.abc import Mapping
+from .columnar import TimeSeriesColumns
 
 
 class CsvNotSupported(Exception):
@@ -19,6 +20,49 @@ class BaseResponse(BaseModel):
     csv: Optional[str] = None
 
 
+class ColumnarData(BaseModel):
+    """data that can be viewed as columns and exported to numpy, pandas and arrow
+
+    The columns are built once, the first time they are needed, straight from the decoded payload. Later changes
+    to data are not reflected. Requires numpy, pandas or pyarrow depending on the export, none of them are imported
+    until used.
+    """
+    _columns: Optional[TimeSeriesColumns] = PrivateAttr(default=None)
+
+    def get_columns(self) -> TimeSeriesColumns:
+        """A sorted datetime64 index plus one float64 (or int64 for volume) array per field, i.e.
+        get_columns()["adjusted_close"]
+
+        Returns:
+            TimeSeriesColumns
+        """
+        if self._columns is None:
+            self._columns = self.__build_columns__()
+        return self._columns
+
+    def __build_columns__(self) -> TimeSeriesColumns:
+        return TimeSeriesColumns.from_time_series(self.data or {})
+
+    @field_serializer("data", mode="wrap", check_fields=False)
+    def __serialize_data__(self, data: Any, handler):
+        # read only views such as a memory mapped store hand out a Mapping rather than a dict
+        if isinstance(data, Mapping) and not isinstance(data, dict):
+            data = dict(data)
+        return handler(data)
+
+    def to_numpy(self):
+        """numpy structured array with a date field followed by one field per column"""
+        return self.get_columns().to_numpy()
+
+    def to_pandas(self):
+        """pandas DataFrame indexed by date"""
+        return self.get_columns().to_pandas()
+
+    def to_arrow(self):
+        """pyarrow Table with a date column"""
+        return self.get_columns().to_arrow()
+
+
 class BaseQuote(BaseResponse):
     symbol: str
 
@@ -76,7 +120,7 @@ class EarningsCalendar(BaseResponse):
     symbol: Optional[str] = None
     data: Optional[list[EarningsCalendarItem]] = Field([])
 
-class CurrencyQuote(BaseResponse):
+class CurrencyQuote(BaseResponse, ColumnarData):
     data: Optional[dict] = Field({})
     meta_data: Optional[dict] = Field({}, alias='Meta Data')
 
@@ -90,13 +134,16 @@ class CurrencyQuote(BaseResponse):
                       or k.startswith("Realtime Currency Exchange Rate") else k: v for k, v in values.items()
         }
 
-class Commodity(BaseResponse):
+class Commodity(BaseResponse, ColumnarData):
     name: str
     interval: str
     unit: str
     data: list[dict]
 
-class Quote(BaseQuote):
+    def __build_columns__(self) -> TimeSeriesColumns:
+        return TimeSeriesColumns.from_records(self.data or [])
+
+class Quote(BaseQuote, ColumnarData):
     """
     data is this clients abstraction of the response from alpha vantage. Time Series, Technical Indicator
     """
@@ -181,25 +228,52 @@ class GlobalQuote(BaseQuote):
         return self.get_data_value(field)
 
 
+# REALTIME_BULK_QUOTES field -> GLOBAL_QUOTE field
+BULK_QUOTE_FIELDS = {
+    "symbol": "01. symbol",
+    "open": "02. open",
+    "high": "03. high",
+    "low": "04. low",
+    "close": "05. price",
+    "volume": "06. volume",
+    "previous_close": "08. previous close",
+    "change": "09. change",
+    "change_percent": "10. change percent",
+}
+
+
+class RealtimeBulkQuotes(BaseResponse):
+    """Up to 100 quotes from one REALTIME_BULK_QUOTES call (premium)"""
+    endpoint: Optional[str] = None
+    message: Optional[str] = None
+    data: list[dict] = Field([])
+
+    def get_global_quotes(self) -> dict[str, GlobalQuote]:
+        """Each quote as the GlobalQuote get_global_quote() returns, by symbol. Fields only the bulk end point has
+        (i.e. extended hours) are kept in data under their own names"""
+        quotes = {}
+        for item in self.data:
+            symbol = str(item.get("symbol", "")).upper()
+            data = {BULK_QUOTE_FIELDS.get(k, k): v for k, v in item.items()}
+            if "timestamp" in item:
+                data["07. latest trading day"] = str(item["timestamp"])[:10]
+            change_percent = data.get("10. change percent")
+            if change_percent is not None and not str(change_percent).endswith("%"):
+                data["10. change percent"] = f"{change_percent}%"
+            quotes[symbol] = GlobalQuote.model_validate({"success": self.success, "limit_reached": self.limit_reached,
+                                                         "status_code": self.status_code, "symbol": symbol,
+                                                         "Global Quote": data})
+        return quotes
+
+
 class AccountingReport(BaseQuote):
     annualReports: list = Field(default=[], alias="annualReports")
     quarterlyReports: list = Field(default=[], alias="quarterlyReports")
 
     @model_validator(mode="before")
     def normalize_fields(cls, values):
-        annual_report_fields = ["annualEarnings"]
-        quarterly_report_fields = ["quarterlyEarnings"]
-        new_values = copy.deepcopy(values)
-        for field in new_values:
-            new_field = field
-            if field in annual_report_fields:
-                new_field = "annualReports"
-            elif field in quarterly_report_fields:
-                new_field = "quarterlyReports"
-            if new_field != field:
-                values[new_field] = values[field]
-                values.pop(field)
-        return values
+        renamed_fields = {"annualEarnings": "annualReports", "quarterlyEarnings": "quarterlyReports"}
+        return {renamed_fields.get(k, k): v for k, v in values.items()}
 
     def get_most_recent_annual_report(self) -> Optional[dict]:
         if len(self.annualReports) > 0:
@@ -216,12 +290,15 @@ class AccountingReport(BaseQuote):
         return None
 
 
-class EconomicIndicator(BaseResponse):
+class EconomicIndicator(BaseResponse, ColumnarData):
     name: Optional[str] = None
     interval: Optional[str] = None
     unit: Optional[str] = None
     data: Optional[list] = None
 
+    def __build_columns__(self) -> TimeSeriesColumns:
+        return TimeSeriesColumns.from_records(self.data or [])
+
 
 class CompanyOverview(BaseQuote):
     symbol: str = Field(default=None, alias='Symbol')
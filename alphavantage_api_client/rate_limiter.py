@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+from . import sqlite_store
+
+DEFAULT_SHARED_STORE_PATH = os.path.join(tempfile.gettempdir(), "alphavantage_rate_limit.sqlite")
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, message: str, delay: float = 0):
+        self.delay = delay
+        super().__init__(message)
+
+
+class TokenBucket:
+    """A bucket refilled at ``rate`` tokens per second that holds at most ``capacity`` tokens
+
+    Each api call takes one token. When the bucket is empty the call is scheduled for the moment the next token
+    arrives, so calls are paced at the bucket rate instead of being rejected by the api.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError(f"{name} rate must be greater than zero")
+        if capacity < 1:
+            raise ValueError(f"{name} capacity must be at least one")
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+
+    def ready_at(self, tokens: float, updated: float) -> float:
+        """time when this bucket will hold a whole token given its state"""
+        if tokens >= 1:
+            return updated
+        return updated + (1 - tokens) / self.rate
+
+    def tokens_at(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+
+class InMemoryRateLimitBackend:
+    """Keeps bucket state in this process. Thread safe, shared by every client using the same RateLimiter."""
+
+    def __init__(self):
+        self.__lock__ = threading.Lock()
+        self.__state__: dict[str, dict[str, tuple[float, float]]] = {}
+
+    def reserve(self, key: str, buckets: list[TokenBucket], now: float, max_wait: Optional[float] = None) -> float:
+        with self.__lock__:
+            state = self.__state__.get(key, {})
+            delay, new_state = reserve_tokens(state, buckets, now, max_wait)
+            self.__state__[key] = new_state
+
+        return delay
+
+    def clear(self):
+        with self.__lock__:
+            self.__state__.clear()
+
+
+class SqliteRateLimitBackend:
+    """Keeps bucket state in a SQLite file so every process on this machine shares one budget per api key
+
+    Each reservation is a single read-modify-write inside an immediate transaction, which SQLite serializes across
+    processes with its file lock. Point every client at the same file (the default is in the temp directory) and
+    16 workers sharing one key will be paced as if they were one client.
+    """
+
+    def __init__(self, path: str = DEFAULT_SHARED_STORE_PATH, timeout: float = 30):
+        self.__path__ = path
+        self.__timeout__ = timeout
+        sqlite_store.create_store(path, ["CREATE TABLE IF NOT EXISTS rate_limit_state "
+                                         "(bucket_key TEXT PRIMARY KEY, state TEXT NOT NULL)"], timeout)
+
+    def get_path(self) -> str:
+        return self.__path__
+
+    def reserve(self, key: str, buckets: list[TokenBucket], now: float, max_wait: Optional[float] = None) -> float:
+        with sqlite_store.transaction(self.__path__, self.__timeout__) as connection:
+            row = connection.execute("SELECT state FROM rate_limit_state WHERE bucket_key = ?", (key,)).fetchone()
+            state = {name: tuple(value) for name, value in json.loads(row[0]).items()} if row else {}
+            delay, new_state = reserve_tokens(state, buckets, now, max_wait)
+            connection.execute("INSERT OR REPLACE INTO rate_limit_state (bucket_key, state) VALUES (?, ?)",
+                               (key, json.dumps(new_state)))
+
+        return delay
+
+    def clear(self):
+        with sqlite_store.connect(self.__path__, self.__timeout__) as connection:
+            connection.execute("DELETE FROM rate_limit_state")
+
+
+def reserve_tokens(state: dict, buckets: list[TokenBucket], now: float,
+                   max_wait: Optional[float] = None) -> tuple[float, dict]:
+    """Take one token from every bucket and return how long the caller must wait before sending
+
+    Tokens may be reserved ahead of time which leaves the bucket negative, so concurrent callers line up one
+    after the other instead of all waking up at once.
+
+    Args:
+        state: bucket name -> (tokens, updated) as returned by a previous call
+        buckets: the buckets a call must take a token from
+        now: the current time in seconds
+        max_wait: raise RateLimitExceeded instead of reserving when the wait would be longer
+
+    Returns:
+        the delay in seconds and the new state
+    """
+    send_at = now
+    for bucket in buckets:
+        tokens, updated = state.get(bucket.name, (bucket.capacity, now))
+        # never schedule before a slot that was already handed out, callers are served in order
+        start = max(now, updated)
+        send_at = max(send_at, bucket.ready_at(bucket.tokens_at(tokens, updated, start), start))
+    delay = send_at - now
+    if max_wait is not None and delay > max_wait:
+        raise RateLimitExceeded(f"Rate limit requires waiting {delay:.1f} seconds which exceeds max_wait of "
+                                f"{max_wait} seconds", delay)
+    new_state = dict(state)
+    for bucket in buckets:
+        tokens, updated = state.get(bucket.name, (bucket.capacity, now))
+        new_state[bucket.name] = (bucket.tokens_at(tokens, updated, send_at) - 1, send_at)
+
+    return delay, new_state
+
+
+class RateLimiter:
+    """Paces calls before they are sent so the api never has to reject them
+
+    Calls are limited by a per minute token bucket and, optionally, a per day token bucket. Buckets are tracked per
+    api key. With the default burst of 1 calls are spread evenly across the minute which keeps throughput at the
+    plan's ceiling rather than bursting and then stalling.
+
+        Typical usage example:
+
+            client = AlphavantageClient().with_rate_limit(calls_per_minute=75)
+            or share one budget with every process on this machine
+            client = AlphavantageClient().with_rate_limit(calls_per_minute=75, shared_store=DEFAULT_SHARED_STORE_PATH)
+            or
+            limiter = RateLimiter(calls_per_minute=75, calls_per_day=None)
+            client_a = AlphavantageClient().use_rate_limiter(limiter)
+            client_b = AlphavantageClient().use_rate_limiter(limiter)
+    """
+
+    def __init__(self, calls_per_minute: Optional[float] = 5, calls_per_day: Optional[float] = None, burst: int = 1,
+                 max_wait: Optional[float] = None, backend=None):
+        buckets = []
+        if calls_per_minute is not None:
+            buckets.append(TokenBucket("minute", calls_per_minute / 60, burst))
+        if calls_per_day is not None:
+            buckets.append(TokenBucket("day", calls_per_day / 86400, calls_per_day))
+        if len(buckets) == 0:
+            raise ValueError("calls_per_minute or calls_per_day must be defined")
+        self.__buckets__ = buckets
+        self.__max_wait__ = max_wait
+        self.__backend__ = backend if backend is not None else InMemoryRateLimitBackend()
+        self.__metrics_lock__ = threading.Lock()
+        self.__total_acquired__ = 0
+        self.__total_delayed__ = 0
+        self.__total_wait__ = 0.0
+
+    def get_backend(self):
+        return self.__backend__
+
+    def reserve(self, api_key: str = "") -> float:
+        """Reserve the next slot for this api key and return the seconds to wait before using it"""
+        delay = self.__backend__.reserve(self.__get_bucket_key__(api_key), self.__buckets__, time.time(),
+                                         self.__max_wait__)
+        with self.__metrics_lock__:
+            self.__total_acquired__ += 1
+            if delay > 0:
+                self.__total_delayed__ += 1
+                self.__total_wait__ += delay
+
+        return delay
+
+    def acquire(self, api_key: str = "") -> float:
+        """Block until a call for this api key can be sent
+
+        Returns:
+            the seconds spent waiting
+        """
+        delay = self.reserve(api_key)
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+    def get_metrics(self) -> dict:
+        with self.__metrics_lock__:
+            return {
+                "acquired": self.__total_acquired__,
+                "delayed": self.__total_delayed__,
+                "total_wait": self.__total_wait__,
+            }
+
+    def __get_bucket_key__(self, api_key: str) -> str:
+        # never keep the raw api key around, only a short fingerprint of it
+        return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
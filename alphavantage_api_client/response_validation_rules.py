@@ -1,22 +1,75 @@
+from . import json_codec
+
+# how a response from alpha vantage is classified
+SUCCESS = "success"
+ERROR = "error"
+NOTE = "note"
+INFORMATION = "information"
+EMPTY = "empty"
+
+
 class BaseValidationRuleChecks:
 
     def __init__(self):
         self.__http_get_response__ = None
         self.__customer_event_request__ = None
         self.__rules__ = {}
+        self.__text__ = None
+        self.__json_body__ = None
+        self.__json_decoded__ = False
+        self.__classification__ = None
 
     def with_response(self, http_response):
         self.__http_get_response__ = http_response
+        self.__text__ = None
+        self.__json_body__ = None
+        self.__json_decoded__ = False
+        self.__classification__ = None
 
         return self
 
+    def get_text(self) -> str:
+        """The response body as text, decoded once"""
+        if self.__text__ is None:
+            response = self.__http_get_response__
+            if response.encoding is None:
+                # alpha vantage sends utf-8 without a charset, skip requests' slow charset detection
+                self.__text__ = response.content.decode("utf-8", errors="replace")
+            else:
+                self.__text__ = response.text
+        return self.__text__
+
+    def get_json(self):
+        """The response body as json, decoded once. None when the body isn't json"""
+        if not self.__json_decoded__:
+            self.__json_decoded__ = True
+            try:
+                self.__json_body__ = json_codec.loads(self.__http_get_response__.content)
+            except ValueError:
+                self.__json_body__ = None
+        return self.__json_body__
+
+    def classify(self) -> str:
+        """Classify the response once as success, error, note, information or empty"""
+        if self.__classification__ is None:
+            self.__classification__ = self.__classify__()
+        return self.__classification__
+
+    def __classify__(self) -> str:
+        text = self.get_text()
+        if len(text) == 0 or text == "{}":
+            return EMPTY
+        if "Error Message" in text:
+            return ERROR
+        return SUCCESS
+
     def from_event(self, customer_event_request):
         self.__customer_event_request__ = customer_event_request
 
         return self
 
     def get_obj(self):  # assume csv or non json
-        return self.__http_get_response__.text
+        return self.get_text()
 
     def check_response_present(self):
         pass
@@ -42,10 +95,7 @@ class BaseValidationRuleChecks:
         return self.__http_get_response__.status_code
 
     def is_meaningful_response(self):
-        return len(self.__http_get_response__.text) > 0 \
-               and "Error Message" not in self.__http_get_response__.text \
-               and self.__http_get_response__.text != "{}"\
-
+        return self.classify() == SUCCESS
 
     def expect_successful_response(self):
         self.check_response_present()
@@ -100,7 +150,7 @@ class BaseValidationRuleChecks:
 
     def expect_limit_not_reached(self):
         rule_name = "has_not_reached_limit"
-        response = self.__http_get_response__.text
+        response = self.get_text()
         if " calls per minute " in response:
             self.__rules__[rule_name] = True
         elif " limit for your free API key" in response:
@@ -111,18 +161,20 @@ class BaseValidationRuleChecks:
         return self
 
     def get_error_message(self):
-        json_response = self.__http_get_response__.json()
+        json_response = self.get_json()
+        if json_response is None:
+            return self.get_text()
         if len(json_response) == 0:
             return "Symbol not found"
         return json_response.get("Error Message", "Unknown")
 
     def get_note_message(self):
-        json_response = self.__http_get_response__.json()
+        json_response = self.get_json() or {}
 
         return json_response.get("Note", "Unknown")
 
     def get_information_message(self):
-        json_response = self.__http_get_response__.json()
+        json_response = self.get_json() or {}
 
         return json_response.get("Information", "Unknown")
 
@@ -142,8 +194,7 @@ class JsonValidationRuleChecks(BaseValidationRuleChecks):
 
     def expect_limit_not_reached(self):
         rule_name = "has_not_reached_limit"
-        response = self.__http_get_response__.json()
-        self.__rules__[rule_name] = "Note" in response and " calls per minute " in response["Note"]
+        self.__rules__[rule_name] = self.classify() == NOTE and " calls per minute " in self.get_json()["Note"]
 
         return self
 
@@ -153,33 +204,41 @@ class JsonValidationRuleChecks(BaseValidationRuleChecks):
         is_global_quote_empty = len(response_json.get("Global Quote", {})) == 0
         return is_property_count_one and has_global_quote_property and is_global_quote_empty
 
+    def __classify__(self) -> str:
+        # a single pass over the decoded body
+        response_json = self.get_json()
+        if response_json is None:
+            return ERROR if len(self.get_text()) > 0 else EMPTY
+        if not isinstance(response_json, dict):
+            return SUCCESS if len(response_json) > 0 else EMPTY
+        if len(response_json) == 0 or self.is_empty_global_quote(response_json):
+            return EMPTY
+        if "Error Message" in response_json:
+            return ERROR
+        if "Note" in response_json:
+            return NOTE
+        if "Information" in response_json:
+            return INFORMATION
+        return SUCCESS
+
     def expect_successful_response(self):
         self.check_response_present()
         rule_name = "expect_meaningful_json_response"
-        is_meaningful = self.is_meaningful_response() and self.__http_get_response__.text != "{}"
-        is_not_error_msg = "Error Message" not in self.__http_get_response__.json()
-        is_not_info_msg = "Information" not in self.__http_get_response__.json()
-        is_not_note_msg = "Note" not in self.__http_get_response__.json()
-        is_not_empty_global_quote = not self.is_empty_global_quote(self.__http_get_response__.json())
-
-        if is_meaningful and is_not_error_msg and is_not_info_msg and is_not_note_msg and is_not_empty_global_quote:
-            self.__rules__[rule_name] = True
-        else:
-            self.__rules__[rule_name] = False
+        self.__rules__[rule_name] = self.classify() == SUCCESS
 
         return self
 
     def get_error_message(self):
-        json_response = self.__http_get_response__.json()
-        if len(json_response) == 0:
+        json_response = self.get_json()
+        if json_response is not None and len(json_response) == 0:
             return "Symbol not found"
-        elif "Error Message" in json_response:
+        elif isinstance(json_response, dict) and "Error Message" in json_response:
             return json_response["Error Message"]
         else:
-            return self.__http_get_response__.text  # just give them what came back from the server
+            return self.get_text()  # just give them what came back from the server
 
     def get_obj(self):
-        return self.__http_get_response__.json()
+        return self.get_json()
 
 
 class CsvValidationRuleChecks(BaseValidationRuleChecks):
@@ -198,7 +257,7 @@ class CsvValidationRuleChecks(BaseValidationRuleChecks):
     def expect_error_message_not_present(self):
         self.check_response_present()
         rule_name = "expect_error_message_not_present"
-        if "Error Message" not in self.__http_get_response__.text:
+        if "Error Message" not in self.get_text():
             self.__rules__[rule_name] = True
         else:
             self.__rules__[rule_name] = False
@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class SingleFlight:
+    """Makes concurrent identical calls share one execution
+
+    The first caller for a key (the leader) runs the call. Callers arriving with the same key while it is in flight
+    (followers) wait for the leader and receive the same result, or the same exception. Once the leader finishes
+    the key is forgotten, so later calls run again. Thread safe. A leader may call back in with its own key (for
+    example when it retries) without waiting on itself.
+    """
+
+    def __init__(self):
+        self.__lock__ = threading.Lock()
+        self.__in_flight__: dict[Hashable, tuple[Future, int]] = {}
+        self.__coalesced__ = 0
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        thread_id = threading.get_ident()
+        with self.__lock__:
+            in_flight = self.__in_flight__.get(key)
+            if in_flight is None:
+                future = Future()
+                self.__in_flight__[key] = (future, thread_id)
+            elif in_flight[1] != thread_id:
+                self.__coalesced__ += 1
+
+        if in_flight is not None and in_flight[1] == thread_id:
+            return call()  # the leader calling back in
+        if in_flight is not None:
+            return in_flight[0].result()
+
+        try:
+            result = call()
+            future.set_result(result)
+            return result
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        finally:
+            with self.__lock__:
+                self.__in_flight__.pop(key, None)
+
+    def get_metrics(self) -> dict:
+        with self.__lock__:
+            return {
+                "in_flight": len(self.__in_flight__),
+                "coalesced": self.__coalesced__,
+            }
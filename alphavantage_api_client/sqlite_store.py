@@ -0,0 +1,37 @@
+import contextlib
+import sqlite3
+
+
+def create_store(path: str, statements: list[str], timeout: float = 30):
+    """Create the SQLite file (in WAL mode so readers don't block writers) and run the schema statements"""
+    with connect(path, timeout) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        for statement in statements:
+            connection.execute(statement)
+
+
+@contextlib.contextmanager
+def connect(path: str, timeout: float = 30):
+    """Open a short lived connection to a SQLite store
+
+    Connections are never kept between calls. A store is shared by worker processes that are often forked from a
+    parent, and a connection inherited through fork() can corrupt the database when the child closes it.
+    """
+    connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+@contextlib.contextmanager
+def transaction(path: str, timeout: float = 30):
+    """Connection inside an immediate transaction, so the read-modify-write is serialized across processes"""
+    with connect(path, timeout) as connection:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
@@ -0,0 +1,984 @@
+import abc
+import math
+from collections import deque
+from typing import Optional, Union
+from .columnar import IGNORED_FIELDS, get_unique_column_names
+from .indicators import INDICATORS, MA_TYPES, get_lookback, kaufman_efficiency, parabolic_sar_step, \
+    start_parabolic_sar
+from .models import Quote
+
+STATEFUL_TYPES = {}
+
+
+class Stateful:
+    """Object whose state is plain data, so it can be saved as json and restored after a restart"""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        STATEFUL_TYPES[cls.__name__] = cls
+
+    def get_state(self) -> dict:
+        return {"type": type(self).__name__, "values": {name: encode_state(value) for name, value in
+                                                        vars(self).items()}}
+
+    @classmethod
+    def from_state(cls, state: dict):
+        stateful_type = STATEFUL_TYPES.get(state.get("type"))
+        if stateful_type is None or not issubclass(stateful_type, cls):
+            raise ValueError(f"{state.get('type')} is not a {cls.__name__}")
+        restored = stateful_type.__new__(stateful_type)
+        for name, value in state["values"].items():
+            setattr(restored, name, decode_state(value))
+        return restored
+
+
+def encode_state(value):
+    if isinstance(value, Stateful):
+        return {"stateful": value.get_state()}
+    if isinstance(value, deque):
+        return {"deque": [encode_state(item) for item in value], "maxlen": value.maxlen}
+    if isinstance(value, (list, tuple)):
+        return [encode_state(item) for item in value]
+    return value
+
+
+def decode_state(value):
+    if isinstance(value, dict) and "stateful" in value:
+        return Stateful.from_state(value["stateful"])
+    if isinstance(value, dict) and "deque" in value:
+        return deque([decode_state(item) for item in value["deque"]], value["maxlen"])
+    if isinstance(value, list):
+        return [decode_state(item) for item in value]
+    return value
+
+
+class RollingSum(Stateful):
+    """Sum of the last time_period values. None until time_period values were added"""
+
+    def __init__(self, time_period: int):
+        self.time_period = time_period
+        self.window = deque()
+        self.total = 0.0
+
+    def add(self, value: float) -> Optional[float]:
+        self.window.append(value)
+        self.total += value
+        if len(self.window) > self.time_period:
+            self.total -= self.window.popleft()
+        return self.total if len(self.window) == self.time_period else None
+
+
+class Sma(Stateful):
+    def __init__(self, time_period: int):
+        self.sum = RollingSum(time_period)
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        total = self.sum.add(value)
+        return None if total is None else total / self.sum.time_period
+
+
+class Ema(Stateful):
+    """Seeded with the simple average of the first time_period values, like the IndicatorEngine"""
+
+    def __init__(self, time_period: int, smoothing: Optional[float] = None):
+        self.time_period = time_period
+        self.smoothing = 2 / (time_period + 1) if smoothing is None else smoothing
+        self.count = 0
+        self.seed_total = 0.0
+        self.value = None
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        if self.value is not None:
+            self.value += self.smoothing * (value - self.value)
+            return self.value
+        self.count += 1
+        self.seed_total += value
+        if self.count == self.time_period:
+            self.value = self.seed_total / self.time_period
+        return self.value
+
+
+class Wma(Stateful):
+    def __init__(self, time_period: int):
+        self.time_period = time_period
+        self.window = deque()
+        self.total = 0.0
+        self.weighted_total = 0.0
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        if len(self.window) == self.time_period:
+            # every weight drops by one, the oldest value falls out and the new one gets the top weight
+            self.weighted_total += self.time_period * value - self.total
+            self.total += value - self.window.popleft()
+        else:
+            self.weighted_total += (len(self.window) + 1) * value
+            self.total += value
+        self.window.append(value)
+        if len(self.window) < self.time_period:
+            return None
+        return self.weighted_total / (self.time_period * (self.time_period + 1) / 2)
+
+
+class Dema(Stateful):
+    def __init__(self, time_period: int):
+        self.first = Ema(time_period)
+        self.second = Ema(time_period)
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        first = self.first.add(value)
+        second = self.second.add(first)
+        return None if second is None else 2 * first - second
+
+
+class Tema(Stateful):
+    def __init__(self, time_period: int):
+        self.first = Ema(time_period)
+        self.second = Ema(time_period)
+        self.third = Ema(time_period)
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        first = self.first.add(value)
+        second = self.second.add(first)
+        third = self.third.add(second)
+        return None if third is None else 3 * first - 3 * second + third
+
+
+class Trima(Stateful):
+    def __init__(self, time_period: int):
+        first_period = (time_period + 1) // 2
+        self.first = Sma(first_period)
+        self.second = Sma(first_period if time_period % 2 == 1 else first_period + 1)
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        return self.second.add(self.first.add(value))
+
+
+class T3(Stateful):
+    def __init__(self, time_period: int, vfactor: float = 0.7):
+        self.averages = [Ema(time_period) for _ in range(6)]
+        self.vfactor = vfactor
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        averages = []
+        for average in self.averages:
+            value = average.add(value)
+            averages.append(value)
+        if value is None:
+            return None
+        vfactor, cube, square = self.vfactor, self.vfactor ** 3, self.vfactor ** 2
+        return -cube * averages[5] + (3 * square + 3 * cube) * averages[4] + \
+            (-6 * square - 3 * vfactor - 3 * cube) * averages[3] + \
+            (1 + 3 * vfactor + cube + 3 * square) * averages[2]
+
+
+class Kama(Stateful):
+    def __init__(self, time_period: int):
+        self.time_period = time_period
+        self.window = deque(maxlen=time_period + 1)
+        self.volatility = 0.0
+        self.value = None
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        if len(self.window) == self.window.maxlen:
+            self.volatility -= abs(self.window[1] - self.window[0])
+        if len(self.window) > 0:
+            self.volatility += abs(value - self.window[-1])
+        self.window.append(value)
+        if len(self.window) < self.window.maxlen:
+            return None
+        if self.value is None:
+            self.value = self.window[-2]
+        efficiency = kaufman_efficiency(value - self.window[0], self.volatility)
+        self.value += (efficiency * (2 / 3 - 2 / 31) + 2 / 31) ** 2 * (value - self.value)
+        return self.value
+
+
+MOVING_AVERAGES = {0: Sma, 1: Ema, 2: Wma, 3: Dema, 4: Tema, 5: Trima, 6: T3, 7: Kama}
+
+
+def create_moving_average(time_period: int, matype=0) -> Stateful:
+    """The moving average of the api's matype, see indicators.MA_TYPES"""
+    average_type = MOVING_AVERAGES.get(int(matype))
+    if average_type is None:
+        raise ValueError(f"matype {matype} is not supported by the local engine, use one of {MA_TYPES}")
+    return average_type(time_period)
+
+
+class Delayed(Stateful):
+    """Drops the first skip values, so an average starts later, then passes values on to it"""
+
+    def __init__(self, average: Stateful, skip: int):
+        self.average = average
+        self.skip = skip
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        if self.skip > 0:
+            self.skip -= 1
+            return None
+        return self.average.add(value)
+
+
+class WilderSum(Stateful):
+    """Wilder's running sum: the sum of the first time_period - 1 values, then sum - sum / time_period + value"""
+
+    def __init__(self, time_period: int):
+        self.time_period = time_period
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        if self.count < max(self.time_period - 1, 1):
+            self.count += 1
+            self.total += value
+            return self.total if self.count == max(self.time_period - 1, 1) else None
+        self.total = self.total - self.total / self.time_period + value
+        return self.total
+
+
+class RollingExtreme(Stateful):
+    """Highest (or lowest) of the last time_period values in amortized O(1), with the position of the newest one"""
+
+    def __init__(self, time_period: int, highest: bool = True):
+        self.time_period = time_period
+        self.highest = highest
+        self.candidates = deque()  # [position, value], values strictly decreasing (increasing for lowest)
+        self.count = 0
+
+    def add(self, value: float) -> Optional[tuple[int, float]]:
+        position = self.count
+        self.count += 1
+        # an equal older value goes too, so a tie is won by the newest bar like in TA-Lib
+        while self.candidates and (self.candidates[-1][1] <= value if self.highest
+                                   else self.candidates[-1][1] >= value):
+            self.candidates.pop()
+        self.candidates.append([position, value])
+        if self.candidates[0][0] <= position - self.time_period:
+            self.candidates.popleft()
+        if self.count < self.time_period:
+            return None
+        return self.candidates[0][0] - (position - self.time_period + 1), self.candidates[0][1]
+
+
+class StreamingIndicator(Stateful, abc.ABC):
+    """An indicator updated one bar at a time
+
+    Each update costs O(1) (CCI costs O(time_period)), so there is no need to recompute the whole history when a
+    bar arrives. The values match IndicatorEngine for the same bars and parameters. A bar is a dict of prices
+    keyed like the columns (open, high, low, close, volume) or like the api ("4. close"), or a single number for
+    indicators that read one series. get_state() returns plain data you can store as json, from_state() picks up
+    where it left off.
+
+        Typical usage example:
+
+            rsi = create_streaming_indicator({"function": "RSI", "time_period": 14}, seed=quote)
+            value = rsi.update({"open": 101.2, "high": 102.0, "low": 100.9, "close": 101.7, "volume": 120000})
+            saved = json.dumps(rsi.get_state())
+            rsi = StreamingIndicator.from_state(json.loads(saved))
+    """
+    function = ""
+
+    def __init__(self, event: Optional[dict] = None):
+        indicator = INDICATORS[self.function]
+        params = indicator.get_params(event)
+        self.params = {name: params[name] for name in indicator.params}
+        self.series_type = params["series_type"]
+        self.outputs = list(indicator.outputs)
+        self.bars = 0
+        self.value = None
+        self.setup(params)
+
+    @abc.abstractmethod
+    def setup(self, params: dict):
+        """Create the state of the indicator from its params"""
+
+    @abc.abstractmethod
+    def step(self, bar: dict) -> Optional[tuple]:
+        """The outputs of the indicator for the next bar, None while it is warming up"""
+
+    def update(self, bar: Union[dict, float]) -> Optional[dict]:
+        """Add the next bar and return the indicator for it, None while the indicator is warming up"""
+        result = self.step(self.__normalize_bar__(bar))
+        self.bars += 1
+        if result is None or any(value is None or math.isnan(value) for value in result):
+            self.value = None
+        else:
+            self.value = dict(zip(self.outputs, result))
+        return self.value
+
+    def update_many(self, bars: list) -> list[Optional[dict]]:
+        """Add a batch of bars, oldest first"""
+        return [self.update(bar) for bar in bars]
+
+    def seed(self, quote: Quote):
+        """Replay the bars of a Quote, oldest first. Requires numpy"""
+        columns = quote.get_columns()
+        names = columns.get_column_names()
+        for row in zip(*[columns[name].tolist() for name in names]):
+            self.update(dict(zip(names, row)))
+        return self
+
+    def get_value(self) -> Optional[dict]:
+        return self.value
+
+    def __normalize_bar__(self, bar: Union[dict, float]) -> dict:
+        if not isinstance(bar, dict):
+            return {self.series_type: float(bar)}
+        values = {name: value for name, value in bar.items() if value is not None and name not in IGNORED_FIELDS}
+        if all(name.isidentifier() for name in values):
+            return {name: float(value) for name, value in values.items()}
+        names = get_unique_column_names(values)
+        return {(name if name.isidentifier() else names[name]): float(value) for name, value in values.items()}
+
+    def series(self, bar: dict) -> float:
+        return bar[self.series_type]
+
+
+class StreamingAverage(StreamingIndicator):
+    """A moving average of the series, of average_type"""
+    average_type = Sma
+
+    def setup(self, params):
+        self.average = self.average_type(int(params["time_period"]))
+
+    def step(self, bar):
+        return self.average.add(self.series(bar)),
+
+
+class StreamingSma(StreamingAverage):
+    function = "SMA"
+    average_type = Sma
+
+
+class StreamingEma(StreamingAverage):
+    function = "EMA"
+    average_type = Ema
+
+
+class StreamingWma(StreamingAverage):
+    function = "WMA"
+    average_type = Wma
+
+
+class StreamingDema(StreamingAverage):
+    function = "DEMA"
+    average_type = Dema
+
+
+class StreamingTema(StreamingAverage):
+    function = "TEMA"
+    average_type = Tema
+
+
+class StreamingTrima(StreamingAverage):
+    function = "TRIMA"
+    average_type = Trima
+
+
+class StreamingKama(StreamingAverage):
+    function = "KAMA"
+    average_type = Kama
+
+
+class StreamingT3(StreamingAverage):
+    function = "T3"
+
+    def setup(self, params):
+        self.average = T3(int(params["time_period"]), float(params["vfactor"]))
+
+
+class StreamingMacdext(StreamingIndicator):
+    function = "MACDEXT"
+
+    def setup(self, params):
+        fast_period, slow_period = int(params["fastperiod"]), int(params["slowperiod"])
+        fast_type, slow_type = int(params["fastmatype"]), int(params["slowmatype"])
+        if slow_period < fast_period:
+            fast_period, slow_period, fast_type, slow_type = slow_period, fast_period, slow_type, fast_type
+        # both averages start on the same bar, like the IndicatorEngine
+        fast_lookback, slow_lookback = get_lookback(fast_period, fast_type), get_lookback(slow_period, slow_type)
+        lookback = max(fast_lookback, slow_lookback)
+        self.fast = Delayed(create_moving_average(fast_period, fast_type), lookback - fast_lookback)
+        self.slow = Delayed(create_moving_average(slow_period, slow_type), lookback - slow_lookback)
+        self.signal = create_moving_average(int(params["signalperiod"]), params["signalmatype"])
+
+    def step(self, bar):
+        fast, slow = self.fast.add(self.series(bar)), self.slow.add(self.series(bar))
+        if fast is None or slow is None:
+            return None
+        macd = fast - slow
+        signal = self.signal.add(macd)
+        return None if signal is None else (macd, macd - signal, signal)
+
+
+class StreamingMacd(StreamingMacdext):
+    function = "MACD"
+
+    def setup(self, params):
+        super().setup({**params, "fastmatype": 1, "slowmatype": 1, "signalmatype": 1})
+
+
+class StreamingApo(StreamingIndicator):
+    function = "APO"
+
+    def setup(self, params):
+        fast_period, slow_period = sorted((int(params["fastperiod"]), int(params["slowperiod"])))
+        self.fast = create_moving_average(fast_period, params["matype"])
+        self.slow = create_moving_average(slow_period, params["matype"])
+
+    def step(self, bar):
+        fast, slow = self.fast.add(self.series(bar)), self.slow.add(self.series(bar))
+        return None if fast is None or slow is None else (self.compare(fast, slow),)
+
+    def compare(self, fast: float, slow: float) -> float:
+        return fast - slow
+
+
+class StreamingPpo(StreamingApo):
+    function = "PPO"
+
+    def compare(self, fast, slow):
+        return 0.0 if slow == 0 else 100 * (fast - slow) / slow
+
+
+class StreamingRsi(StreamingIndicator):
+    function = "RSI"
+
+    def setup(self, params):
+        time_period = int(params["time_period"])
+        self.previous = None
+        self.gain = Ema(time_period, 1 / time_period)
+        self.loss = Ema(time_period, 1 / time_period)
+
+    def average_gain_and_loss(self, value: float) -> Optional[tuple[float, float]]:
+        previous = self.previous
+        self.previous = value
+        if previous is None:
+            return None
+        gain, loss = self.gain.add(max(value - previous, 0.0)), self.loss.add(max(previous - value, 0.0))
+        return None if gain is None else (gain, loss)
+
+    def rsi(self, value: float) -> Optional[float]:
+        averages = self.average_gain_and_loss(value)
+        if averages is None:
+            return None
+        gain, loss = averages
+        return 0.0 if gain + loss == 0 else 100 * gain / (gain + loss)
+
+    def step(self, bar):
+        return self.rsi(self.series(bar)),
+
+
+class StreamingCmo(StreamingRsi):
+    function = "CMO"
+
+    def step(self, bar):
+        averages = self.average_gain_and_loss(self.series(bar))
+        if averages is None:
+            return None
+        gain, loss = averages
+        return (0.0 if gain + loss == 0 else 100 * (gain - loss) / (gain + loss)),
+
+
+class StreamingBbands(StreamingIndicator):
+    function = "BBANDS"
+
+    def setup(self, params):
+        self.average = create_moving_average(int(params["time_period"]), params["matype"])
+        self.sum = RollingSum(int(params["time_period"]))
+        self.squares = RollingSum(int(params["time_period"]))
+        self.up, self.down = float(params["nbdevup"]), float(params["nbdevdn"])
+
+    def step(self, bar):
+        value = self.series(bar)
+        middle, total, squares = self.average.add(value), self.sum.add(value), self.squares.add(value * value)
+        if middle is None or total is None:
+            return None
+        time_period = self.sum.time_period
+        mean = total / time_period
+        deviation = math.sqrt(max(squares / time_period - mean * mean, 0.0))
+        return middle + self.up * deviation, middle, middle - self.down * deviation
+
+
+class StreamingTrange(StreamingIndicator):
+    function = "TRANGE"
+
+    def setup(self, params):
+        self.previous_close = None
+
+    def true_range(self, bar) -> Optional[float]:
+        previous_close = self.previous_close
+        self.previous_close = bar["close"]
+        if previous_close is None:
+            return None
+        return max(bar["high"] - bar["low"], abs(bar["high"] - previous_close), abs(bar["low"] - previous_close))
+
+    def step(self, bar):
+        return self.true_range(bar),
+
+
+class StreamingAtr(StreamingTrange):
+    function = "ATR"
+
+    def setup(self, params):
+        super().setup(params)
+        self.average = Ema(int(params["time_period"]), 1 / int(params["time_period"]))
+
+    def step(self, bar):
+        return self.average.add(self.true_range(bar)),
+
+
+class StreamingNatr(StreamingAtr):
+    function = "NATR"
+
+    def step(self, bar):
+        average = self.average.add(self.true_range(bar))
+        return None if average is None else (average / bar["close"] * 100,)
+
+
+class StreamingPlusDm(StreamingTrange):
+    """Wilder sums of the directional movement and of the true range, the base of the DI, DX and ADX family"""
+    function = "PLUS_DM"
+
+    def setup(self, params):
+        super().setup(params)
+        self.time_period = int(params["time_period"])
+        self.previous = None
+        self.plus = WilderSum(self.time_period)
+        self.minus = WilderSum(self.time_period)
+        self.ranges = WilderSum(self.time_period)
+        self.started = False
+
+    def movement(self, bar) -> tuple[Optional[float], Optional[float], Optional[float]]:
+        """Wilder sums of +DM, -DM and the true range"""
+        previous = self.previous
+        self.previous = [bar["high"], bar["low"]]
+        true_range = self.true_range(bar)
+        if previous is None:
+            return None, None, None
+        up, down = bar["high"] - previous[0], previous[1] - bar["low"]
+        return self.plus.add(up if up > down and up > 0 else 0.0), \
+            self.minus.add(down if down > up and down > 0 else 0.0), self.ranges.add(true_range)
+
+    def directional_indicators(self, bar) -> Optional[tuple[float, float]]:
+        """+DI and -DI, starting one bar after the sums"""
+        plus, minus, ranges = self.movement(bar)
+        if ranges is None or not self.started:
+            self.started = ranges is not None
+            return None
+        if ranges == 0:
+            return 0.0, 0.0
+        return 100 * plus / ranges, 100 * minus / ranges
+
+    def step(self, bar):
+        return self.movement(bar)[0],
+
+
+class StreamingMinusDm(StreamingPlusDm):
+    function = "MINUS_DM"
+
+    def step(self, bar):
+        return self.movement(bar)[1],
+
+
+class StreamingPlusDi(StreamingPlusDm):
+    function = "PLUS_DI"
+
+    def step(self, bar):
+        indicators = self.directional_indicators(bar)
+        return None if indicators is None else (indicators[0],)
+
+
+class StreamingMinusDi(StreamingPlusDm):
+    function = "MINUS_DI"
+
+    def step(self, bar):
+        indicators = self.directional_indicators(bar)
+        return None if indicators is None else (indicators[1],)
+
+
+class StreamingDx(StreamingPlusDm):
+    function = "DX"
+
+    def dx(self, bar) -> Optional[float]:
+        indicators = self.directional_indicators(bar)
+        if indicators is None:
+            return None
+        plus, minus = indicators
+        return 0.0 if plus + minus == 0 else 100 * abs(plus - minus) / (plus + minus)
+
+    def step(self, bar):
+        return self.dx(bar),
+
+
+class StreamingAdx(StreamingDx):
+    function = "ADX"
+
+    def setup(self, params):
+        super().setup(params)
+        self.average = Ema(self.time_period, 1 / self.time_period)
+
+    def step(self, bar):
+        return self.average.add(self.dx(bar)),
+
+
+class StreamingAdxr(StreamingAdx):
+    function = "ADXR"
+
+    def setup(self, params):
+        super().setup(params)
+        self.window = deque(maxlen=self.time_period)
+
+    def step(self, bar):
+        adx = self.average.add(self.dx(bar))
+        if adx is None:
+            return None
+        self.window.append(adx)
+        return None if len(self.window) < self.window.maxlen else ((adx + self.window[0]) / 2,)
+
+
+class StreamingMom(StreamingIndicator):
+    function = "MOM"
+
+    def setup(self, params):
+        self.window = deque(maxlen=int(params["time_period"]) + 1)
+
+    def step(self, bar):
+        self.window.append(self.series(bar))
+        if len(self.window) < self.window.maxlen:
+            return None
+        return self.compare(self.window[-1], self.window[0]),
+
+    def compare(self, value: float, previous: float) -> float:
+        return value - previous
+
+
+class StreamingRoc(StreamingMom):
+    function = "ROC"
+
+    def compare(self, value, previous):
+        return (value / previous - 1) * 100
+
+
+class StreamingRocr(StreamingMom):
+    function = "ROCR"
+
+    def compare(self, value, previous):
+        return value / previous
+
+
+class StreamingTrix(StreamingIndicator):
+    function = "TRIX"
+
+    def setup(self, params):
+        self.averages = [Ema(int(params["time_period"])) for _ in range(3)]
+        self.previous = None
+
+    def step(self, bar):
+        value = self.series(bar)
+        for average in self.averages:
+            value = average.add(value)
+        previous = self.previous
+        self.previous = value
+        if value is None or previous is None:
+            return None
+        return (0.0 if previous == 0 else (value - previous) / previous * 100),
+
+
+class StreamingBop(StreamingIndicator):
+    function = "BOP"
+
+    def setup(self, params):
+        pass
+
+    def step(self, bar):
+        spread = bar["high"] - bar["low"]
+        return (0.0 if spread == 0 else (bar["close"] - bar["open"]) / spread),
+
+
+class StreamingWillr(StreamingIndicator):
+    function = "WILLR"
+
+    def setup(self, params):
+        self.highest = RollingExtreme(int(params["time_period"]), True)
+        self.lowest = RollingExtreme(int(params["time_period"]), False)
+
+    def step(self, bar):
+        highest, lowest = self.highest.add(bar["high"]), self.lowest.add(bar["low"])
+        if highest is None:
+            return None
+        spread = highest[1] - lowest[1]
+        return (0.0 if spread == 0 else -100 * (highest[1] - bar["close"]) / spread),
+
+
+class StreamingCci(StreamingIndicator):
+    function = "CCI"
+
+    def setup(self, params):
+        self.typical = RollingSum(int(params["time_period"]))
+
+    def step(self, bar):
+        typical = (bar["high"] + bar["low"] + bar["close"]) / 3
+        total = self.typical.add(typical)
+        if total is None:
+            return None
+        mean = total / self.typical.time_period
+        deviation = sum(abs(value - mean) for value in self.typical.window) / self.typical.time_period
+        return (0.0 if deviation == 0 else (typical - mean) / (0.015 * deviation)),
+
+
+class StreamingMfi(StreamingIndicator):
+    function = "MFI"
+
+    def setup(self, params):
+        self.previous = None
+        self.positive = RollingSum(int(params["time_period"]))
+        self.negative = RollingSum(int(params["time_period"]))
+
+    def step(self, bar):
+        typical = (bar["high"] + bar["low"] + bar["close"]) / 3
+        previous = self.previous
+        self.previous = typical
+        if previous is None:
+            return None
+        flow = typical * bar["volume"]
+        positive = self.positive.add(flow if typical > previous else 0.0)
+        negative = self.negative.add(flow if typical < previous else 0.0)
+        if positive is None:
+            return None
+        return (0.0 if positive + negative < 1 else 100 * positive / (positive + negative)),
+
+
+class StreamingUltosc(StreamingIndicator):
+    function = "ULTOSC"
+
+    def setup(self, params):
+        self.periods = sorted(int(params[name]) for name in ("timeperiod1", "timeperiod2", "timeperiod3"))
+        self.previous_close = None
+        self.pressures = [RollingSum(period) for period in self.periods]
+        self.ranges = [RollingSum(period) for period in self.periods]
+
+    def step(self, bar):
+        previous_close = self.previous_close
+        self.previous_close = bar["close"]
+        if previous_close is None:
+            return None
+        true_low = min(bar["low"], previous_close)
+        pressure, true_range = bar["close"] - true_low, max(bar["high"], previous_close) - true_low
+        averages = []
+        for pressures, ranges in zip(self.pressures, self.ranges):
+            total_pressure, total_range = pressures.add(pressure), ranges.add(true_range)
+            if total_pressure is not None:
+                averages.append(0.0 if total_range == 0 else total_pressure / total_range)
+        if len(averages) < 3:
+            return None
+        return 100 * (4 * averages[0] + 2 * averages[1] + averages[2]) / 7,
+
+
+class StreamingMidpoint(StreamingIndicator):
+    function = "MIDPOINT"
+
+    def setup(self, params):
+        self.highest = RollingExtreme(int(params["time_period"]), True)
+        self.lowest = RollingExtreme(int(params["time_period"]), False)
+
+    def step(self, bar):
+        highest, lowest = self.highest.add(self.series(bar)), self.lowest.add(self.series(bar))
+        return None if highest is None else ((highest[1] + lowest[1]) / 2,)
+
+
+class StreamingMidprice(StreamingMidpoint):
+    function = "MIDPRICE"
+
+    def step(self, bar):
+        highest, lowest = self.highest.add(bar["high"]), self.lowest.add(bar["low"])
+        return None if highest is None else ((highest[1] + lowest[1]) / 2,)
+
+
+class StreamingSar(StreamingIndicator):
+    function = "SAR"
+
+    def setup(self, params):
+        self.maximum = float(params["maximum"])
+        self.acceleration = min(float(params["acceleration"]), self.maximum)
+        self.first = None
+        self.state = None
+
+    def step(self, bar):
+        if self.first is None:
+            self.first = [bar["high"], bar["low"]]
+            return None
+        if self.state is None:
+            self.state = start_parabolic_sar(self.first[0], self.first[1], bar["high"], bar["low"],
+                                             self.acceleration)
+        return parabolic_sar_step(self.state, bar["high"], bar["low"], self.acceleration, self.maximum),
+
+
+class StreamingObv(StreamingIndicator):
+    function = "OBV"
+
+    def setup(self, params):
+        self.previous_close = None
+        self.total = 0.0
+
+    def step(self, bar):
+        if self.previous_close is None:
+            self.total = bar["volume"]
+        elif bar["close"] != self.previous_close:
+            self.total += bar["volume"] if bar["close"] > self.previous_close else -bar["volume"]
+        self.previous_close = bar["close"]
+        return self.total,
+
+
+class StreamingAd(StreamingIndicator):
+    function = "AD"
+
+    def setup(self, params):
+        self.total = 0.0
+
+    def ad(self, bar) -> float:
+        spread = bar["high"] - bar["low"]
+        if spread != 0:
+            self.total += ((bar["close"] - bar["low"]) - (bar["high"] - bar["close"])) / spread * bar["volume"]
+        return self.total
+
+    def step(self, bar):
+        return self.ad(bar),
+
+
+class StreamingAdosc(StreamingAd):
+    function = "ADOSC"
+
+    def setup(self, params):
+        super().setup(params)
+        fast_period, slow_period = int(params["fastperiod"]), int(params["slowperiod"])
+        # both averages start at the first bar, like the IndicatorEngine
+        self.fast = Ema(1, 2 / (fast_period + 1))
+        self.slow = Ema(1, 2 / (slow_period + 1))
+        self.lookback = max(fast_period, slow_period) - 1
+
+    def step(self, bar):
+        ad = self.ad(bar)
+        fast, slow = self.fast.add(ad), self.slow.add(ad)
+        return None if self.bars < self.lookback else (fast - slow,)
+
+
+class Stochastic(Stateful):
+    """%K, where the value is between the lowest low and the highest high of time_period bars"""
+
+    def __init__(self, time_period: int):
+        self.highest = RollingExtreme(time_period, True)
+        self.lowest = RollingExtreme(time_period, False)
+
+    def add(self, high: float, low: float, close: float) -> Optional[float]:
+        highest, lowest = self.highest.add(high), self.lowest.add(low)
+        if highest is None:
+            return None
+        spread = highest[1] - lowest[1]
+        return 0.0 if spread == 0 else 100 * (close - lowest[1]) / spread
+
+
+class StreamingStoch(StreamingIndicator):
+    function = "STOCH"
+
+    def setup(self, params):
+        self.fast_k = Stochastic(int(params["fastkperiod"]))
+        self.slow_k = create_moving_average(int(params["slowkperiod"]), params["slowkmatype"])
+        self.slow_d = create_moving_average(int(params["slowdperiod"]), params["slowdmatype"])
+
+    def step(self, bar):
+        slow_k = self.slow_k.add(self.fast_k.add(bar["high"], bar["low"], bar["close"]))
+        slow_d = self.slow_d.add(slow_k)
+        return None if slow_d is None else (slow_k, slow_d)
+
+
+class StreamingStochf(StreamingIndicator):
+    function = "STOCHF"
+
+    def setup(self, params):
+        self.fast_k = Stochastic(int(params["fastkperiod"]))
+        self.fast_d = create_moving_average(int(params["fastdperiod"]), params["fastdmatype"])
+
+    def stochastic(self, high: float, low: float, close: float) -> Optional[tuple]:
+        fast_k = self.fast_k.add(high, low, close)
+        fast_d = self.fast_d.add(fast_k)
+        return None if fast_d is None else (fast_k, fast_d)
+
+    def step(self, bar):
+        return self.stochastic(bar["high"], bar["low"], bar["close"])
+
+
+class StreamingStochrsi(StreamingRsi, StreamingStochf):
+    function = "STOCHRSI"
+
+    def setup(self, params):
+        StreamingRsi.setup(self, params)
+        StreamingStochf.setup(self, params)
+
+    def step(self, bar):
+        rsi = self.rsi(self.series(bar))
+        return None if rsi is None else self.stochastic(rsi, rsi, rsi)
+
+
+class StreamingAroon(StreamingIndicator):
+    function = "AROON"
+
+    def setup(self, params):
+        self.time_period = int(params["time_period"])
+        self.highest = RollingExtreme(self.time_period + 1, True)
+        self.lowest = RollingExtreme(self.time_period + 1, False)
+
+    def step(self, bar):
+        highest, lowest = self.highest.add(bar["high"]), self.lowest.add(bar["low"])
+        if highest is None:
+            return None
+        return 100 * lowest[0] / self.time_period, 100 * highest[0] / self.time_period
+
+
+class StreamingAroonosc(StreamingAroon):
+    function = "AROONOSC"
+
+    def step(self, bar):
+        aroon = super().step(bar)
+        return None if aroon is None else (aroon[1] - aroon[0],)
+
+
+STREAMING_INDICATORS = {indicator.function: indicator for indicator in [
+    StreamingSma, StreamingEma, StreamingWma, StreamingDema, StreamingTema, StreamingTrima, StreamingKama,
+    StreamingT3, StreamingMacd, StreamingMacdext, StreamingStoch, StreamingStochf, StreamingRsi, StreamingStochrsi,
+    StreamingWillr, StreamingAdx, StreamingAdxr, StreamingApo, StreamingPpo, StreamingMom, StreamingBop,
+    StreamingCci, StreamingCmo, StreamingRoc, StreamingRocr, StreamingAroon, StreamingAroonosc, StreamingMfi,
+    StreamingTrix, StreamingUltosc, StreamingDx, StreamingMinusDi, StreamingPlusDi, StreamingMinusDm,
+    StreamingPlusDm, StreamingBbands, StreamingMidpoint, StreamingMidprice, StreamingSar, StreamingTrange,
+    StreamingAtr, StreamingNatr, StreamingAd, StreamingAdosc, StreamingObv,
+]}
+
+
+def create_streaming_indicator(event: Optional[dict] = None, seed: Optional[Quote] = None) -> StreamingIndicator:
+    """Streaming version of the indicator named by event["function"] (SMA by default)
+
+    Args:
+        event: the parameters you would send to get_technical_indicator, i.e. {"function": "RSI", "time_period": 14}
+        seed: a price Quote whose bars are replayed first, so the indicator is warm
+
+    Returns:
+        StreamingIndicator
+    """
+    function = str((event or {}).get("function", "SMA")).upper()
+    indicator_type = STREAMING_INDICATORS.get(function)
+    if indicator_type is None:
+        raise ValueError(f"{function} has no streaming version, use one of {list(STREAMING_INDICATORS.keys())}")
+    indicator = indicator_type(event)
+
+    return indicator.seed(seed) if seed is not None else indicator
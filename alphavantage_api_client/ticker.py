@@ -1,8 +1,13 @@
-import copy
 from typing import Optional
 from alphavantage_api_client import AlphavantageClient, GlobalQuote, Quote, CompanyOverview, AccountingReport
+from alphavantage_api_client.fundamentals import FundamentalsTable
 from time import sleep
 
+# reports fetched by fetch_accounting_reports(), each one has a fetch_<report>() method
+ACCOUNTING_REPORTS = ("balance_sheet", "income_statement", "earnings", "cash_flow")
+# reports fetched by fetch_all()
+ALL_REPORTS = ACCOUNTING_REPORTS + ("company_overview", "global_quote")
+
 
 class Ticker:
 
@@ -21,6 +26,7 @@ class Ticker:
         self.__correlated_annual_reports__: dict[str, dict] = {}
         self.__correlated_quarterly_reports__: dict[str, dict] = {}
         self.__correlated_reports__: dict[str, dict] = {}
+        self.__fetch_errors__: dict[str, Exception] = {}
 
     def create_client(self, api_key: str = None):
         if not api_key:
@@ -146,68 +152,92 @@ class Ticker:
 
     def fetch_accounting_reports(self):
         """
-        This will fetch balance sheet, income statement and earnings from alphavantage api
+        This will fetch balance sheet, income statement, earnings and cash flow from alphavantage api. The four calls
+        are made at the same time. A call that raises doesn't stop the others, see get_fetch_errors()
         Returns:
             Ticker
 
         """
-        self.fetch_balance_sheet().fetch_income_statement().fetch_earnings().fetch_cash_flow()
+        self.__fetch_concurrently__(ACCOUNTING_REPORTS)
 
         return self
 
-    def __rename_fields__(self, prefix, record: dict[str, object]):
-        record_copy = copy.deepcopy(record)
-        for key in record_copy:
-            new_key = f"{prefix}{key}"
-            record[new_key] = record[key]
-            record.pop(key)
+    def fetch_all(self):
+        """
+        This will fetch the accounting reports, company overview and global quote from alphavantage api, all at the
+        same time. A call that raises doesn't stop the others, see get_fetch_errors()
+        Returns:
+            Ticker
 
-    def correlate_accounting_reports(self):
-        earnings = self.get_earnings()
-        balance_sheet = self.get_balance_sheet()
-        income_statement = self.get_income_statement()
-        cash_flow = self.get_cash_flow()
-        self.correlate_accounting_report(earnings, "earnings_")
-        self.correlate_accounting_report(balance_sheet, "balance_")
-        self.correlate_accounting_report(income_statement, "income_")
-        self.correlate_accounting_report(cash_flow, "cash_")
-        for fiscal_ending_date in self.__correlated_quarterly_reports__:
-            if fiscal_ending_date not in self.__correlated_reports__:
-                self.__correlated_reports__[fiscal_ending_date] = \
-                    self.__correlated_quarterly_reports__[fiscal_ending_date]
-            else:
-                report = self.__correlated_quarterly_reports__[fiscal_ending_date]
-                self.__correlated_reports__[fiscal_ending_date].update(report)
-        for fiscal_ending_date in self.__correlated_annual_reports__:
-            if fiscal_ending_date not in self.__correlated_reports__:
-                self.__correlated_reports__[fiscal_ending_date] = \
-                    self.__correlated_annual_reports__[fiscal_ending_date]
+        """
+        self.__fetch_concurrently__(ALL_REPORTS)
+
+        return self
+
+    def __fetch_concurrently__(self, reports: tuple[str, ...]):
+        if self.__symbol__ is None or len(self.__symbol__) == 0:
+            raise ValueError("You must define the symbol by calling from_symbol(...)")
+
+        def fetch(report: str):
+            return getattr(self, f"fetch_{report}")()
+
+        for item in self.__client__.map(fetch, reports, max_workers=len(reports)):
+            if item.error is not None:
+                self.__fetch_errors__[item.event] = item.error
             else:
-                report = self.__correlated_annual_reports__[fiscal_ending_date]
-                self.__correlated_reports__[fiscal_ending_date].update(report)
+                self.__fetch_errors__.pop(item.event, None)
+
+    def get_fetch_errors(self) -> dict[str, Exception]:
+        """The exception raised while fetching each report (i.e. "cash_flow") by the last fetch_accounting_reports()
+        or fetch_all(). Reports fetched successfully are not in it"""
+        return dict(self.__fetch_errors__)
+
+    def correlate_accounting_reports(self):
+        """
+        Combine the earnings, balance sheet, income statement and cash flow by fiscal date ending, in one pass. Fields
+        are renamed to <report>_<period>_<field>, i.e. balance_annual_totalAssets. The reports themselves are only
+        read, so calling this again gives the same result
+        Returns:
+            Ticker
+
+        """
+        self.__correlated_annual_reports__ = {}
+        self.__correlated_quarterly_reports__ = {}
+        reports = {"earnings_": self.get_earnings(), "balance_": self.get_balance_sheet(),
+                   "income_": self.get_income_statement(), "cash_": self.get_cash_flow()}
+        for prefix, accounting_report in reports.items():
+            self.correlate_accounting_report(accounting_report, prefix)
+        correlated_reports = {}
+        for correlated in (self.__correlated_quarterly_reports__, self.__correlated_annual_reports__):
+            for fiscal_date_ending, report in correlated.items():
+                correlated_reports.setdefault(fiscal_date_ending, {}).update(report)
+        self.__correlated_reports__ = correlated_reports
 
         return self
 
     def correlate_accounting_report(self, accounting_report: AccountingReport, prefix: str):
-        for index, annual_report in enumerate(accounting_report.annualReports):
-            fiscal_date_ending = annual_report.pop("fiscalDateEnding")
-            self.__rename_fields__(f"{prefix}annual_", annual_report)
-            annual_report["fiscalDateEnding"] = fiscal_date_ending
-            if fiscal_date_ending not in self.__correlated_annual_reports__:
-                self.__correlated_annual_reports__[fiscal_date_ending] = annual_report
-            else:
-                report = self.__correlated_annual_reports__[fiscal_date_ending]
-                report.update(annual_report)
-
-        for index, quarterly_report in enumerate(accounting_report.quarterlyReports):
-            fiscal_date_ending = quarterly_report.pop("fiscalDateEnding")
-            self.__rename_fields__(f"{prefix}quarterly_", quarterly_report)
-            quarterly_report["fiscalDateEnding"] = fiscal_date_ending
-            if fiscal_date_ending not in self.__correlated_quarterly_reports__:
-                self.__correlated_quarterly_reports__[fiscal_date_ending] = quarterly_report
-            else:
-                report = self.__correlated_quarterly_reports__[fiscal_date_ending]
-                report.update(quarterly_report)
+        periods = ((f"{prefix}annual_", accounting_report.annualReports, self.__correlated_annual_reports__),
+                   (f"{prefix}quarterly_", accounting_report.quarterlyReports, self.__correlated_quarterly_reports__))
+        for field_prefix, records, correlated in periods:
+            for record in records:
+                fiscal_date_ending = record["fiscalDateEnding"]
+                report = correlated.get(fiscal_date_ending)
+                if report is None:
+                    report = correlated[fiscal_date_ending] = {"fiscalDateEnding": fiscal_date_ending}
+                for field, value in record.items():
+                    if field != "fiscalDateEnding":
+                        report[field_prefix + field] = value
+
+    def get_fundamentals_table(self) -> FundamentalsTable:
+        """The accounting reports as one numeric table, a row per period and fiscal date ending and a float64 column
+        per field (i.e. balance_totalAssets). Requires numpy. The reports are only read
+
+        Returns:
+            FundamentalsTable
+        """
+        reports = {"balance_sheet": self.get_balance_sheet(), "income_statement": self.get_income_statement(),
+                   "earnings": self.get_earnings(), "cash_flow": self.get_cash_flow()}
+        return FundamentalsTable.from_reports(self.__symbol__, reports)
 
     def get_correlated_annual_reports(self) -> dict[str, dict]:
         if self.__correlated_annual_reports__ is None \
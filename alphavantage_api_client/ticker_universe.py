@@ -0,0 +1,158 @@
+import glob
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Iterable, Optional
+from .client import AlphavantageClient
+from .columnar import import_numpy
+from .fundamentals import FundamentalsTable, REPORT_PREFIXES
+from .log_message import LazyLogMessage
+
+ACCOUNTING_REPORTS = tuple(REPORT_PREFIXES.keys())
+
+
+class TickerUniverse:
+    """Fetch and correlate the accounting reports of thousands of symbols
+
+    Every symbol's balance sheet, income statement, earnings and cash flow are fetched through one client, so they
+    share its connection pool, cache and rate limiter, several calls at a time. As soon as a symbol's reports are
+    in they are correlated into a FundamentalsTable and the reports are dropped, so memory holds numbers in columns
+    instead of one object graph per symbol.
+
+    With a checkpoint directory the completed symbols are written to it every checkpoint_every symbols. Running
+    fetch() again (after a crash, in a new process) loads them and only fetches the symbols still missing. Symbols
+    that failed are not checkpointed, so they are tried again.
+
+        Typical usage example:
+
+            client = AlphavantageClient().with_rate_limit(calls_per_minute=75).use_persistent_cache(path)
+            universe = TickerUniverse(symbols, client, checkpoint_dir="/data/fundamentals").fetch()
+            table = universe.get_table()
+            print(universe.get_errors())
+    """
+
+    def __init__(self, symbols: Iterable[str], client: Optional[AlphavantageClient] = None,
+                 checkpoint_dir: Optional[str] = None, checkpoint_every: int = 100,
+                 reports: Iterable[str] = ACCOUNTING_REPORTS, max_workers: Optional[int] = None):
+        self.__symbols__ = list(dict.fromkeys(str(symbol).strip().upper() for symbol in symbols))
+        self.__client__ = client if client is not None else AlphavantageClient()
+        self.__checkpoint_dir__ = checkpoint_dir
+        self.__checkpoint_every__ = max(checkpoint_every, 1)
+        self.__reports__ = tuple(reports)
+        unknown = [report for report in self.__reports__ if report not in REPORT_PREFIXES]
+        if unknown:
+            raise ValueError(f"Unknown reports {unknown}, use {list(REPORT_PREFIXES)}")
+        self.__max_workers__ = max_workers
+        self.__lock__ = threading.Lock()
+        self.__parts__: list[FundamentalsTable] = []
+        self.__completed__: set[str] = set()
+        self.__errors__: dict[str, dict[str, str]] = {}
+        self.__table__: Optional[FundamentalsTable] = None
+        self.__load_checkpoint__()
+
+    def fetch(self):
+        """Fetch and correlate the reports of every symbol not completed yet
+
+        Returns:
+            TickerUniverse
+        """
+        pending = [symbol for symbol in self.__symbols__ if symbol not in self.__completed__]
+        events = ((symbol, report) for symbol in pending for report in self.__reports__)
+        in_progress: dict[str, dict] = {}
+        unsaved: list[tuple[str, FundamentalsTable]] = []
+        try:
+            for item in self.__client__.map(self.__fetch_report__, events, self.__max_workers__):
+                symbol, report = item.event
+                received = in_progress.setdefault(symbol, {})
+                received[report] = item
+                if len(received) < len(self.__reports__):
+                    continue
+                del in_progress[symbol]
+                table = self.__correlate__(symbol, received)
+                if table is not None:
+                    unsaved.append((symbol, table))
+                if len(unsaved) >= self.__checkpoint_every__:
+                    self.__save_part__(unsaved)
+                    unsaved = []
+        finally:
+            if unsaved:
+                self.__save_part__(unsaved)
+
+        return self
+
+    def get_table(self) -> FundamentalsTable:
+        """One row per symbol, period and fiscal date ending of every completed symbol"""
+        with self.__lock__:
+            if self.__table__ is None:
+                self.__table__ = FundamentalsTable.concat(self.__parts__)
+                self.__parts__ = [self.__table__]
+            return self.__table__
+
+    def get_errors(self) -> dict[str, dict[str, str]]:
+        """Why each failed symbol failed, by report. Failed symbols are fetched again by the next fetch()"""
+        with self.__lock__:
+            return {symbol: dict(errors) for symbol, errors in self.__errors__.items()}
+
+    def get_progress(self) -> dict:
+        with self.__lock__:
+            completed = len(self.__completed__)
+            failed = len(self.__errors__)
+        return {"total": len(self.__symbols__), "completed": completed, "failed": failed,
+                "pending": len(self.__symbols__) - completed - failed}
+
+    def __fetch_report__(self, event: tuple[str, str]):
+        symbol, report = event
+        return getattr(self.__client__, f"get_{report}")({"symbol": symbol})
+
+    def __correlate__(self, symbol: str, received: dict) -> Optional[FundamentalsTable]:
+        errors = {}
+        for report, item in received.items():
+            if item.error is not None:
+                errors[report] = repr(item.error)
+            elif not item.success:
+                errors[report] = item.result.error_message or "unsuccessful response"
+        if errors:
+            logging.warning(LazyLogMessage({"method": "TickerUniverse.fetch", "action": "symbol_failed",
+                                            "symbol": symbol, "errors": errors}))
+            with self.__lock__:
+                self.__errors__[symbol] = errors
+            return None
+
+        reports = {report: received[report].result for report in self.__reports__}
+        return FundamentalsTable.from_reports(symbol, reports)
+
+    def __save_part__(self, completed: list[tuple[str, FundamentalsTable]]):
+        np = import_numpy()
+        symbols = [symbol for symbol, _ in completed]
+        part = FundamentalsTable.concat(table for _, table in completed)
+        if self.__checkpoint_dir__ is not None:
+            # unique across processes sharing the directory, and sorted in the order the parts were written
+            name = f"part-{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.npz"
+            path = os.path.join(self.__checkpoint_dir__, name)
+            part.save(path, completed_symbols=np.array(symbols, dtype=str))
+        with self.__lock__:
+            self.__parts__.append(part)
+            self.__table__ = None
+            self.__completed__.update(symbols)
+            for symbol in symbols:
+                self.__errors__.pop(symbol, None)
+
+    def __get_part_paths__(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.__checkpoint_dir__, "part-*.npz")))
+
+    def __load_checkpoint__(self):
+        if self.__checkpoint_dir__ is None or not os.path.isdir(self.__checkpoint_dir__):
+            return
+        # the directory may be shared with other universes, keep only our symbols and the newest part of each
+        wanted = set(self.__symbols__)
+        for path in reversed(self.__get_part_paths__()):
+            part, extra = FundamentalsTable.load(path)
+            symbols = [symbol for symbol in extra["completed_symbols"].tolist()
+                       if symbol in wanted and symbol not in self.__completed__]
+            if symbols:
+                self.__parts__.append(part.select(symbols=symbols))
+                self.__completed__.update(symbols)
+        logging.info(LazyLogMessage({"method": "TickerUniverse.__init__", "action": "checkpoint_loaded",
+                                     "completed": len(self.__completed__)}))
@@ -0,0 +1,151 @@
+import logging
+import threading
+from typing import Optional
+from .api_request import RequestKey
+from .cache import LruCache
+from .client import AlphavantageClient
+from .log_message import LazyLogMessage
+from .models import Quote
+
+# functions that accept outputsize=compact, the others always return their whole history
+SYNCABLE_FUNCTIONS = {"TIME_SERIES_INTRADAY", "TIME_SERIES_DAILY", "TIME_SERIES_DAILY_ADJUSTED", "FX_INTRADAY",
+                      "FX_DAILY"}
+# functions whose history is rewritten when a split or dividend happens
+ADJUSTED_FUNCTIONS = {"TIME_SERIES_DAILY_ADJUSTED"}
+
+
+class TimeSeriesSync:
+    """Keeps a full history per symbol, function and interval up to date with compact requests
+
+    The first sync of a series fetches outputsize=full. Later syncs fetch outputsize=compact (the latest 100 bars)
+    and merge the new bars into the stored history, which is a few kilobytes instead of megabytes per symbol. A
+    full history is fetched again only when the merge would be wrong:
+
+    - gap: the compact bars don't reach back to the newest stored bar, so bars are missing in between
+    - adjustment: a bar both copies have (other than the newest stored bar, which may have been taken during the
+      trading day) changed, or a new bar carries a dividend or split, so every adjusted price before it changed
+
+    The store is anything with get(key) and put(key, value): LruCache (the default, in memory) or SqliteCache to
+    keep histories across restarts.
+
+        Typical usage example:
+
+            sync = TimeSeriesSync(client, SqliteCache("/var/cache/alphavantage_history.sqlite"))
+            quote = sync.sync({"function": "TIME_SERIES_DAILY_ADJUSTED", "symbol": "TSLA"})  # nightly
+    """
+
+    def __init__(self, client: Optional[AlphavantageClient] = None, store=None):
+        self.__client__ = client if client is not None else AlphavantageClient()
+        self.__store__ = store if store is not None else LruCache(max_size=10000)
+        self.__metrics_lock__ = threading.Lock()
+        self.__metrics__ = {"full": 0, "compact": 0, "gap": 0, "adjustment": 0}
+
+    def get_store(self):
+        return self.__store__
+
+    def get_history(self, event: dict) -> Optional[Quote]:
+        """The stored history without calling the api, None if it was never synced"""
+        history = self.__store__.get(self.__get_history_key__(event))
+        return None if history is None else Quote.model_validate(history)
+
+    def sync(self, event: dict) -> Quote:
+        """Bring the stored history of this series up to date and return it
+
+        Args:
+            event: the parameters you would send to the api, i.e. {"function": "TIME_SERIES_DAILY", "symbol": "F"}.
+                outputsize is chosen by the sync
+
+        Returns:
+            Quote with the full history, or the failed response when the api call didn't succeed
+        """
+        key = self.__get_history_key__(event)
+        function = str(event.get("function", "")).upper()
+        history = self.__store__.get(key)
+        if history is None or function not in SYNCABLE_FUNCTIONS:
+            return self.__fetch_full__(key, event)
+
+        compact = self.__fetch__(event, "compact")
+        self.__count__("compact")
+        if not compact.get("success"):
+            return Quote.model_validate(compact)
+        history_series, compact_series = get_series(history), get_series(compact)
+        if len(history_series) == 0 or len(compact_series) == 0:
+            return self.__fetch_full__(key, event)
+
+        reason = self.__get_refetch_reason__(function, history_series, compact_series)
+        if reason is not None:
+            self.__count__(reason)
+            logging.info(LazyLogMessage({"method": "TimeSeriesSync.sync", "action": f"{reason}_detected",
+                                         "event": {k: v for k, v in event.items() if k != "apikey"}}))
+            return self.__fetch_full__(key, event)
+
+        merged = merge_history(history, compact)
+        self.__store__.put(key, merged)
+
+        return Quote.model_validate(merged)
+
+    def get_metrics(self) -> dict:
+        """How many full and compact requests were made and why full histories were fetched again"""
+        with self.__metrics_lock__:
+            return dict(self.__metrics__)
+
+    def __get_refetch_reason__(self, function: str, history_series: dict, compact_series: dict) -> Optional[str]:
+        newest_stored = next(iter(history_series))
+        if min(compact_series) > newest_stored:
+            return "gap"
+        compared_field = "5. adjusted close" if function in ADJUSTED_FUNCTIONS else "4. close"
+        for date, bar in compact_series.items():
+            if date > newest_stored:
+                if function in ADJUSTED_FUNCTIONS and has_corporate_action(bar):
+                    return "adjustment"
+            elif date < newest_stored and date in history_series \
+                    and history_series[date].get(compared_field) != bar.get(compared_field):
+                return "adjustment"
+        return None
+
+    def __fetch_full__(self, key: RequestKey, event: dict) -> Quote:
+        full = self.__fetch__(event, "full")
+        self.__count__("full")
+        if full.get("success"):
+            self.__store__.put(key, full)
+        return Quote.model_validate(full)
+
+    def __fetch__(self, event: dict, output_size: str) -> dict:
+        return self.__client__.get_data_from_alpha_vantage({**event, "outputsize": output_size},
+                                                          self.__client__.__retry__)
+
+    def __get_history_key__(self, event: dict) -> RequestKey:
+        # namespaced, so a store shared with the client's cache never mistakes a history for a compact response
+        return RequestKey({**{k: v for k, v in event.items() if k != "outputsize"}, "history": "full"})
+
+    def __count__(self, name: str):
+        with self.__metrics_lock__:
+            self.__metrics__[name] += 1
+
+
+def get_series(response: dict) -> dict:
+    """The date -> bar part of a time series response, newest first"""
+    for key, value in response.items():
+        if key.startswith("Time Series"):
+            return value
+    return {}
+
+
+def has_corporate_action(bar: dict) -> bool:
+    return float(bar.get("7. dividend amount", 0) or 0) != 0 or float(bar.get("8. split coefficient", 1) or 1) != 1
+
+
+def merge_history(history: dict, compact: dict) -> dict:
+    """The compact response with its bars followed by the older stored bars. The newest stored bar is replaced"""
+    series_key = next(key for key in compact if key.startswith("Time Series"))
+    compact_series, history_series = compact[series_key], get_series(history)
+    merged_series = dict(compact_series)
+    for date, bar in history_series.items():
+        if date not in merged_series:
+            merged_series[date] = bar
+    merged = {**compact, series_key: merged_series}
+    meta_data = merged.get("Meta Data")
+    if meta_data is not None:
+        merged["Meta Data"] = {k: "Full size" if k.endswith("Output Size") else v for k, v in meta_data.items()}
+
+    return merged
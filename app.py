@@ -122,6 +122,16 @@ def sample_retry_when_limit_reached():
     client.clear_cache()  # when you are done making calls, clear cache
 
 
+def sample_global_quotes_batch():
+    client = AlphavantageClient().use_simple_cache().with_rate_limit(calls_per_minute=5)
+    symbols = ["TSLA", "F", "C", "WFC", "ZIM", "PXD", "PXD", "POOL", "INTC", "INTU", "AAPL"]
+    for item in client.get_global_quotes(symbols):  # results come back as they complete
+        if not item.success:
+            print(f"symbol: {item.get_symbol()}, failed: {item.error or item.result.error_message}")
+            continue
+        print(f"symbol: {item.result.symbol}, Price: {item.result.get_price()}")
+
+
 def sample_ticker_usage():
     """
     combine all financial statements (income, cash flow, earnings and balance sheet) for both
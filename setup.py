@@ -39,5 +39,7 @@ setup(
     py_modules=["alphavantage_api_client"],
     include_package_data=True,
     install_requires=["requests","pydantic"],
+    extras_require={"fast": ["orjson"], "columnar": ["numpy"], "pandas": ["numpy", "pandas"],
+                    "arrow": ["numpy", "pyarrow"]},
     python_requires=">=3.9"
 )
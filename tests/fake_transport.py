@@ -0,0 +1,179 @@
+import json
+import threading
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from requests.adapters import BaseAdapter
+
+
+class FakeAlphavantageAdapter(BaseAdapter):
+    """
+    Transport adapter that answers alpha vantage urls from canned payloads so the client can be unit tested
+    without network access. Mount it on the client session with ``use_fake_transport(client, adapter)``.
+    """
+
+    def __init__(self, payloads: dict = None, default_payload=None, delay: float = 0):
+        super().__init__()
+        self.payloads = payloads or {}
+        self.default_payload = default_payload if default_payload is not None else {}
+        self.delay = delay
+        self.requests = []
+        self.__lock__ = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        params = {k: v[0] for k, v in parse_qs(urlparse(request.url).query).items()}
+        with self.__lock__:
+            self.requests.append({"params": params, "timeout": timeout, "headers": dict(request.headers)})
+        if self.delay:
+            threading.Event().wait(self.delay)
+        payload = self.payloads.get(params.get("function"), self.default_payload)
+        if callable(payload):
+            payload = payload(params)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        if isinstance(payload, str):
+            response._content = payload.encode("utf-8")
+            response.headers["content-type"] = "application/x-download"
+        else:
+            response._content = json.dumps(payload).encode("utf-8")
+            response.headers["content-type"] = "application/json"
+        response.encoding = "utf-8"
+
+        return response
+
+    def close(self):
+        pass
+
+    @property
+    def call_count(self) -> int:
+        return len(self.requests)
+
+
+def use_fake_transport(client, adapter: FakeAlphavantageAdapter):
+    session = client.__get_session__()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return adapter
+
+
+def global_quote_payload(params: dict) -> dict:
+    symbol = params.get("symbol", "").upper()
+    return {
+        "Global Quote": {
+            "01. symbol": symbol,
+            "02. open": "100.0000",
+            "03. high": "110.0000",
+            "04. low": "90.0000",
+            "05. price": "105.0000",
+            "06. volume": "1000",
+            "07. latest trading day": "2023-06-23",
+            "08. previous close": "100.0000",
+            "09. change": "5.0000",
+            "10. change percent": "5.0000%"
+        }
+    }
+
+
+def daily_adjusted_payload(symbol: str = "TSLA", days: int = 100, start: str = "2023-01-02") -> dict:
+    """Build a TIME_SERIES_DAILY_ADJUSTED response with ``days`` consecutive calendar days, newest first"""
+    import datetime
+    first = datetime.date.fromisoformat(start)
+    series = {}
+    for offset in reversed(range(days)):
+        day = first + datetime.timedelta(days=offset)
+        close = 100 + offset * 0.5 + (offset % 7)
+        series[day.isoformat()] = {
+            "1. open": f"{close - 1:.4f}",
+            "2. high": f"{close + 2:.4f}",
+            "3. low": f"{close - 2:.4f}",
+            "4. close": f"{close:.4f}",
+            "5. adjusted close": f"{close:.4f}",
+            "6. volume": str(1000 + offset * 10),
+            "7. dividend amount": "0.0000",
+            "8. split coefficient": "1.0"
+        }
+    return {
+        "Meta Data": {
+            "1. Information": "Daily Time Series with Splits and Dividend Events",
+            "2. Symbol": symbol,
+            "3. Last Refreshed": (first + datetime.timedelta(days=days - 1)).isoformat(),
+            "4. Output Size": "Compact",
+            "5. Time Zone": "US/Eastern"
+        },
+        "Time Series (Daily)": series
+    }
+
+
+def intraday_payload(symbol: str = "TSLA", bars: int = 100, interval: str = "1min",
+                     start: str = "2023-01-02 04:00:00") -> dict:
+    """Build a TIME_SERIES_INTRADAY response with ``bars`` consecutive one minute bars, newest first"""
+    import datetime
+    first = datetime.datetime.fromisoformat(start)
+    series = {}
+    for offset in reversed(range(bars)):
+        close = 100 + (offset % 390) * 0.01
+        series[(first + datetime.timedelta(minutes=offset)).isoformat(sep=" ")] = {
+            "1. open": f"{close - 0.01:.4f}",
+            "2. high": f"{close + 0.02:.4f}",
+            "3. low": f"{close - 0.02:.4f}",
+            "4. close": f"{close:.4f}",
+            "5. volume": str(100 + offset % 1000)
+        }
+    return {
+        "Meta Data": {
+            "1. Information": f"Intraday ({interval}) open, high, low, close prices and volume",
+            "2. Symbol": symbol,
+            "3. Last Refreshed": (first + datetime.timedelta(minutes=bars - 1)).isoformat(sep=" "),
+            "4. Interval": interval,
+            "5. Output Size": "Full size",
+            "6. Time Zone": "US/Eastern"
+        },
+        f"Time Series ({interval})": series
+    }
+
+
+def bulk_quotes_payload(params: dict) -> dict:
+    """Build a REALTIME_BULK_QUOTES response for the comma separated symbols of the request"""
+    symbols = [symbol for symbol in params.get("symbol", "").upper().split(",") if symbol]
+    return {
+        "endpoint": "Realtime Bulk Quotes",
+        "message": "",
+        "data": [{
+            "symbol": symbol,
+            "timestamp": "2023-06-23 16:15:47.000",
+            "open": "100.0000",
+            "high": "110.0000",
+            "low": "90.0000",
+            "close": "105.0000",
+            "volume": "1000",
+            "previous_close": "100.0000",
+            "change": "5.0000",
+            "change_percent": "5.0000",
+            "extended_hours_quote": "105.5000"
+        } for symbol in symbols]
+    }
+
+
+def accounting_report_payload(params: dict, years: int = 2) -> dict:
+    """Build a BALANCE_SHEET, INCOME_STATEMENT, CASH_FLOW or EARNINGS response with ``years`` annual reports and
+    four quarterly reports per year, newest first"""
+    symbol = params.get("symbol", "").upper()
+    seed = sum(ord(character) for character in symbol)
+    annual, quarterly = [], []
+    for year in reversed(range(2023 - years, 2023)):
+        annual.append({"fiscalDateEnding": f"{year}-12-31", "reportedCurrency": "USD",
+                       "total": str(seed * 1000 + year), "other": "None"})
+        for quarter, month_end in reversed(list(enumerate(("03-31", "06-30", "09-30", "12-31")))):
+            quarterly.append({"fiscalDateEnding": f"{year}-{month_end}", "reportedCurrency": "USD",
+                              "total": str(seed * 100 + year + quarter), "other": "None"})
+    if params.get("function") == "EARNINGS":
+        return {"symbol": symbol,
+                "annualEarnings": [{"fiscalDateEnding": report["fiscalDateEnding"], "reportedEPS": "4.07"}
+                                   for report in annual],
+                "quarterlyEarnings": [{"fiscalDateEnding": report["fiscalDateEnding"], "reportedDate": "2023-04-19",
+                                       "reportedEPS": "0.85", "surprisePercentage": "-1.2"} for report in quarterly]}
+    return {"symbol": symbol, "annualReports": annual, "quarterlyReports": quarterly}
@@ -4,8 +4,8 @@ import requests
 import os
 import configparser
 from alphavantage_api_client import ValidationRuleChecks, AlphavantageClient
+from alphavantage_api_client.api_request import ApiRequest
 import json
-import copy
 import logging
 
 
@@ -27,11 +27,13 @@ class MockAlphavantageClient(AlphavantageClient):
         self.load_cache_from_disk()
 
     def load_cache_from_disk(self):
-        self.use_simple_cache()
         with open(f"{self.base_path}/mock_data.json",'r') as file:
             json_string = file.read()
         cache = json.loads(json_string)
-        self.__cache__ = cache
+        self.use_simple_cache(max_cache_size=max(len(cache), 1))
+        for hash_str in cache:
+            # keys on disk are the serialized events, re-key them the way this client builds cache keys
+            self.__cache__.put(ApiRequest(json.loads(hash_str)).get_cache_key(), cache[hash_str])
 
     def get_data_from_alpha_vantage(self, event: dict, should_retry: bool = False) -> dict:
         """
@@ -45,22 +47,18 @@ class MockAlphavantageClient(AlphavantageClient):
             :rtype: dict
 
         """
-        # validate api key and insert into the request if needed
+        # validate api key and freeze the request
         checks = ValidationRuleChecks().from_customer_request(event)
-        self.__validate_api_key__(checks, event)
-
-        # create a version of the event without api key
-        loggable_event = copy.deepcopy(event)
-        loggable_event.pop("apikey")
+        request = event if isinstance(event, ApiRequest) else ApiRequest(event, self.__validate_api_key__(checks, event))
 
         # check cache if allowed
         if self.__use_cache__:
-            results = self.__get_item_from_cache__(loggable_event)
+            results = self.__get_item_from_cache__(request)
             logging.info(f"Found item in cache: {results}")
             if results is not None:
                 logging.info(json.dumps({"method": "mock.get_data_from_alpha_vantage"
                                             , "action": "return_value", "data": results,
-                                         "event": loggable_event}))
+                                         "event": request.to_dict()}))
                 return results
         json_response = dict()
         json_response["success"] = False
@@ -0,0 +1,109 @@
+import copy
+import logging
+import time
+import pytest
+from alphavantage_api_client import AlphavantageClient, AccountingReport
+import json
+from alphavantage_api_client.api_request import ApiRequest, RequestKey
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, global_quote_payload
+
+
+@pytest.mark.unit
+def test_request_is_immutable_and_hides_api_key():
+    request = ApiRequest({"function": "GLOBAL_QUOTE", "symbol": "TSLA", "apikey": "secret", "cache_ttl": 5})
+    assert request.get_api_key() == "secret" and request.get_cache_ttl() == 5
+    assert "apikey" not in request and "secret" not in str(request.get_cache_key())
+    assert request.to_dict() == {"function": "GLOBAL_QUOTE", "symbol": "TSLA"}
+    with pytest.raises(AttributeError):
+        request.symbol = "F"
+    with pytest.raises(TypeError):
+        request.get_params()["symbol"] = "F"
+
+
+@pytest.mark.unit
+def test_requests_are_hashable():
+    first = ApiRequest({"symbol": "TSLA", "function": "GLOBAL_QUOTE"}, "key one")
+    second = ApiRequest({"function": "GLOBAL_QUOTE", "symbol": "TSLA"}, "key two")
+    assert first == second and hash(first) == hash(second)
+    assert len({first, second}) == 1
+
+
+@pytest.mark.unit
+def test_equivalent_requests_share_a_key():
+    key = RequestKey({"symbol": "tsla", "function": "GLOBAL_QUOTE", "apikey": "secret"})
+    assert key == RequestKey({"function": "GLOBAL_QUOTE", "symbol": " TSLA", "datatype": "json"})
+    assert hash(key) == hash(RequestKey({"symbol": "TSLA", "function": "GLOBAL_QUOTE", "outputsize": "compact"}))
+    assert RequestKey({"function": "SMA", "time_period": 10}) == RequestKey({"function": "SMA", "time_period": "10"})
+    assert key != RequestKey({"symbol": "TSLA", "function": "GLOBAL_QUOTE", "datatype": "csv"})
+    assert key != RequestKey({"symbol": "F", "function": "GLOBAL_QUOTE"})
+    assert json.loads(str(key))["symbol"] == "TSLA"
+
+
+@pytest.mark.unit
+def test_equivalent_requests_hit_the_cache():
+    client = AlphavantageClient().with_api_key("demo").use_simple_cache()
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+    first = client.get_data_from_alpha_vantage({"function": "GLOBAL_QUOTE", "symbol": "TSLA"})
+    second = client.get_data_from_alpha_vantage({"function": "GLOBAL_QUOTE", "symbol": "tsla", "datatype": "json"})
+    assert adapter.call_count == 1
+    assert first["symbol"] == "TSLA" and second["symbol"] == "tsla", "Each caller gets the symbol it asked for"
+    assert first["Global Quote"] is second["Global Quote"], "The cached response should not be copied"
+    assert client.get_internal_metrics()["cache"]["hits"] == 1
+
+
+@pytest.mark.unit
+def test_caller_event_is_not_modified():
+    client = AlphavantageClient().with_api_key("demo").use_simple_cache()
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+    event = {"function": "GLOBAL_QUOTE", "symbol": "TSLA", "cache_ttl": 30}
+    assert client.get_data_from_alpha_vantage(event)["success"]
+    assert event == {"function": "GLOBAL_QUOTE", "symbol": "TSLA", "cache_ttl": 30}
+    assert adapter.requests[0]["params"] == {"function": "GLOBAL_QUOTE", "symbol": "TSLA", "apikey": "demo"}
+
+
+@pytest.mark.unit
+def test_accounting_report_does_not_modify_its_input():
+    values = {"symbol": "TSLA", "success": True, "limit_reached": False, "status_code": 200,
+              "annualEarnings": [{"fiscalDateEnding": "2022-12-31"}], "quarterlyEarnings": []}
+    report = AccountingReport.model_validate(values)
+    assert len(report.annualReports) == 1
+    assert "annualEarnings" in values and "annualReports" not in values
+
+
+@pytest.mark.benchmark
+def test_per_call_overhead_benchmark():
+    client = AlphavantageClient().with_api_key("demo").use_simple_cache()
+    use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+    event = {"function": "GLOBAL_QUOTE", "symbol": "TSLA", "datatype": "json"}
+    client.get_data_from_alpha_vantage(event)
+    rounds = 20000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        copy.deepcopy(event)
+    deepcopy_seconds = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ApiRequest(event, "demo")
+    request_seconds = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        client.get_data_from_alpha_vantage(event)
+    cache_hit_seconds = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hash(json.dumps(event, sort_keys=True))
+    json_key_seconds = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hash(RequestKey(event))
+    request_key_seconds = (time.perf_counter() - start) / rounds
+
+    logging.warning(f"per call: deepcopy of the event {deepcopy_seconds * 1e6:.2f} us, "
+                    f"ApiRequest {request_seconds * 1e6:.2f} us, cached call {cache_hit_seconds * 1e6:.2f} us, "
+                    f"json cache key {json_key_seconds * 1e6:.2f} us, RequestKey {request_key_seconds * 1e6:.2f} us")
+    assert cache_hit_seconds < 0.001
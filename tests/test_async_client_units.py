@@ -0,0 +1,50 @@
+import asyncio
+import inspect
+import time
+import pytest
+import logging
+from alphavantage_api_client import AlphavantageClient, AsyncAlphavantageClient, GlobalQuote
+from alphavantage_api_client.async_client import get_end_point_names
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, global_quote_payload
+
+
+class TestAsyncClient:
+
+    @pytest.mark.unit
+    def test_mirrors_every_end_point(self):
+        for name in get_end_point_names():
+            method = getattr(AsyncAlphavantageClient, name)
+            assert inspect.iscoroutinefunction(method), f"{name} should be awaitable"
+            assert method.__doc__ == getattr(AlphavantageClient, name).__doc__, f"{name} should keep its docs"
+        assert "get_intraday_quote" in get_end_point_names()
+        assert "get_internal_metrics" not in get_end_point_names()
+
+    @pytest.mark.unit
+    def test_pool_fits_the_concurrency(self, caplog):
+        with caplog.at_level(logging.WARNING):
+            owned = AsyncAlphavantageClient(max_concurrency=32)
+            AsyncAlphavantageClient(AlphavantageClient().with_connection_pool(pool_maxsize=32), max_concurrency=32)
+        assert owned.get_client().__pool_maxsize__ == 32 and "pool_too_small" not in caplog.text
+        with caplog.at_level(logging.WARNING):
+            AsyncAlphavantageClient(AlphavantageClient(), max_concurrency=32)
+        assert "pool_too_small" in caplog.text, "a pool smaller than the concurrency should be reported"
+
+    @pytest.mark.unit
+    def test_requests_run_concurrently(self):
+        client = AlphavantageClient().with_api_key("demo").with_connection_pool(pool_maxsize=10)
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload},
+                                                                     delay=0.2))
+        symbols = [f"SYM{index}" for index in range(10)]
+
+        async def scan():
+            async with AsyncAlphavantageClient(client, max_concurrency=10) as async_client:
+                return await asyncio.gather(*[async_client.get_global_quote(symbol) for symbol in symbols])
+
+        start = time.perf_counter()
+        quotes = asyncio.run(scan())
+        elapsed = time.perf_counter() - start
+        assert adapter.call_count == len(symbols)
+        assert all(isinstance(quote, GlobalQuote) and quote.success for quote in quotes)
+        assert [quote.symbol for quote in quotes] == symbols, "Results should line up with the requests"
+        assert elapsed < 1, f"10 requests of 0.2s should overlap but took {elapsed:.2f}s"
+        logging.warning(f" 10 async requests completed in {elapsed:.2f}s")
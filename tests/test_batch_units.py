@@ -0,0 +1,112 @@
+import asyncio
+import itertools
+import time
+import pytest
+from alphavantage_api_client import AlphavantageClient, AsyncAlphavantageClient, BatchResult, GlobalQuote
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, global_quote_payload, bulk_quotes_payload
+
+
+def flaky_global_quote_payload(params: dict) -> dict:
+    symbol = params.get("symbol", "").upper()
+    if symbol == "BOOM":
+        raise ConnectionError("connection reset")
+    if symbol == "NOPE":
+        return {"Error Message": "Invalid API call"}
+    return global_quote_payload(params)
+
+
+def create_client(delay: float = 0):
+    client = AlphavantageClient().with_api_key("demo").with_connection_pool(pool_maxsize=10)
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": flaky_global_quote_payload},
+                                                                 delay=delay))
+    return client, adapter
+
+
+@pytest.mark.unit
+def test_global_quotes_run_concurrently():
+    client, adapter = create_client(delay=0.2)
+    symbols = [f"SYM{index}" for index in range(20)]
+    start = time.perf_counter()
+    results = list(client.get_global_quotes(symbols))
+    elapsed = time.perf_counter() - start
+    assert adapter.call_count == 20 and all(isinstance(item, BatchResult) and item.success for item in results)
+    assert sorted(item.get_symbol() for item in results) == sorted(symbols)
+    assert client.get_internal_metrics()["total_calls"] == 20, "calls made from every worker should be counted"
+    assert all(item.result.symbol == item.get_symbol() for item in results)
+    assert elapsed < 1.5, f"20 calls of 0.2s on 10 workers should take about 0.4s but took {elapsed:.2f}s"
+
+
+@pytest.mark.unit
+def test_failures_are_reported_per_symbol():
+    client, _ = create_client()
+    results = {item.get_symbol(): item for item in client.get_global_quotes(["TSLA", "BOOM", "NOPE", "F"])}
+    assert results["TSLA"].success and results["F"].success
+    assert not results["BOOM"].success and isinstance(results["BOOM"].error, ConnectionError)
+    assert not results["NOPE"].success and results["NOPE"].error is None
+    assert isinstance(results["NOPE"].result, GlobalQuote) and not results["NOPE"].result.success
+
+
+@pytest.mark.unit
+def test_map_pulls_events_lazily():
+    client, adapter = create_client()
+    events = ({"symbol": f"SYM{index}"} for index in itertools.count())
+    results = client.map(client.get_global_quote, events, max_workers=2)
+    first = [next(results) for _ in range(3)]
+    results.close()
+    assert all(item.success for item in first)
+    assert adapter.call_count <= 3 + 2 * 2, "only a bounded number of calls should be submitted ahead"
+
+
+@pytest.mark.unit
+def test_map_goes_through_the_rate_limiter():
+    client, adapter = create_client()
+    client.with_rate_limit(calls_per_minute=6000, burst=1)
+    assert len(list(client.map(client.get_global_quote, ["A", "B", "C", "D"]))) == 4
+    assert client.get_internal_metrics()["rate_limiter"]["acquired"] == 4
+
+
+@pytest.mark.unit
+def test_async_global_quotes():
+    client, adapter = create_client(delay=0.1)
+
+    async def scan():
+        async with AsyncAlphavantageClient(client, max_concurrency=10) as async_client:
+            return [item async for item in async_client.get_global_quotes(["TSLA", "BOOM", "F", "C"])]
+
+    results = {item.get_symbol(): item for item in asyncio.run(scan())}
+    assert set(results) == {"TSLA", "BOOM", "F", "C"} and adapter.call_count == 4
+    assert isinstance(results["BOOM"].error, ConnectionError)
+    assert all(results[symbol].success for symbol in ("TSLA", "F", "C"))
+
+
+@pytest.mark.unit
+def test_bulk_quotes_are_chunked():
+    client = AlphavantageClient().with_api_key("demo")
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({"REALTIME_BULK_QUOTES": bulk_quotes_payload}))
+    symbols = [f"sym{index}" for index in range(250)] + ["SYM0"]
+    quotes = client.get_realtime_bulk_quotes(symbols)
+    assert adapter.call_count == 3
+    assert sorted(len(request["params"]["symbol"].split(",")) for request in adapter.requests) == [50, 100, 100]
+    assert list(quotes) == [symbol.upper() for symbol in symbols[:250]], "one quote per symbol, in order"
+    quote = quotes["SYM42"]
+    assert isinstance(quote, GlobalQuote) and quote.success and quote.symbol == "SYM42"
+    assert quote.get_price() == "105.0000" and quote.get_change_percent() == "5.0000%"
+    assert quote.get_latest_trading_day() == "2023-06-23" and quote.data["extended_hours_quote"] == "105.5000"
+
+
+@pytest.mark.unit
+def test_bulk_quotes_report_missing_symbols():
+    def payload(params: dict) -> dict:
+        if "BOOM" in params["symbol"]:
+            return {"Error Message": "Invalid API call"}
+        response = bulk_quotes_payload(params)
+        return {**response, "data": [item for item in response["data"] if item["symbol"] != "GONE"]}
+
+    client = AlphavantageClient().with_api_key("demo")
+    use_fake_transport(client, FakeAlphavantageAdapter({"REALTIME_BULK_QUOTES": payload}))
+    symbols = [f"SYM{index}" for index in range(99)] + ["GONE", "BOOM", "TSLA"]
+    quotes = client.get_realtime_bulk_quotes(",".join(symbols))
+    assert len(quotes) == 102 and quotes["SYM0"].success
+    assert not quotes["GONE"].success and "GONE" in quotes["GONE"].error_message
+    assert not quotes["BOOM"].success and not quotes["TSLA"].success, "the whole failed chunk should be reported"
+    assert quotes["TSLA"].error_message
@@ -0,0 +1,148 @@
+import datetime
+import multiprocessing
+import time
+import pytest
+import logging
+from alphavantage_api_client import AlphavantageClient
+from alphavantage_api_client.cache import LruCache, SqliteCache, CacheTtlPolicy, seconds_until_end_of_day, \
+    seconds_until_end_of_week, seconds_until_end_of_month
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, global_quote_payload
+
+
+class TestLruCache:
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        cache = LruCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # a is now the most recently used
+        cache.put("c", 3)
+        assert cache.get("b") is None, "b should have been evicted"
+        assert cache.get("a") == 1 and cache.get("c") == 3, "Working set should survive eviction"
+        metrics = cache.get_metrics()
+        assert metrics["evictions"] == 1 and metrics["size"] == 2
+        assert metrics["hits"] == 3 and metrics["misses"] == 1
+
+    @pytest.mark.unit
+    def test_entries_expire(self):
+        cache = LruCache(max_size=10, ttl=0.05)
+        cache.put("quote", 1)
+        cache.put("fundamentals", 2, ttl=60)
+        time.sleep(0.1)
+        assert cache.get("quote") is None, "quote should have expired"
+        assert cache.get("fundamentals") == 2, "per entry ttl should override the cache ttl"
+        assert cache.get_metrics()["expirations"] == 1
+
+    @pytest.mark.unit
+    def test_client_reports_cache_metrics(self):
+        client = AlphavantageClient().with_api_key("demo").use_simple_cache(max_cache_size=2)
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        for symbol in ["TSLA", "TSLA", "F", "C", "TSLA"]:
+            assert client.get_global_quote(symbol).success
+        metrics = client.get_internal_metrics()["cache"]
+        assert adapter.call_count == 4, f"Only the repeated TSLA should come from the cache {adapter.call_count}"
+        assert metrics["hits"] == 1 and metrics["misses"] == 4 and metrics["evictions"] == 2, f"{metrics}"
+        logging.warning(f" cache metrics {metrics}")
+
+
+class TestCacheTtlPolicy:
+
+    @pytest.mark.unit
+    def test_ttl_depends_on_function_and_interval(self):
+        policy = CacheTtlPolicy()
+        assert policy.get_ttl({"function": "GLOBAL_QUOTE"}) == 60
+        assert policy.get_ttl({"function": "TIME_SERIES_INTRADAY", "interval": "5min"}) == 300
+        assert policy.get_ttl({"function": "RSI", "interval": "15min"}) == 900, "indicators should use the interval"
+        assert policy.get_ttl({"function": "INCOME_STATEMENT"}) == 7 * 24 * 3600
+        assert 0 < policy.get_ttl({"function": "TIME_SERIES_MONTHLY"}) <= 31 * 24 * 3600
+        assert policy.get_ttl({"function": "SOMETHING_NEW"}) is None
+        assert CacheTtlPolicy({"GLOBAL_QUOTE": 5}).get_ttl({"function": "GLOBAL_QUOTE"}) == 5
+
+    @pytest.mark.unit
+    def test_end_of_period_boundaries(self):
+        now = datetime.datetime(2023, 12, 31, 12, 0, tzinfo=datetime.timezone.utc)  # a sunday
+        assert seconds_until_end_of_day(now) == 12 * 3600
+        assert seconds_until_end_of_week(now) == 12 * 3600
+        assert seconds_until_end_of_month(now) == 12 * 3600
+
+    @pytest.mark.unit
+    def test_per_call_override_is_not_sent(self):
+        client = AlphavantageClient().with_api_key("demo").use_simple_cache()
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        assert client.get_global_quote({"symbol": "TSLA", "cache_ttl": 0.05}).success
+        assert "cache_ttl" not in adapter.requests[0]["params"], "cache_ttl must not be sent to the api"
+        time.sleep(0.1)
+        assert client.get_global_quote({"symbol": "TSLA"}).success
+        assert adapter.call_count == 2, "The overridden ttl should have expired the first response"
+
+
+def write_to_shared_cache(path: str, worker: int):
+    cache = SqliteCache(path, max_size=1000)
+    for index in range(50):
+        cache.put(f"{worker}-{index}", {"worker": worker, "index": index})
+
+
+class TestSqliteCache:
+
+    @pytest.mark.unit
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        client = AlphavantageClient().with_api_key("demo").use_persistent_cache(path)
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        assert client.get_global_quote("TSLA").success
+        client.close()
+
+        restarted = AlphavantageClient().with_api_key("demo").use_persistent_cache(path)
+        restarted_adapter = use_fake_transport(restarted, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        global_quote = restarted.get_global_quote("TSLA")
+        assert global_quote.success and global_quote.get_price() == "105.0000"
+        assert adapter.call_count == 1 and restarted_adapter.call_count == 0, "Restarted client should use the disk"
+        assert restarted.get_internal_metrics()["cache"]["hits"] == 1
+
+    @pytest.mark.unit
+    def test_failures_are_not_persisted(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        failures = {"BALANCE_SHEET": {"Information": "Thank you for using Alpha Vantage! Our standard API rate limit "
+                                                     "is 25 requests per day."},
+                    "GLOBAL_QUOTE": {"Error Message": "Invalid API call."}}
+        client = AlphavantageClient().with_api_key("demo").use_persistent_cache(path)
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter(failures))
+        assert not client.get_balance_sheet("TSLA").success and not client.get_global_quote("TSLA").success
+        assert not client.get_balance_sheet("TSLA").success and adapter.call_count == 3, "failures should be retried"
+        client.close()
+
+        restarted = AlphavantageClient().with_api_key("demo").use_persistent_cache(path)
+        restarted_adapter = use_fake_transport(restarted, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        assert restarted.get_global_quote("TSLA").success and restarted_adapter.call_count == 1
+
+    @pytest.mark.unit
+    def test_size_limits_and_ttl(self, tmp_path):
+        cache = SqliteCache(str(tmp_path / "cache.sqlite"), max_size=2)
+        cache.put("a", {"value": 1})
+        cache.put("b", {"value": 2})
+        assert cache.get("a") == {"value": 1}
+        cache.put("c", {"value": 3})
+        assert "b" not in cache, "Least recently used entry should be evicted"
+        assert len(cache) == 2
+        cache.put("d", {"value": 4}, ttl=-1)
+        assert cache.get("d") is None, "Expired entries should be misses"
+
+        limited = SqliteCache(str(tmp_path / "limited.sqlite"), max_size=100, max_bytes=200)
+        for index in range(20):
+            limited.put(str(index), {"payload": "x" * 50, "index": index})
+        assert limited.get_metrics()["bytes"] <= 200
+
+    @pytest.mark.unit
+    def test_concurrent_processes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        SqliteCache(path)
+        workers = [multiprocessing.Process(target=write_to_shared_cache, args=(path, worker)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+        assert all(worker.exitcode == 0 for worker in workers)
+        cache = SqliteCache(path)
+        assert len(cache) == 200
+        assert cache.get("3-49") == {"worker": 3, "index": 49}
@@ -0,0 +1,152 @@
+import pytest
+from alphavantage_api_client import Quote, CurrencyQuote, ColumnarStore, IndicatorEngine
+from .fake_transport import daily_adjusted_payload, intraday_payload
+
+pa = pytest.importorskip("pyarrow")
+
+DAILY = {"function": "TIME_SERIES_DAILY_ADJUSTED", "symbol": "tsla", "outputsize": "full"}
+
+
+def make_quote(payload: dict, symbol: str = "TSLA") -> Quote:
+    return Quote.model_validate({**payload, "success": True, "limit_reached": False, "status_code": 200,
+                                 "symbol": symbol})
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("format", ["parquet", "feather"])
+def test_round_trip(tmp_path, format):
+    store = ColumnarStore(str(tmp_path), format=format)
+    quote = make_quote(daily_adjusted_payload("TSLA", days=250))
+    assert store.append(DAILY, quote) == 250
+    assert store.get_path(DAILY).endswith(f"function=TIME_SERIES_DAILY_ADJUSTED/interval=daily/symbol=TSLA/"
+                                          f"{'data.parquet' if format == 'parquet' else 'data.arrow'}")
+    stored = store.read_quote(DAILY)
+    assert isinstance(stored, Quote) and stored.symbol == "TSLA" and stored.success
+    assert stored.data == quote.data and list(stored.data) == list(quote.data), "should read back as fetched"
+    assert stored.meta_data == quote.meta_data
+
+
+@pytest.mark.unit
+def test_intraday_and_currency_round_trip(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    event = {"function": "TIME_SERIES_INTRADAY", "symbol": "TSLA", "interval": "1min"}
+    intraday = make_quote(intraday_payload("TSLA", bars=500))
+    store.append(event, intraday)
+    assert store.read_quote(event).data == intraday.data
+    payload = daily_adjusted_payload(days=20)
+    series = {date: {"1. open": bar["1. open"], "4. close": bar["4. close"]}
+              for date, bar in payload["Time Series (Daily)"].items()}
+    fx = CurrencyQuote.model_validate({"success": True, "limit_reached": False, "status_code": 200,
+                                       "Meta Data": {"2. From Symbol": "EUR"}, "Time Series FX (Daily)": series})
+    fx_event = {"function": "FX_DAILY", "from_symbol": "EUR", "to_symbol": "USD"}
+    store.append(fx_event, fx)
+    assert "symbol=EUR-USD" in store.get_path(fx_event)
+    stored = store.read_quote(fx_event)
+    assert isinstance(stored, CurrencyQuote) and stored.data == series
+    crypto = {date: {"1a. open (USD)": bar["1. open"], "1b. open (USD)": bar["4. close"]} for date, bar in series.items()}
+    crypto_event = {"function": "DIGITAL_CURRENCY_DAILY", "symbol": "BTC", "market": "USD"}
+    store.append(crypto_event, CurrencyQuote.model_validate({"success": True, "limit_reached": False,
+                                                             "status_code": 200,
+                                                             "Time Series (Digital Currency Daily)": crypto}))
+    assert store.read_quote(crypto_event).data == crypto, "fields sharing a name should both be stored"
+
+
+@pytest.mark.unit
+def test_append_replaces_and_extends(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    store.append(DAILY, make_quote(daily_adjusted_payload(days=100)))
+    newer = daily_adjusted_payload(days=110)
+    newest_date = next(iter(newer["Time Series (Daily)"]))
+    newer["Time Series (Daily)"]["2023-01-02"]["4. close"] = "1.0000"
+    latest = make_quote({**newer, "Time Series (Daily)": dict(list(newer["Time Series (Daily)"].items())[:20])})
+    assert store.append(DAILY, latest) == 110
+    stored = store.read_quote(DAILY)
+    assert next(iter(stored.data)) == newest_date and stored.data["2023-01-02"]["4. close"] != "1.0000"
+    whole = make_quote(newer)
+    store.append(DAILY, whole)
+    assert store.read_quote(DAILY).data["2023-01-02"]["4. close"] == "1.0000", "stored bars should be replaced"
+
+
+@pytest.mark.unit
+def test_date_range_and_columns(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    store.append(DAILY, make_quote(daily_adjusted_payload(days=365)))
+    table = store.read_table(DAILY, start="2023-03-01", end="2023-03-31", columns=["adjusted_close"])
+    assert table.column_names == ["date", "adjusted_close"] and table.num_rows == 31
+    quote = store.read_quote(DAILY, start="2023-12-01")
+    assert list(quote.data)[-1] == "2023-12-01" and len(quote.data) == 32
+    assert store.read_quote({**DAILY, "symbol": "MSFT"}) is None
+
+
+@pytest.mark.unit
+def test_scan_symbols(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    for symbol in ("TSLA", "MSFT", "AAPL"):
+        store.append({**DAILY, "symbol": symbol}, make_quote(daily_adjusted_payload(symbol, days=50), symbol))
+    assert store.get_symbols("TIME_SERIES_DAILY_ADJUSTED") == ["AAPL", "MSFT", "TSLA"]
+    table = store.scan("TIME_SERIES_DAILY_ADJUSTED", symbols=["msft", "tsla"], start="2023-02-01",
+                       columns=["close"])
+    assert table.column_names == ["symbol", "date", "close"]
+    assert sorted(set(table["symbol"].to_pylist())) == ["MSFT", "TSLA"] and table.num_rows == 2 * 20
+    assert store.scan("TIME_SERIES_WEEKLY") is None
+
+
+@pytest.mark.unit
+def test_memory_mapped_quote(tmp_path):
+    store = ColumnarStore(str(tmp_path), format="feather")
+    quote = make_quote(daily_adjusted_payload("TSLA", days=400))
+    store.append(DAILY, quote)
+    mapped = store.open_quote(DAILY)
+    columns = mapped.get_columns()
+    assert not columns["close"].flags.owndata and not columns["close"].flags.writeable, "columns should be mapped"
+    assert not columns.index.flags.owndata
+    assert mapped.symbol == "TSLA" and mapped.meta_data == quote.meta_data and len(mapped.data) == 400
+    assert list(mapped.data) == list(quote.data)
+    assert mapped.data["2023-03-01"] == quote.data["2023-03-01"]
+    assert dict(mapped.data) == quote.data
+    assert mapped.get_most_recent_value()["query_date"] == next(iter(quote.data))
+    sma = IndicatorEngine(mapped).get_sma({"time_period": 20})
+    assert sma.data == IndicatorEngine(quote).get_sma({"time_period": 20}).data
+    window = store.open_columns(DAILY, start="2023-03-01", end="2023-03-31")
+    assert len(window) == 31 and window.index[0] == columns.index[58]
+    assert mapped.model_dump_json() == quote.model_dump_json()
+    assert mapped.model_dump()["data"] == quote.data
+
+
+@pytest.mark.unit
+def test_memory_mapping_needs_feather(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    store.append(DAILY, make_quote(daily_adjusted_payload(days=10)))
+    with pytest.raises(ValueError):
+        store.open_quote(DAILY)
+    assert ColumnarStore(str(tmp_path), format="feather").open_columns(DAILY) is None
+
+
+def append_days(root: str, start: str) -> int:
+    return ColumnarStore(root).append(DAILY, make_quote(daily_adjusted_payload(days=28, start=start)))
+
+
+@pytest.mark.unit
+def test_appends_from_many_processes_keep_every_bar(tmp_path):
+    import concurrent.futures
+    import multiprocessing
+    starts = ["2023-01-01", "2023-02-01", "2023-03-01", "2023-04-01", "2023-05-01", "2023-06-01"]
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(starts), mp_context=context) as executor:
+        list(executor.map(append_days, [str(tmp_path)] * len(starts), starts))
+    store = ColumnarStore(str(tmp_path))
+    assert len(store.read_quote(DAILY).data) == 28 * len(starts), "no process should overwrite another's bars"
+    assert len(store.scan("TIME_SERIES_DAILY_ADJUSTED")) == 28 * len(starts)
+
+
+@pytest.mark.unit
+def test_decimals_are_the_most_any_bar_used(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    payload = daily_adjusted_payload(days=10)
+    series = payload["Time Series (Daily)"]
+    oldest = list(series)[-1]
+    series[oldest]["8. split coefficient"] = "1.25"
+    store.append(DAILY, make_quote(payload))
+    assert store.read_quote(DAILY).data[oldest]["8. split coefficient"] == "1.25"
+    store.append(DAILY, make_quote({**payload, "Time Series (Daily)": dict(list(series.items())[:2])}))
+    assert store.read_quote(DAILY).data[oldest]["8. split coefficient"] == "1.25", "stored decimals should be kept"
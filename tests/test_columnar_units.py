@@ -0,0 +1,149 @@
+import json
+import logging
+import time
+import tracemalloc
+import pytest
+from alphavantage_api_client import Quote, CurrencyQuote, Commodity, EconomicIndicator
+from .fake_transport import daily_adjusted_payload, intraday_payload
+
+np = pytest.importorskip("numpy")
+
+
+def make_quote(payload: dict) -> Quote:
+    return Quote.model_validate({**payload, "success": True, "limit_reached": False, "status_code": 200,
+                                 "symbol": "TSLA"})
+
+
+@pytest.mark.unit
+def test_daily_columns():
+    quote = make_quote(daily_adjusted_payload("TSLA", days=30))
+    columns = quote.get_columns()
+    assert len(columns) == 30 and quote.get_columns() is columns, "Columns should be built once"
+    assert columns.index.dtype == np.dtype("datetime64[s]")
+    assert np.all(np.diff(columns.index) > np.timedelta64(0, "s")), "Index should be sorted oldest first"
+    assert columns.index[0] == np.datetime64("2023-01-02")
+    assert columns["close"].dtype == np.float64 and columns["volume"].dtype == np.int64
+    newest = quote.data[next(iter(quote.data))]
+    assert columns["adjusted_close"][-1] == float(newest["5. adjusted close"])
+    assert columns["volume"][-1] == int(newest["6. volume"])
+    assert columns.get_memory_usage() == 30 * 8 * (len(columns.get_column_names()) + 1)
+
+
+@pytest.mark.unit
+def test_intraday_and_indicator_columns():
+    intraday = make_quote(intraday_payload("TSLA", bars=120)).get_columns()
+    assert intraday.index[1] - intraday.index[0] == np.timedelta64(60, "s")
+    assert intraday.get_column_names() == ["open", "high", "low", "close", "volume"]
+    indicator = make_quote({"Technical Analysis: SMA": {"2023-01-03": {"SMA": "2.5"}, "2023-01-02": {"SMA": "1.5"}}})
+    assert indicator.get_columns()["sma"].tolist() == [1.5, 2.5]
+
+
+@pytest.mark.unit
+def test_values_that_are_not_numbers():
+    quote = make_quote({"Time Series (Daily)": {"2023-01-03": {"1. open": "None", "4. close": "2.0"},
+                                                "2023-01-02": {"1. open": "1.0", "4. close": "1.0"}}})
+    quote.get_most_recent_value()  # adds a query_date field to the newest row
+    columns = quote.get_columns()
+    assert columns.get_column_names() == ["open", "close"]
+    assert np.isnan(columns["open"][1]) and columns["open"][0] == 1.0
+
+
+@pytest.mark.unit
+def test_currency_columns():
+    quote = CurrencyQuote.model_validate({"success": True, "limit_reached": False, "status_code": 200,
+                                          "Time Series FX (Daily)": {"2023-01-02": {"1. open": "1.07",
+                                                                                    "4. close": "1.06"}}})
+    assert quote.get_columns()["close"].tolist() == [1.06]
+    rate = CurrencyQuote.model_validate({"success": True, "limit_reached": False, "status_code": 200,
+                                         "Realtime Currency Exchange Rate": {"5. Exchange Rate": "1.07"}})
+    with pytest.raises(ValueError):
+        rate.get_columns()
+
+
+@pytest.mark.unit
+def test_fields_sharing_a_name_keep_their_number():
+    series = {"2023-01-02": {"1a. open (USD)": "1.07", "1b. open (USD)": "1.08", "4. close": "1.06"}}
+    quote = CurrencyQuote.model_validate({"success": True, "limit_reached": False, "status_code": 200,
+                                          "Time Series (Digital Currency Daily)": series})
+    columns = quote.get_columns()
+    assert columns.get_column_names() == ["1a_open_usd", "1b_open_usd", "close"]
+    assert columns["1a_open_usd"].tolist() == [1.07] and columns["1b_open_usd"].tolist() == [1.08]
+    series = {"2023-01-02": {"1. open": "1.07", "1. Open": "1.08"}}
+    with pytest.raises(ValueError):
+        CurrencyQuote.model_validate({"success": True, "limit_reached": False, "status_code": 200,
+                                      "Time Series FX (Daily)": series}).get_columns()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name,payload", [
+    ("full daily history", daily_adjusted_payload("TSLA", days=6000)),
+    ("full intraday month", intraday_payload("TSLA", bars=20000)),
+])
+def test_memory_benchmark(name, payload):
+    body = json.dumps(payload).encode("utf-8")
+    tracemalloc.start()
+    quote = make_quote(json.loads(body))
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    columns = quote.get_columns()
+    logging.warning(f"{name}: {len(columns)} rows, dict of dicts {dict_bytes / 1e6:.1f} MB, "
+                    f"columns {columns.get_memory_usage() / 1e6:.2f} MB")
+    assert columns.get_memory_usage() < dict_bytes
+
+
+@pytest.mark.unit
+def test_to_pandas():
+    pd = pytest.importorskip("pandas")
+    quote = make_quote(daily_adjusted_payload("TSLA", days=30))
+    frame = quote.to_pandas()
+    assert isinstance(frame.index, pd.DatetimeIndex) and frame.index.name == "date"
+    assert frame.index.is_monotonic_increasing and len(frame) == 30
+    assert frame["volume"].dtype == np.int64 and frame["adjusted_close"].dtype == np.float64
+    assert np.shares_memory(frame["close"].to_numpy(), quote.get_columns()["close"]), "Columns should not be copied"
+
+
+@pytest.mark.unit
+def test_to_arrow():
+    pa = pytest.importorskip("pyarrow")
+    table = make_quote(intraday_payload("TSLA", bars=30)).to_arrow()
+    assert table.column_names == ["date", "open", "high", "low", "close", "volume"]
+    assert table.schema.field("date").type == pa.timestamp("s") and table.schema.field("volume").type == pa.int64()
+    assert table.num_rows == 30
+
+
+@pytest.mark.unit
+def test_to_numpy():
+    records = make_quote(daily_adjusted_payload("TSLA", days=3)).to_numpy()
+    assert records.dtype.names[:2] == ("date", "open") and len(records) == 3
+    assert records["date"][0] == np.datetime64("2023-01-02")
+
+
+@pytest.mark.unit
+def test_commodity_and_economic_indicator_export():
+    response = {"success": True, "limit_reached": False, "status_code": 200, "name": "WTI", "interval": "monthly",
+                "unit": "dollars per barrel", "data": [{"date": "2023-02-01", "value": "."},
+                                                       {"date": "2023-01-01", "value": "78.12"}]}
+    columns = Commodity.model_validate(response).get_columns()
+    assert columns.get_column_names() == ["value"] and columns["value"][0] == 78.12 and np.isnan(columns["value"][1])
+    indicator = EconomicIndicator.model_validate(response).to_numpy()
+    assert indicator["date"][0] == np.datetime64("2023-01-01") and indicator["date"][1] == np.datetime64("2023-02-01")
+    assert len(EconomicIndicator.model_validate({"success": False, "limit_reached": False,
+                                                 "status_code": 200}).get_columns()) == 0
+
+
+@pytest.mark.benchmark
+def test_to_pandas_benchmark():
+    pd = pytest.importorskip("pandas")
+    payload = intraday_payload("TSLA", bars=20000)
+
+    start = time.perf_counter()
+    rows = [{"date": date, **{field: float(value) for field, value in row.items()}}
+            for date, row in payload["Time Series (1min)"].items()]
+    pd.DataFrame(rows).set_index("date").sort_index()
+    row_by_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    make_quote(payload).to_pandas()
+    columnar_seconds = time.perf_counter() - start
+    logging.warning(f"20000 intraday bars to pandas: row by row {row_by_row_seconds * 1000:.0f} ms, "
+                    f"to_pandas {columnar_seconds * 1000:.0f} ms")
@@ -0,0 +1,53 @@
+import pytest
+import logging
+from requests.adapters import HTTPAdapter
+from alphavantage_api_client import AlphavantageClient
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, global_quote_payload
+
+
+class TestConnectionPool:
+
+    @pytest.mark.unit
+    def test_session_is_reused_across_calls(self):
+        client = AlphavantageClient().with_api_key("demo")
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        session = client.__get_session__()
+        client.get_global_quote("TSLA")
+        client.get_global_quote("AAPL")
+        assert client.__get_session__() is session, "Session should be shared by every get_* call"
+        assert adapter.call_count == 2, f"Expected 2 calls but found {adapter.call_count}"
+        logging.warning(" Session is reused across calls")
+
+    @pytest.mark.unit
+    def test_pool_settings_are_applied(self):
+        client = AlphavantageClient().with_connection_pool(pool_connections=2, pool_maxsize=25, pool_block=True)
+        adapter = client.__get_session__().get_adapter("https://www.alphavantage.co/query")
+        assert isinstance(adapter, HTTPAdapter), "Expected the pooled HTTPAdapter to be mounted"
+        assert adapter._pool_maxsize == 25, "pool_maxsize was not applied"
+        assert adapter._pool_connections == 2, "pool_connections was not applied"
+        assert adapter._pool_block, "pool_block was not applied"
+        client.close()
+
+    @pytest.mark.unit
+    def test_timeouts_and_keep_alive(self):
+        client = AlphavantageClient().with_api_key("demo") \
+            .with_connection_pool(keep_alive=False, connect_timeout=3, read_timeout=30)
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        client.get_global_quote("TSLA")
+        sent = adapter.requests[0]
+        assert sent["timeout"] == (3, 30), f"Unexpected timeout {sent['timeout']}"
+        assert sent["headers"].get("Connection") == "close", "keep_alive=False should send Connection: close"
+
+    @pytest.mark.unit
+    def test_context_manager_closes_session(self):
+        with AlphavantageClient() as client:
+            session = client.__get_session__()
+            assert client.__session__ is session
+        assert client.__session__ is None, "Session should be released when leaving the context manager"
+        assert client.__get_session__() is not session, "A new session should be created after close()"
+        client.close()
+
+    @pytest.mark.unit
+    def test_invalid_pool_size(self):
+        with pytest.raises(ValueError):
+            AlphavantageClient().with_connection_pool(pool_maxsize=0)
@@ -0,0 +1,161 @@
+import math
+import pytest
+from alphavantage_api_client import AlphavantageClient, Quote, IndicatorEngine
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, daily_adjusted_payload
+
+np = pytest.importorskip("numpy")
+
+
+def make_quote(closes: list[float] = None, days: int = 120) -> Quote:
+    payload = daily_adjusted_payload("TSLA", days=days if closes is None else len(closes))
+    if closes is not None:
+        for row, close in zip(reversed(list(payload["Time Series (Daily)"].values())), closes):
+            row.update({"1. open": str(close), "2. high": str(close + 1), "3. low": str(close - 1),
+                        "4. close": str(close)})
+    return Quote.model_validate({**payload, "success": True, "limit_reached": False, "status_code": 200,
+                                 "symbol": "TSLA"})
+
+
+def reference_quote() -> Quote:
+    """70 bars of a rising sine wave, with a flat top at bars 40 to 44 and a flat bottom at bars 52 to 55"""
+    payload = daily_adjusted_payload("TSLA", days=70)
+    for index, row in enumerate(reversed(list(payload["Time Series (Daily)"].values()))):
+        close = round(100 + 8 * math.sin(index / 4) + index * 0.2, 2)
+        high = 116.0 if 40 <= index <= 44 else round(close + 1 + (index % 3) * 0.25, 2)
+        low = 99.0 if 52 <= index <= 55 else round(close - 1 - (index % 2) * 0.5, 2)
+        row.update({"1. open": str(round((high + low) / 2, 2)), "2. high": str(high), "3. low": str(low),
+                    "4. close": str(close), "6. volume": str(1000 + (index * 37) % 500)})
+    return Quote.model_validate({**payload, "success": True, "limit_reached": False, "status_code": 200,
+                                 "symbol": "TSLA"})
+
+
+# TA-Lib (what the api computes with) on reference_quote(), the newest three bars
+REFERENCE_VALUES = [
+    ({"function": "CMO", "time_period": 14}, "CMO", [-26.5184, -28.9264, -29.3989]),
+    ({"function": "AROON", "time_period": 14}, "Aroon Up", [21.4286, 14.2857, 7.1429]),
+    ({"function": "AROON", "time_period": 14}, "Aroon Down", [14.2857, 7.1429, 0.0]),
+    ({"function": "MACD"}, "MACD", [0.2551, -0.209, -0.5791]),
+    ({"function": "MACD"}, "MACD_Signal", [1.6363, 1.2672, 0.8979]),
+    ({"function": "MACD"}, "MACD_Hist", [-1.3811, -1.4762, -1.4771]),
+    ({"function": "MACDEXT", "fastmatype": 1, "slowmatype": 2, "signalmatype": 7}, "MACD_Signal",
+     [0.0396, -0.7041, -1.2817]),
+    ({"function": "ADX", "time_period": 14}, "ADX", [20.3941, 21.5552, 22.7682]),
+    ({"function": "SAR"}, "SAR", [102.9549, 103.3082, 103.6544]),
+    ({"function": "KAMA", "time_period": 10}, "KAMA", [109.1395, 107.7042, 106.8579]),
+    ({"function": "T3", "time_period": 5}, "T3", [109.9861, 108.3752, 107.0663]),
+    ({"function": "MFI", "time_period": 14}, "MFI", [20.3358, 12.4404, 6.5322]),
+    ({"function": "ULTOSC"}, "ULTOSC", [53.7696, 50.7208, 48.14]),
+    ({"function": "ADOSC"}, "ADOSC", [249.6819, 159.7004, 175.3807]),
+    ({"function": "BBANDS", "time_period": 5, "matype": 3}, "Real Middle Band", [106.6078, 105.664, 105.2107]),
+    ({"function": "BBANDS", "time_period": 5, "matype": 6}, "Real Upper Band", [114.1175, 111.6968, 109.3658]),
+    ({"function": "BBANDS", "time_period": 5, "matype": 7}, "Real Lower Band", [103.9889, 103.8163, 104.2437]),
+]
+
+
+def values(quote: Quote, field: str) -> list[float]:
+    """indicator values oldest first"""
+    return [float(row[field]) for row in reversed(list(quote.data.values()))]
+
+
+@pytest.mark.unit
+def test_same_shape_as_the_api():
+    sma = IndicatorEngine(make_quote(days=30)).get_sma({"time_period": 10})
+    assert isinstance(sma, Quote) and sma.success and sma.symbol == "TSLA"
+    dates = list(sma.data.keys())
+    assert len(dates) == 21 and dates[0] > dates[-1], "Warm up rows are left out and data is newest first"
+    assert sma.data[dates[0]] == {"SMA": sma.data[dates[0]]["SMA"]} and isinstance(sma.data[dates[0]]["SMA"], str)
+    assert sma.meta_data["2: Indicator"] == "Simple Moving Average (SMA)"
+    assert sma.meta_data["3: Last Refreshed"] == dates[0] and sma.meta_data["5: Time Period"] == 10
+
+
+@pytest.mark.unit
+def test_moving_averages():
+    closes = [float(value) for value in range(1, 41)]
+    engine = IndicatorEngine(make_quote(closes))
+    assert values(engine.get_sma({"time_period": 5}), "SMA")[0] == np.mean(closes[:5])
+    expected = np.mean(closes[:10])
+    for close in closes[10:]:
+        expected += 2 / 11 * (close - expected)
+    assert values(engine.get_ema({"time_period": 10}), "EMA")[-1] == pytest.approx(expected, abs=1e-4)
+    weights = np.arange(1, 6)
+    assert values(engine.get_wma({"time_period": 5}), "WMA")[-1] == pytest.approx(
+        np.dot(closes[-5:], weights) / weights.sum(), abs=1e-4)
+    bands = engine.get_bbands({"time_period": 5, "nbdevup": 2})
+    latest = bands.data[next(iter(bands.data))]
+    assert float(latest["Real Middle Band"]) == np.mean(closes[-5:])
+    assert float(latest["Real Upper Band"]) == pytest.approx(np.mean(closes[-5:]) + 2 * np.std(closes[-5:]), abs=1e-4)
+
+
+@pytest.mark.unit
+def test_oscillators():
+    rising = IndicatorEngine(make_quote([float(value) for value in range(1, 41)]))
+    assert set(values(rising.get_rsi({"time_period": 14}), "RSI")) == {100.0}
+    assert set(values(rising.get_atr({"time_period": 14}), "ATR")) == {2.0}, "Every true range is 2"
+    assert set(values(rising.get_mom({"time_period": 3}), "MOM")) == {3.0}
+    macd = rising.get_macd()
+    latest = macd.data[next(iter(macd.data))]
+    assert float(latest["MACD_Hist"]) == pytest.approx(float(latest["MACD"]) - float(latest["MACD_Signal"]), abs=2e-4)
+    zigzag = IndicatorEngine(make_quote([100.0 + (index % 2) for index in range(60)]))
+    assert 40 < values(zigzag.get_rsi({"time_period": 14}), "RSI")[-1] < 60
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("event, field, expected", REFERENCE_VALUES)
+def test_matches_the_api(event, field, expected):
+    result = IndicatorEngine(reference_quote()).get_technical_indicator(event)
+    assert values(result, field)[-3:] == pytest.approx(expected, abs=1e-4)
+
+
+@pytest.mark.unit
+def test_aroon_ties_go_to_the_newest_bar():
+    aroon = IndicatorEngine(reference_quote()).get_aroon({"time_period": 14})
+    # the top is flat from bar 40 to 44, so it is 0 bars old at bar 44
+    assert values(aroon, "Aroon Up")[44 - 70:48 - 70] == pytest.approx([100.0, 92.8571, 85.7143, 78.5714], abs=1e-4)
+    assert values(aroon, "Aroon Down")[55 - 70:58 - 70] == pytest.approx([100.0, 92.8571, 85.7143], abs=1e-4)
+
+
+@pytest.mark.unit
+def test_cmo_is_rsi_rescaled():
+    engine = IndicatorEngine(reference_quote())
+    rsi, cmo = values(engine.get_rsi({"time_period": 14}), "RSI"), values(engine.get_cmo({"time_period": 14}), "CMO")
+    assert cmo == pytest.approx([2 * value - 100 for value in rsi], abs=2e-4)
+
+
+@pytest.mark.unit
+def test_bbands_middle_band_is_the_matype_average():
+    engine = IndicatorEngine(reference_quote())
+    for matype, rows in ((0, 66), (6, 46), (7, 65)):
+        bands = engine.get_technical_indicator({"function": "BBANDS", "time_period": 5, "matype": matype})
+        assert len(bands.data) == rows, "bands start when the middle band does"
+    t3 = engine.get_technical_indicator({"function": "T3", "time_period": 5})
+    bands = engine.get_technical_indicator({"function": "BBANDS", "time_period": 5, "matype": 6})
+    assert values(bands, "Real Middle Band") == values(t3, "T3")
+
+
+@pytest.mark.unit
+def test_sweeps_cost_no_api_calls():
+    client = AlphavantageClient().with_api_key("demo")
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter(
+        {"TIME_SERIES_DAILY_ADJUSTED": daily_adjusted_payload("TSLA", days=500)}))
+    engine = IndicatorEngine(client.get_daily_adjusted_quote({"symbol": "TSLA", "outputsize": "full"}))
+    sweep = {period: engine.get_sma({"time_period": period}) for period in range(10, 200, 10)}
+    assert len(sweep[190].data) == 500 - 189
+    for function in engine.get_supported_functions():
+        assert len(engine.get_technical_indicator({"function": function, "time_period": 14}).data) > 0, function
+    assert adapter.call_count == 1
+
+
+@pytest.mark.unit
+def test_unsupported_requests():
+    engine = IndicatorEngine(make_quote(days=30))
+    with pytest.raises(ValueError):
+        engine.get_technical_indicator({"function": "HT_SINE"})
+    with pytest.raises(ValueError):
+        engine.get_technical_indicator({"function": "MACDEXT", "signalmatype": 8})
+    with pytest.raises(ValueError):
+        engine.get_technical_indicator({"function": "BBANDS", "matype": 8})
+    with pytest.raises(ValueError):
+        engine.get_sma({"series_type": "vwap"})
+    with pytest.raises(ValueError):
+        IndicatorEngine(Quote.model_validate({"success": False, "limit_reached": False, "status_code": 200,
+                                              "symbol": "TSLA", "Error Message": "Invalid API call"}))
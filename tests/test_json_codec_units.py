@@ -0,0 +1,72 @@
+import json
+import logging
+import time
+import pytest
+from alphavantage_api_client import AlphavantageClient, json_codec
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, daily_adjusted_payload, intraday_payload
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+@pytest.mark.unit
+def test_round_trip(backend):
+    payload = daily_adjusted_payload("TSLA", days=10)
+    assert json_codec.get_backend() == backend
+    assert json_codec.loads(json_codec.dumps(payload)) == payload
+    assert json_codec.loads(json_codec.dumps_bytes(payload)) == payload
+    assert json_codec.loads(json.dumps(payload).encode("utf-8")) == payload
+
+
+@pytest.mark.unit
+def test_invalid_json_raises_value_error(backend):
+    with pytest.raises(ValueError):
+        json_codec.loads(b"symbol,open\nTSLA,1.0")
+
+
+@pytest.mark.unit
+def test_cache_keys_do_not_depend_on_backend(monkeypatch):
+    event = {"symbol": "TSLA", "function": "GLOBAL_QUOTE", "name": "Société Générale", "limit": 5}
+    key = json_codec.dumps(event, sort_keys=True)
+    monkeypatch.setattr(json_codec, "orjson", None)
+    assert json_codec.dumps(event, sort_keys=True) == key
+    assert key == '{"function":"GLOBAL_QUOTE","limit":5,"name":"Société Générale","symbol":"TSLA"}'
+
+
+@pytest.mark.unit
+def test_client_parses_with_either_backend(backend):
+    client = AlphavantageClient().with_api_key("demo")
+    use_fake_transport(client, FakeAlphavantageAdapter({"TIME_SERIES_INTRADAY": intraday_payload("TSLA", bars=50)}))
+    quote = client.get_intraday_quote({"symbol": "TSLA", "interval": "1min"})
+    assert quote.success and len(quote.data) == 50
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name,payload", [
+    ("full daily history", daily_adjusted_payload("TSLA", days=6000)),
+    ("full intraday month", intraday_payload("TSLA", bars=20000)),
+])
+def test_decode_benchmark(name, payload):
+    if json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    body = json.dumps(payload).encode("utf-8")
+
+    def best_of(decode, rounds: int = 5) -> float:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            decode(body)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    stdlib_seconds = best_of(json.loads)
+    orjson_seconds = best_of(json_codec.loads)
+    logging.warning(f"{name} ({len(body) / 1e6:.1f} MB): json {stdlib_seconds * 1000:.1f} ms, "
+                    f"orjson {orjson_seconds * 1000:.1f} ms, {stdlib_seconds / orjson_seconds:.1f}x faster")
+    assert orjson_seconds < stdlib_seconds
@@ -0,0 +1,95 @@
+import json
+import logging
+import random
+import pytest
+from alphavantage_api_client import AlphavantageClient, json_codec
+from alphavantage_api_client.log_message import LazyLogMessage, PayloadLogPolicy
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, daily_adjusted_payload
+
+
+def make_client(**log_settings) -> AlphavantageClient:
+    client = AlphavantageClient().with_api_key("demo").with_payload_logging(**log_settings)
+    use_fake_transport(client, FakeAlphavantageAdapter(
+        {"TIME_SERIES_DAILY_ADJUSTED": daily_adjusted_payload("TSLA", days=1000)}))
+    return client
+
+
+def get_messages(caplog, action: str) -> list[dict]:
+    return [json.loads(record.getMessage()) for record in caplog.records if f'"action":"{action}"' in
+            record.getMessage()]
+
+
+@pytest.mark.unit
+def test_nothing_is_serialized_when_info_is_off(caplog, monkeypatch):
+    caplog.set_level(logging.WARNING)
+    client = make_client()
+    serialized = []
+    original_dumps = json_codec.dumps
+    monkeypatch.setattr(json_codec, "dumps", lambda obj, *args, **kwargs: serialized.append(obj) or original_dumps(
+        obj, *args, **kwargs))
+    quote = client.get_daily_adjusted_quote({"symbol": "TSLA", "outputsize": "full"})
+    assert quote.success
+    log_messages = [obj for obj in serialized if "method" in obj]
+    assert len(log_messages) == 0, "Log messages should not be serialized when INFO is disabled"
+
+
+@pytest.mark.unit
+def test_payloads_are_truncated(caplog):
+    caplog.set_level(logging.INFO)
+    client = make_client(max_payload_length=100)
+    client.get_daily_adjusted_quote({"symbol": "TSLA", "outputsize": "full"})
+    response_log = get_messages(caplog, "response_from_alphavantage")[0]
+    assert response_log["status_code"] == 200
+    assert response_log["data"].startswith('{"Meta Data"') and response_log["data"].endswith("more characters)")
+    assert len(response_log["data"]) < 150
+    return_log = get_messages(caplog, "return_value")[0]
+    assert return_log["event"]["symbol"] == "TSLA" and "more characters" in return_log["data"]
+
+
+@pytest.mark.unit
+def test_payloads_can_be_sampled(caplog, monkeypatch):
+    caplog.set_level(logging.INFO)
+    client = make_client(sample_rate=0)
+    serialized = []
+    original_dumps = json_codec.dumps
+    monkeypatch.setattr(json_codec, "dumps", lambda obj, *args, **kwargs: serialized.append(obj) or original_dumps(
+        obj, *args, **kwargs))
+    client.get_daily_adjusted_quote({"symbol": "TSLA"})
+    assert get_messages(caplog, "response_from_alphavantage")[0]["data"] == "<not sampled>"
+    assert get_messages(caplog, "return_value")[0]["data"].endswith("items, not sampled>")
+    assert all("method" in obj for obj in serialized), "payloads that are not sampled should not be serialized"
+
+
+@pytest.mark.unit
+def test_sampling_is_decided_once_per_call(caplog):
+    caplog.set_level(logging.INFO)
+    random.seed(11)
+    client = make_client(sample_rate=0.5)
+    for _ in range(20):
+        client.get_daily_adjusted_quote({"symbol": "TSLA"})
+    responses, returns = get_messages(caplog, "response_from_alphavantage"), get_messages(caplog, "return_value")
+    sampled = [not response["data"].endswith("not sampled>") for response in responses]
+    assert 0 < sum(sampled) < 20
+    assert sampled == [isinstance(value["data"], dict) for value in returns], "a call logs all its payloads or none"
+    message = LazyLogMessage({"data": "x"}, PayloadLogPolicy(sample_rate=0.5))
+    assert len({str(message) for _ in range(20)}) == 1, "every handler should see the same message"
+
+
+@pytest.mark.unit
+def test_lazy_message_defers_callables():
+    calls = []
+    message = LazyLogMessage({"action": "test", "data": lambda: calls.append(1) or "x" * 20},
+                             PayloadLogPolicy(max_payload_length=5))
+    assert len(calls) == 0
+    assert json.loads(str(message)) == {"action": "test", "data": "xxxxx... (15 more characters)"}
+    assert len(calls) == 1
+    skipped = LazyLogMessage({"data": lambda: calls.append(1) or "x"}, PayloadLogPolicy(), sampled=False)
+    assert json.loads(str(skipped)) == {"data": "<not sampled>"} and len(calls) == 1
+
+
+@pytest.mark.unit
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        PayloadLogPolicy(sample_rate=2)
+    with pytest.raises(ValueError):
+        PayloadLogPolicy(max_payload_length=-1)
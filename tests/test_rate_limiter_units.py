@@ -0,0 +1,101 @@
+import multiprocessing
+import time
+import pytest
+import logging
+from alphavantage_api_client import AlphavantageClient, RateLimiter, RateLimitExceeded
+from alphavantage_api_client.rate_limiter import TokenBucket, reserve_tokens, SqliteRateLimitBackend
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, global_quote_payload
+
+
+class TestRateLimiter:
+
+    @pytest.mark.unit
+    def test_calls_are_paced_evenly(self):
+        minute = TokenBucket("minute", 5 / 60, 1)
+        state = {}
+        delays = []
+        for index in range(5):
+            delay, state = reserve_tokens(state, [minute], 1000.0)
+            delays.append(delay)
+        assert delays == pytest.approx([0, 12, 24, 36, 48]), f"Calls should be spaced 12 seconds apart {delays}"
+
+    @pytest.mark.unit
+    def test_burst_then_pace(self):
+        minute = TokenBucket("minute", 60 / 60, 3)
+        state = {}
+        delays = []
+        for index in range(5):
+            delay, state = reserve_tokens(state, [minute], 0.0)
+            delays.append(delay)
+        assert delays == pytest.approx([0, 0, 0, 1, 2]), f"Burst of 3 should be followed by pacing {delays}"
+
+    @pytest.mark.unit
+    def test_day_bucket_is_enforced(self):
+        minute = TokenBucket("minute", 60 / 60, 60)
+        day = TokenBucket("day", 2 / 86400, 2)
+        state = {}
+        first, state = reserve_tokens(state, [minute, day], 0.0)
+        second, state = reserve_tokens(state, [minute, day], 0.0)
+        third, state = reserve_tokens(state, [minute, day], 0.0)
+        assert first == 0 and second == 0
+        assert third == pytest.approx(43200), f"Third call should wait for the daily bucket {third}"
+
+    @pytest.mark.unit
+    def test_max_wait_does_not_consume(self):
+        limiter = RateLimiter(calls_per_minute=1, max_wait=1)
+        assert limiter.acquire("key") == 0
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire("key")
+        assert limiter.acquire("other key") == 0, "Each api key should have its own bucket"
+
+    @pytest.mark.unit
+    def test_client_paces_calls(self):
+        client = AlphavantageClient().with_api_key("demo").with_rate_limit(calls_per_minute=600)
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        start = time.perf_counter()
+        for symbol in ["TSLA", "F", "C", "WFC", "ZIM"]:
+            assert client.get_global_quote(symbol).success
+        elapsed = time.perf_counter() - start
+        metrics = client.get_internal_metrics()
+        assert adapter.call_count == 5
+        assert elapsed >= 0.35, f"600 calls per minute should space calls 0.1s apart, took {elapsed:.2f}s"
+        assert metrics["rate_limiter"]["acquired"] == 5
+        assert metrics["rate_limiter"]["delayed"] == 4
+        logging.warning(f" Paced 5 calls in {elapsed:.2f}s")
+
+
+def reserve_from_worker(path: str, count: int, results):
+    limiter = RateLimiter(calls_per_minute=60, backend=SqliteRateLimitBackend(path))
+    for index in range(count):
+        now = time.time()
+        results.put(now + limiter.reserve("shared key"))
+
+
+class TestSharedRateLimiter:
+
+    @pytest.mark.unit
+    def test_processes_share_one_budget(self, tmp_path):
+        path = str(tmp_path / "rate_limit.sqlite")
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=reserve_from_worker, args=(path, 3, results)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        send_times = sorted(results.get(timeout=30) for _ in range(12))
+        for worker in workers:
+            worker.join(timeout=30)
+        gaps = [later - earlier for earlier, later in zip(send_times, send_times[1:])]
+        assert all(gap == pytest.approx(1, abs=0.05) for gap in gaps), f"12 calls should be 1s apart {gaps}"
+        logging.warning(" 4 processes shared one 60 calls per minute budget")
+
+    @pytest.mark.unit
+    def test_clients_share_budget_through_store(self, tmp_path):
+        path = str(tmp_path / "rate_limit.sqlite")
+        client_a = AlphavantageClient().with_api_key("demo").with_rate_limit(calls_per_minute=1, max_wait=5,
+                                                                             shared_store=path)
+        client_b = AlphavantageClient().with_api_key("demo").with_rate_limit(calls_per_minute=1, max_wait=5,
+                                                                             shared_store=path)
+        use_fake_transport(client_a, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        use_fake_transport(client_b, FakeAlphavantageAdapter({"GLOBAL_QUOTE": global_quote_payload}))
+        assert client_a.get_global_quote("TSLA").success
+        with pytest.raises(RateLimitExceeded):
+            client_b.get_global_quote("TSLA")
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import pytest
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from alphavantage_api_client import AlphavantageClient, AsyncAlphavantageClient
+from alphavantage_api_client.single_flight import SingleFlight
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, daily_adjusted_payload
+
+
+class TestSingleFlight:
+
+    @pytest.mark.unit
+    def test_followers_share_leader_result(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            release.wait(5)
+            return {"value": 42}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(single_flight.do, "key", slow_call) for _ in range(5)]
+            while single_flight.get_metrics()["coalesced"] < 4:
+                threading.Event().wait(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+        assert len(calls) == 1, f"Only the leader should run the call {len(calls)}"
+        assert all(result is results[0] for result in results)
+        assert single_flight.get_metrics() == {"in_flight": 0, "coalesced": 4}
+
+    @pytest.mark.unit
+    def test_followers_receive_exception_and_leader_can_reenter(self):
+        single_flight = SingleFlight()
+
+        def failing_call():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            single_flight.do("key", failing_call)
+        assert single_flight.do("key", lambda: single_flight.do("key", lambda: "inner")) == "inner"
+
+    @pytest.mark.unit
+    def test_threads_hit_api_once(self):
+        client = AlphavantageClient().with_api_key("demo").use_request_coalescing()
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter(
+            {"TIME_SERIES_DAILY_ADJUSTED": daily_adjusted_payload("AAPL")}, delay=0.3))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            quotes = list(executor.map(lambda _: client.get_daily_adjusted_quote("AAPL"), range(8)))
+        assert all(quote.success and len(quote.data) == 100 for quote in quotes)
+        assert adapter.call_count == 1, f"8 identical calls should reach the api once, found {adapter.call_count}"
+        assert client.get_internal_metrics()["coalescing"]["coalesced"] == 7
+        logging.warning(" 8 concurrent identical calls were served by 1 api call")
+
+    @pytest.mark.unit
+    def test_asyncio_hits_api_once(self):
+        client = AlphavantageClient().with_api_key("demo").use_request_coalescing()
+        adapter = use_fake_transport(client, FakeAlphavantageAdapter(
+            {"TIME_SERIES_DAILY_ADJUSTED": daily_adjusted_payload("AAPL")}, delay=0.3))
+
+        async def load_dashboard():
+            async with AsyncAlphavantageClient(client, max_concurrency=8) as async_client:
+                return await asyncio.gather(*[async_client.get_daily_adjusted_quote("AAPL") for _ in range(8)])
+
+        quotes = asyncio.run(load_dashboard())
+        assert all(quote.success for quote in quotes)
+        assert adapter.call_count == 1, f"8 identical calls should reach the api once, found {adapter.call_count}"
@@ -0,0 +1,100 @@
+import json
+import random
+import pytest
+from alphavantage_api_client import Quote, IndicatorEngine
+from alphavantage_api_client.streaming_indicators import create_streaming_indicator, StreamingIndicator, \
+    STREAMING_INDICATORS
+from .fake_transport import daily_adjusted_payload
+
+np = pytest.importorskip("numpy")
+
+
+def random_walk_quote(days: int = 300) -> Quote:
+    payload = daily_adjusted_payload("TSLA", days=days)
+    generator = random.Random(7)
+    close = 100.0
+    for row in reversed(list(payload["Time Series (Daily)"].values())):
+        close = max(close + generator.uniform(-3, 3), 1)
+        row.update({"1. open": f"{close + generator.uniform(-1, 1):.4f}",
+                    "2. high": f"{close + generator.uniform(0, 2):.4f}",
+                    "3. low": f"{close - generator.uniform(0, 2):.4f}", "4. close": f"{close:.4f}",
+                    "6. volume": str(generator.randint(1000, 100000))})
+    return Quote.model_validate({**payload, "success": True, "limit_reached": False, "status_code": 200,
+                                 "symbol": "TSLA"})
+
+
+EVENTS = [{"function": function, "time_period": 14} for function in STREAMING_INDICATORS] + [
+    {"function": "MACDEXT", "fastmatype": fast, "slowmatype": slow, "signalmatype": signal}
+    for fast, slow, signal in [(1, 2, 3), (4, 5, 6), (7, 0, 1), (6, 7, 2)]] + [
+    {"function": "APO", "matype": 7, "fastperiod": 26, "slowperiod": 12}, {"function": "PPO", "matype": 6},
+    {"function": "STOCH", "slowkmatype": 3, "slowdmatype": 7}, {"function": "STOCHRSI", "fastdmatype": 4},
+    {"function": "STOCHF", "fastdmatype": 2}, {"function": "SAR", "acceleration": 0.02, "maximum": 0.3},
+    {"function": "ULTOSC", "timeperiod1": 20, "timeperiod2": 3, "timeperiod3": 9},
+    {"function": "ADOSC", "fastperiod": 10, "slowperiod": 4},
+] + [{"function": "BBANDS", "time_period": 10, "matype": matype} for matype in range(1, 8)]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("event", EVENTS, ids=lambda event: "-".join(str(value) for value in event.values()))
+def test_matches_the_engine(event):
+    function = event["function"]
+    quote = random_walk_quote()
+    expected = IndicatorEngine(quote).get_technical_indicator(event)
+    history = quote.get_columns()
+    split = 200
+    # seed with the first bars, then stream the rest one at a time
+    seed = Quote.model_validate({"success": True, "limit_reached": False, "status_code": 200, "symbol": "TSLA",
+                                 "Time Series (Daily)": dict(list(quote.data.items())[len(quote.data) - split:])})
+    indicator = create_streaming_indicator(event, seed=seed)
+    assert indicator.bars == split
+    names = history.get_column_names()
+    for position in range(split, len(history)):
+        value = indicator.update({name: history[name][position] for name in names})
+        date = str(history.index[position])[:10]
+        for output, number in value.items():
+            assert number == pytest.approx(float(expected.data[date][output]), abs=2e-4), f"{function} {date}"
+
+
+@pytest.mark.unit
+def test_warming_up_and_api_style_bars():
+    sma = create_streaming_indicator({"function": "SMA", "time_period": 3})
+    assert sma.update_many([1, 2]) == [None, None]
+    assert sma.update({"4. close": "6", "1. open": "5", "date": "2023-01-03"}) == {"SMA": 3.0}
+    assert sma.get_value() == {"SMA": 3.0} and sma.bars == 3
+
+
+@pytest.mark.unit
+def test_state_survives_a_restart():
+    quote = random_walk_quote(60)
+    macd = create_streaming_indicator({"function": "MACD"}, seed=quote)
+    stoch = create_streaming_indicator({"function": "STOCH"}, seed=quote)
+    restored_macd = StreamingIndicator.from_state(json.loads(json.dumps(macd.get_state())))
+    restored_stoch = StreamingIndicator.from_state(json.loads(json.dumps(stoch.get_state())))
+    bar = {"open": 100.0, "high": 104.0, "low": 99.0, "close": 103.0, "volume": 5000}
+    assert restored_macd.update(bar) == macd.update(bar)
+    assert restored_stoch.update(bar) == stoch.update(bar)
+    assert type(restored_macd).__name__ == "StreamingMacd" and restored_macd.params == macd.params
+    for function in ("SAR", "KAMA", "ADXR", "STOCHRSI", "MACDEXT", "ULTOSC", "BBANDS"):
+        indicator = create_streaming_indicator({"function": function, "time_period": 10, "matype": 6}, seed=quote)
+        restored = StreamingIndicator.from_state(json.loads(json.dumps(indicator.get_state())))
+        assert restored.update(bar) == indicator.update(bar), function
+
+
+@pytest.mark.unit
+def test_aroon_ties_go_to_the_newest_bar():
+    aroon = create_streaming_indicator({"function": "AROON", "time_period": 4})
+    values = aroon.update_many([{"high": high, "low": 1.0} for high in [1.0, 3.0, 3.0, 2.0, 3.0, 2.0]])
+    assert [value["Aroon Up"] for value in values[4:]] == [100.0, 75.0]
+    assert [value["Aroon Down"] for value in values[4:]] == [100.0, 100.0], "every low ties with the newest one"
+
+
+@pytest.mark.unit
+def test_unknown_indicator():
+    with pytest.raises(ValueError):
+        create_streaming_indicator({"function": "HT_SINE"})
+    with pytest.raises(ValueError):
+        StreamingIndicator.from_state({"type": "dict", "values": {}})
+    with pytest.raises(ValueError):
+        create_streaming_indicator({"function": "MACDEXT", "fastmatype": 8})
+    with pytest.raises(TypeError):
+        StreamingIndicator()
@@ -0,0 +1,130 @@
+import copy
+import logging
+import time
+import pytest
+from alphavantage_api_client import AlphavantageClient, Ticker, AccountingReport, FundamentalsTable
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, global_quote_payload, \
+    accounting_report_payload
+
+
+def create_ticker(delay: float = 0, payloads: dict = None):
+    client = AlphavantageClient().with_api_key("demo")
+    default_payloads = {function: accounting_report_payload for function in
+                        ("BALANCE_SHEET", "INCOME_STATEMENT", "EARNINGS", "CASH_FLOW")}
+    default_payloads["GLOBAL_QUOTE"] = global_quote_payload
+    default_payloads["OVERVIEW"] = lambda params: {"Symbol": params["symbol"], "Name": "Tesla Inc"}
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({**default_payloads, **(payloads or {})},
+                                                                 delay=delay))
+    return Ticker().use_client(client).from_symbol("TSLA"), adapter
+
+
+@pytest.mark.unit
+def test_accounting_reports_are_fetched_concurrently():
+    ticker, adapter = create_ticker(delay=0.2)
+    start = time.perf_counter()
+    ticker.fetch_accounting_reports()
+    elapsed = time.perf_counter() - start
+    assert adapter.call_count == 4 and elapsed < 0.6, f"4 calls of 0.2s should overlap but took {elapsed:.2f}s"
+    assert ticker.get_balance_sheet().success and ticker.get_cash_flow().success
+    assert ticker.get_earnings().get_most_recent_annual_report()["reportedEPS"] == "4.07"
+    assert ticker.get_fetch_errors() == {}
+    correlated = ticker.correlate_accounting_reports().get_correlated_reports()
+    assert correlated["2022-12-31"]["earnings_annual_reportedEPS"] == "4.07"
+
+
+@pytest.mark.unit
+def test_fetch_all_keeps_per_report_errors():
+    def broken(params: dict) -> dict:
+        raise ConnectionError("connection reset")
+
+    ticker, adapter = create_ticker(payloads={"CASH_FLOW": broken})
+    ticker.fetch_all()
+    assert adapter.call_count == 6
+    assert ticker.get_global_quote().get_price() == "105.0000"
+    assert ticker.get_company_overview().name == "Tesla Inc"
+    assert ticker.get_income_statement().success
+    errors = ticker.get_fetch_errors()
+    assert list(errors) == ["cash_flow"] and isinstance(errors["cash_flow"], ConnectionError)
+    with pytest.raises(ValueError):
+        ticker.get_cash_flow()
+
+
+@pytest.mark.unit
+def test_fetch_needs_a_symbol():
+    with pytest.raises(ValueError):
+        Ticker().use_client(AlphavantageClient().with_api_key("demo")).fetch_accounting_reports()
+
+
+def create_ticker_with_reports(symbol: str = "TSLA", years: int = 2) -> Ticker:
+    ticker = Ticker().from_symbol(symbol)
+    for function, attribute in (("BALANCE_SHEET", "__balance_sheet__"), ("INCOME_STATEMENT", "__income_statement__"),
+                                ("EARNINGS", "__earnings__"), ("CASH_FLOW", "__cash_flow__")):
+        payload = accounting_report_payload({"function": function, "symbol": symbol}, years)
+        report = AccountingReport.model_validate({**payload, "success": True, "limit_reached": False,
+                                                  "status_code": 200})
+        setattr(ticker, attribute, report)
+    return ticker
+
+
+@pytest.mark.unit
+def test_correlation_does_not_change_the_reports():
+    ticker = create_ticker_with_reports()
+    before = ticker.get_balance_sheet().model_dump()
+    first = ticker.correlate_accounting_reports().get_correlated_reports()
+    assert ticker.get_balance_sheet().model_dump() == before, "the reports should only be read"
+    assert first["2022-12-31"]["balance_annual_total"] == before["annualReports"][0]["total"]
+    assert first["2022-12-31"]["balance_quarterly_total"] == before["quarterlyReports"][0]["total"]
+    assert first["2022-12-31"]["fiscalDateEnding"] == "2022-12-31"
+    quarterly = ticker.get_correlated_quarterly_reports()["2022-03-31"]
+    assert quarterly["earnings_quarterly_reportedEPS"] == "0.85" and "balance_annual_total" not in quarterly
+    second = ticker.correlate_accounting_reports().get_correlated_reports()
+    assert second == first, "correlating twice should give the same result"
+
+
+@pytest.mark.unit
+def test_fundamentals_table():
+    np = pytest.importorskip("numpy")
+    ticker = create_ticker_with_reports()
+    table = ticker.get_fundamentals_table()
+    annual = table.select(period="annual")
+    assert annual.fiscal_dates[-1] == np.datetime64("2022-12-31")
+    expected = float(ticker.get_balance_sheet().get_most_recent_annual_report()["total"])
+    assert annual["balance_total"][-1] == expected and annual["earnings_reportedEPS"][-1] == 4.07
+
+
+@pytest.mark.benchmark
+def test_correlation_benchmark():
+    pytest.importorskip("numpy")
+    symbols = [f"SYM{index}" for index in range(200)]
+    tickers = [create_ticker_with_reports(symbol, years=20) for symbol in symbols]
+
+    def legacy_correlate(ticker: Ticker):
+        # what correlate_accounting_reports() used to do: copy the reports so renaming keys in place is safe
+        correlated = {}
+        for prefix, report in (("earnings_", ticker.get_earnings()), ("balance_", ticker.get_balance_sheet()),
+                               ("income_", ticker.get_income_statement()), ("cash_", ticker.get_cash_flow())):
+            for period, records in (("annual_", report.annualReports), ("quarterly_", report.quarterlyReports)):
+                for record in copy.deepcopy(records):
+                    fiscal_date_ending = record.pop("fiscalDateEnding")
+                    for key in list(record):
+                        record[f"{prefix}{period}{key}"] = record.pop(key)
+                    correlated.setdefault(fiscal_date_ending, {}).update(record)
+        return correlated
+
+    start = time.perf_counter()
+    for ticker in tickers:
+        legacy_correlate(ticker)
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for ticker in tickers:
+        ticker.correlate_accounting_reports()
+    correlate_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    table = FundamentalsTable.concat(ticker.get_fundamentals_table() for ticker in tickers)
+    table_seconds = time.perf_counter() - start
+    logging.warning(f" {len(symbols)} symbols: copy and rename {legacy_seconds * 1000:.0f}ms, "
+                    f"correlate_accounting_reports {correlate_seconds * 1000:.0f}ms, "
+                    f"numeric table {table_seconds * 1000:.0f}ms ({len(table)} rows, "
+                    f"{table.get_memory_usage() / 1e6:.1f} MB)")
+    assert correlate_seconds < legacy_seconds
+    assert tickers[0].get_earnings().annualReports[0]["fiscalDateEnding"], "the reports should not be changed"
@@ -0,0 +1,119 @@
+import os
+import pytest
+from alphavantage_api_client import AlphavantageClient, TickerUniverse, FundamentalsTable, AccountingReport
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, accounting_report_payload
+
+np = pytest.importorskip("numpy")
+
+ACCOUNTING_FUNCTIONS = ("BALANCE_SHEET", "INCOME_STATEMENT", "EARNINGS", "CASH_FLOW")
+
+
+def create_client(payload=accounting_report_payload):
+    client = AlphavantageClient().with_api_key("demo")
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({function: payload
+                                                                  for function in ACCOUNTING_FUNCTIONS}))
+    return client, adapter
+
+
+def make_report(function: str, symbol: str = "TSLA") -> AccountingReport:
+    payload = accounting_report_payload({"function": function, "symbol": symbol})
+    return AccountingReport.model_validate({**payload, "success": True, "limit_reached": False, "status_code": 200})
+
+
+@pytest.mark.unit
+def test_table_from_reports():
+    reports = {"balance_sheet": make_report("BALANCE_SHEET"), "earnings": make_report("EARNINGS")}
+    before = [report.model_dump() for report in reports.values()]
+    table = FundamentalsTable.from_reports("tsla", reports)
+    assert [report.model_dump() for report in reports.values()] == before, "reports should not be changed"
+    assert len(table) == 2 + 8 and table.get_symbols() == ["TSLA"]
+    assert table.periods.tolist() == ["annual"] * 2 + ["quarterly"] * 8
+    assert table.fiscal_dates[0] == np.datetime64("2021-12-31")
+    assert table.fiscal_dates[-1] == np.datetime64("2022-12-31")
+    assert sorted(table.get_column_names()) == ["balance_total", "earnings_reportedEPS", "earnings_surprisePercentage"]
+    assert table["balance_total"].dtype == np.float64, "fields that are never numbers should be left out"
+    quarterly = table.select(period="quarterly")
+    assert quarterly["earnings_reportedEPS"].tolist() == [0.85] * 8
+    assert np.isnan(table.select(period="annual")["earnings_surprisePercentage"]).all()
+
+
+@pytest.mark.unit
+def test_universe_fetches_every_symbol():
+    client, adapter = create_client()
+    symbols = [f"SYM{index}" for index in range(30)]
+    universe = TickerUniverse(symbols, client, max_workers=8).fetch()
+    table = universe.get_table()
+    assert adapter.call_count == 30 * 4
+    assert table.get_symbols() == sorted(symbols) and len(table) == 30 * 10
+    assert universe.get_progress() == {"total": 30, "completed": 30, "failed": 0, "pending": 0}
+    sym7 = table.select("SYM7", "annual")
+    expected = float(accounting_report_payload({"symbol": "SYM7"})["annualReports"][0]["total"])
+    assert sym7["cash_total"][-1] == expected and sym7["income_total"][-1] == expected
+
+
+@pytest.mark.unit
+def test_failed_symbols_are_reported_and_retried(tmp_path):
+    failing = {"BOOM"}
+
+    def payload(params: dict) -> dict:
+        if params["symbol"] in failing and params["function"] == "CASH_FLOW":
+            raise ConnectionError("connection reset")
+        return accounting_report_payload(params)
+
+    client, _ = create_client(payload)
+    universe = TickerUniverse(["TSLA", "BOOM", "F"], client, checkpoint_dir=str(tmp_path)).fetch()
+    assert list(universe.get_errors()) == ["BOOM"] and "cash_flow" in universe.get_errors()["BOOM"]
+    assert universe.get_table().get_symbols() == ["F", "TSLA"]
+    failing.clear()
+    client, adapter = create_client(payload)
+    resumed = TickerUniverse(["TSLA", "BOOM", "F"], client, checkpoint_dir=str(tmp_path)).fetch()
+    assert adapter.call_count == 4, "only the failed symbol should be fetched again"
+    assert resumed.get_errors() == {} and resumed.get_table().get_symbols() == ["BOOM", "F", "TSLA"]
+
+
+@pytest.mark.unit
+def test_resumes_from_checkpoint(tmp_path):
+    def crashing_payload(params: dict) -> dict:
+        if params["symbol"] == "SYM25":
+            raise KeyboardInterrupt  # the process dies in the middle of the universe
+        return accounting_report_payload(params)
+
+    symbols = [f"SYM{index:02d}" for index in range(40)]
+    client, _ = create_client(crashing_payload)
+    with pytest.raises(KeyboardInterrupt):
+        TickerUniverse(symbols, client, checkpoint_dir=str(tmp_path), checkpoint_every=5, max_workers=1).fetch()
+    client, adapter = create_client()
+    resumed = TickerUniverse(symbols, client, checkpoint_dir=str(tmp_path), checkpoint_every=5)
+    completed = resumed.get_progress()["completed"]
+    assert completed >= 20, "symbols completed before the crash should be loaded"
+    resumed.fetch()
+    assert adapter.call_count == (40 - completed) * 4
+    assert resumed.get_table().get_symbols() == symbols and len(resumed.get_table()) == 40 * 10
+
+
+@pytest.mark.unit
+def test_universes_can_share_a_checkpoint_dir(tmp_path):
+    import shutil
+    import threading
+    shared = str(tmp_path / "shared")
+    halves = [[f"SYM{index:02d}" for index in range(start, 40, 2)] for start in (0, 1)]
+    universes = [TickerUniverse(symbols, create_client()[0], checkpoint_dir=shared, checkpoint_every=1)
+                 for symbols in halves]
+    threads = [threading.Thread(target=universe.fetch) for universe in universes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for symbols in halves:
+        resumed = TickerUniverse(symbols, create_client()[0], checkpoint_dir=shared)
+        assert resumed.get_progress() == {"total": 20, "completed": 20, "failed": 0, "pending": 0}
+        assert resumed.get_table().get_symbols() == symbols and len(resumed.get_table()) == 20 * 10
+    # a symbol fetched again by another universe is in two parts, the newest one wins
+    other = str(tmp_path / "other")
+    TickerUniverse(["SYM00"], create_client()[0], checkpoint_dir=other).fetch()
+    for name in os.listdir(other):
+        shutil.copy(os.path.join(other, name), shared)
+    symbols = sorted(halves[0] + halves[1])
+    resumed = TickerUniverse(symbols, create_client()[0], checkpoint_dir=shared)
+    assert resumed.get_progress()["completed"] == 40, "no part should overwrite another"
+    assert resumed.get_table().get_symbols() == symbols and len(resumed.get_table()) == 40 * 10
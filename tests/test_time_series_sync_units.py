@@ -0,0 +1,113 @@
+import pytest
+from alphavantage_api_client import AlphavantageClient, TimeSeriesSync, SqliteCache, LruCache
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, daily_adjusted_payload
+
+
+class FakeDailyHistory:
+    """Answers TIME_SERIES_DAILY_ADJUSTED like the api does, compact is the latest 100 days"""
+
+    def __init__(self, days: int):
+        self.payload = daily_adjusted_payload("TSLA", days=days)
+
+    def grow(self, days: int):
+        self.payload = daily_adjusted_payload("TSLA", days=days)
+
+    def get_series(self) -> dict:
+        return self.payload["Time Series (Daily)"]
+
+    def __call__(self, params: dict) -> dict:
+        if params.get("outputsize") == "full":
+            return self.payload
+        return {**self.payload, "Time Series (Daily)": dict(list(self.get_series().items())[:100])}
+
+
+def create_sync(history: FakeDailyHistory, store=None):
+    client = AlphavantageClient().with_api_key("demo")
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({"TIME_SERIES_DAILY_ADJUSTED": history}))
+    return TimeSeriesSync(client, store), adapter
+
+
+EVENT = {"function": "TIME_SERIES_DAILY_ADJUSTED", "symbol": "TSLA"}
+
+
+@pytest.mark.unit
+def test_first_sync_fetches_full_then_merges_compact():
+    history = FakeDailyHistory(days=300)
+    sync, adapter = create_sync(history)
+    assert len(sync.sync(EVENT).data) == 300
+    history.grow(days=305)
+    quote = sync.sync(EVENT)
+    assert [request["params"]["outputsize"] for request in adapter.requests] == ["full", "compact"]
+    assert quote.success and quote.symbol == "TSLA"
+    assert list(quote.data.keys()) == list(history.get_series().keys()), "merged history should equal a full fetch"
+    assert quote.data == history.get_series()
+    assert quote.meta_data["4. Output Size"] == "Full size"
+    assert sync.get_metrics() == {"full": 1, "compact": 1, "gap": 0, "adjustment": 0}
+
+
+@pytest.mark.unit
+def test_newest_stored_bar_is_replaced():
+    history = FakeDailyHistory(days=150)
+    sync, _ = create_sync(history)
+    sync.sync(EVENT)
+    newest = next(iter(history.get_series()))
+    history.get_series()[newest] = {**history.get_series()[newest], "4. close": "1.0000", "5. adjusted close": "1.0"}
+    quote = sync.sync(EVENT)
+    assert quote.data[newest]["5. adjusted close"] == "1.0", "a bar taken during the trading day should be updated"
+    assert sync.get_metrics()["adjustment"] == 0
+
+
+@pytest.mark.unit
+def test_gap_fetches_full():
+    history = FakeDailyHistory(days=200)
+    sync, adapter = create_sync(history)
+    sync.sync(EVENT)
+    history.grow(days=400)
+    quote = sync.sync(EVENT)
+    assert len(quote.data) == 400
+    assert [request["params"]["outputsize"] for request in adapter.requests] == ["full", "compact", "full"]
+    assert sync.get_metrics()["gap"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("change", ["restated", "dividend"])
+def test_adjustment_fetches_full(change):
+    history = FakeDailyHistory(days=200)
+    sync, adapter = create_sync(history)
+    sync.sync(EVENT)
+    history.grow(days=201)
+    series = history.get_series()
+    if change == "restated":
+        for bar in list(series.values())[1:]:
+            bar["5. adjusted close"] = f"{float(bar['5. adjusted close']) * 0.99:.4f}"
+    else:
+        series[next(iter(series))]["7. dividend amount"] = "0.2500"
+    quote = sync.sync(EVENT)
+    assert quote.data == series, "the adjusted history should come from a full fetch"
+    assert adapter.requests[-1]["params"]["outputsize"] == "full"
+    assert sync.get_metrics()["adjustment"] == 1
+
+
+@pytest.mark.unit
+def test_history_survives_restarts(tmp_path):
+    history = FakeDailyHistory(days=120)
+    store_path = str(tmp_path / "history.sqlite")
+    first, _ = create_sync(history, SqliteCache(store_path))
+    first.sync(EVENT)
+    second, adapter = create_sync(history, SqliteCache(store_path))
+    assert len(second.get_history(EVENT).data) == 120
+    assert len(second.sync({**EVENT, "symbol": "tsla"}).data) == 120
+    assert [request["params"]["outputsize"] for request in adapter.requests] == ["compact"]
+
+
+@pytest.mark.unit
+def test_store_can_be_shared_with_the_client_cache():
+    history = FakeDailyHistory(days=300)
+    store = LruCache()
+    client = AlphavantageClient().with_api_key("demo").use_cache_backend(store)
+    adapter = use_fake_transport(client, FakeAlphavantageAdapter({"TIME_SERIES_DAILY_ADJUSTED": history}))
+    sync = TimeSeriesSync(client, store)
+    sync.sync(EVENT)
+    compact = client.get_daily_adjusted_quote({"symbol": "TSLA"})
+    assert len(compact.data) == 100 and adapter.call_count == 2, "the history isn't the compact response"
+    assert len(sync.get_history(EVENT).data) == 300, "the compact response doesn't replace the history"
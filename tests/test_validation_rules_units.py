@@ -0,0 +1,56 @@
+import json
+import pytest
+import requests
+from alphavantage_api_client import AlphavantageClient, ValidationRuleChecks
+from alphavantage_api_client import response_validation_rules, json_codec
+from .fake_transport import FakeAlphavantageAdapter, use_fake_transport, daily_adjusted_payload
+
+
+def make_response(body, content_type: str = "application/json") -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = (body if isinstance(body, str) else json.dumps(body)).encode("utf-8")
+    response.headers["content-type"] = content_type
+    return response
+
+
+class TestValidationRuleChecks:
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("body,classification", [
+        ({"Global Quote": {"01. symbol": "TSLA"}}, response_validation_rules.SUCCESS),
+        ({"Error Message": "Invalid API call"}, response_validation_rules.ERROR),
+        ({"Note": "Thank you for using Alpha Vantage! 5 calls per minute "}, response_validation_rules.NOTE),
+        ({"Information": "Premium end point"}, response_validation_rules.INFORMATION),
+        ({}, response_validation_rules.EMPTY),
+        ({"Global Quote": {}}, response_validation_rules.EMPTY),
+        ("<html>bad gateway</html>", response_validation_rules.ERROR),
+    ])
+    def test_classify(self, body, classification):
+        checks = ValidationRuleChecks().from_customer_request({"symbol": "TSLA"}).with_response(make_response(body))
+        assert checks.classify() == classification
+        assert checks.expect_successful_response().passed() == (classification == response_validation_rules.SUCCESS)
+
+    @pytest.mark.unit
+    def test_limit_reached_note(self):
+        body = {"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute "}
+        checks = ValidationRuleChecks().from_customer_request({"symbol": "TSLA"}).with_response(make_response(body))
+        assert checks.expect_limit_not_reached().passed(), "The calls per minute note means the limit was reached"
+        assert not checks.expect_successful_response().passed()
+
+    @pytest.mark.unit
+    def test_body_is_decoded_once(self, monkeypatch):
+        decode_count = []
+        original_loads = json_codec.loads
+
+        def counting_loads(*args, **kwargs):
+            decode_count.append(1)
+            return original_loads(*args, **kwargs)
+
+        monkeypatch.setattr(json_codec, "loads", counting_loads)
+        client = AlphavantageClient().with_api_key("demo")
+        use_fake_transport(client, FakeAlphavantageAdapter(
+            {"TIME_SERIES_DAILY_ADJUSTED": daily_adjusted_payload("TSLA", days=5000)}))
+        quote = client.get_daily_adjusted_quote({"symbol": "TSLA", "outputsize": "full"})
+        assert quote.success and len(quote.data) == 5000
+        assert len(decode_count) == 1, f"Response body was decoded {len(decode_count)} times"